@@ -1,5 +1,4 @@
 import collections
-import copy
 import sys
 import uuid
 import time
@@ -21,6 +20,12 @@ from cortado_core.process_tree_utils.miscellaneous import (
 from cortado_core.alignments.prefix_alignments import algorithm as prefix_alignments
 from cortado_core.alignments.infix_alignments import utils as infix_utils
 from cortado_core.process_tree_utils.miscellaneous import is_tau_leaf
+from cortado_core.process_tree_utils.persistent_tree import (
+    copy_process_tree,
+    replace_children,
+    to_persistent_tree,
+    to_process_tree,
+)
 from cortado_core.process_tree_utils.to_petri_net_transition_bordered import (
     apply as pt_to_petri_net,
 )
@@ -38,8 +43,9 @@ def calculate_optimal_infix_alignment(
     copy_tree=True,
     parameters=None,
 ) -> pm4py_typing.AlignmentResult:
-    if copy_tree:
-        process_tree = copy.deepcopy(process_tree)
+    if copy_tree and process_tree.parent is not None:
+        # the net is built for process_tree as root, i.e., a subtree is detached from its parents
+        process_tree = copy_process_tree(process_tree)
 
     start = time.time()
 
@@ -59,6 +65,7 @@ def calculate_optimal_infix_alignment(
             use_for_suffix_alignments=False,
             timeout=timeout,
             use_cortado_tree_converter=use_cortado_tree_converter,
+            copy_tree=copy_tree,
         )
     except TimeoutError:
         return {"timeout": True}
@@ -112,34 +119,45 @@ def build_extended_petri_net_for_infix_alignments(
     use_for_suffix_alignments: bool,
     timeout: int,
     use_cortado_tree_converter=False,
+    copy_tree=False,
 ) -> Tuple[PetriNet, Marking, Marking, int, Any]:
+    """
+    :param copy_tree: if True, process_tree is not changed. Instead of copying the whole tree, only the reduced tree is
+    materialized (see reduce_process_tree) and the labels that are renamed while building the net are restored.
+    """
     all_leaf_nodes = search_leaf_nodes_in_tree(process_tree)
     trace_activities = set([e["concept:name"] for e in trace])
     matching_leaf_nodes = get_matching_leaf_nodes(trace_activities, all_leaf_nodes)
 
     if len(matching_leaf_nodes) > 0 and reduce_tree:
-        process_tree = reduce_process_tree(matching_leaf_nodes)
+        process_tree = reduce_process_tree(matching_leaf_nodes, copy_tree)
+        all_leaf_nodes = search_leaf_nodes_in_tree(process_tree)
+        matching_leaf_nodes = get_matching_leaf_nodes(trace_activities, all_leaf_nodes)
 
     renaming_func = __rename_duplicate_labels(all_leaf_nodes)
     renaming_func = __rename_tau_leaves(all_leaf_nodes, renaming_func)
 
-    if use_cortado_tree_converter:
-        net, im, fm = pt_to_petri_net(process_tree)
-    else:
-        net, im, fm = pt_converter.apply(process_tree)
-    new_im, start_place = infix_utils.add_new_initial_place(net)
-    n_added_tau_transitions, added_transitions = __add_infix_alignment_transitions(
-        net,
-        matching_leaf_nodes,
-        all_leaf_nodes,
-        start_place,
-        fm,
-        naive,
-        use_for_suffix_alignments,
-        timeout,
-    )
+    try:
+        if use_cortado_tree_converter:
+            net, im, fm = pt_to_petri_net(process_tree)
+        else:
+            net, im, fm = pt_converter.apply(process_tree)
+        new_im, start_place = infix_utils.add_new_initial_place(net)
+        n_added_tau_transitions, added_transitions = __add_infix_alignment_transitions(
+            net,
+            matching_leaf_nodes,
+            all_leaf_nodes,
+            start_place,
+            fm,
+            naive,
+            use_for_suffix_alignments,
+            timeout,
+        )
+    finally:
+        # also if generating the markings times out
+        __revert_renaming_in_tree(process_tree, renaming_func)
 
-    __revert_renaming(net, process_tree, renaming_func)
+    __revert_renaming_in_net(net, renaming_func)
 
     return (
         net,
@@ -382,32 +400,52 @@ def __stays_on_parallel_branch_closing_path(node: ProcessTree) -> bool:
     raise Exception("Unknown operator is used")
 
 
-def reduce_process_tree(leaf_nodes: List[ProcessTree]) -> ProcessTree:
+def reduce_process_tree(
+    leaf_nodes: List[ProcessTree], copy_tree: bool = False
+) -> ProcessTree:
+    """
+    :param copy_tree: if True, the tree of leaf_nodes is not changed. The children are removed from a snapshot of the
+    reduced tree that shares the kept children and only the result is materialized.
+    """
     lca, matching_lca_children_ids = __get_lca(leaf_nodes)
     reduced_tree = __get_parent_loop_node_if_present(lca)
+    deletable_children_idx = __get_not_matching_root_children_idx(
+        reduced_tree, matching_lca_children_ids
+    )
+
+    if copy_tree:
+        snapshot = to_persistent_tree(reduced_tree)
+        return to_process_tree(
+            replace_children(
+                snapshot,
+                (),
+                tuple(
+                    c
+                    for i, c in enumerate(snapshot.children)
+                    if i not in deletable_children_idx
+                ),
+            )
+        )
+
     reduced_tree.parent = None
+    for i in sorted(deletable_children_idx, reverse=True):
+        del reduced_tree.children[i]
 
-    return __reduce_not_matching_root_children(reduced_tree, matching_lca_children_ids)
+    return reduced_tree
 
 
-def __reduce_not_matching_root_children(
+def __get_not_matching_root_children_idx(
     tree: ProcessTree, matching_lca_children_ids: Set[int]
-) -> ProcessTree:
+) -> Set[int]:
     root_operator = tree.operator
-    if root_operator == Operator.LOOP:
-        return tree
 
     # we can delete all nodes directly under the reduced tree's root that are not on a path from a matching leaf to the root
     if root_operator == Operator.PARALLEL or root_operator == Operator.XOR:
-        deletable_children_idx = []
-        for i, child in enumerate(tree.children):
-            if not id(child) in matching_lca_children_ids:
-                deletable_children_idx.append(i)
-
-        for i in sorted(deletable_children_idx, reverse=True):
-            del tree.children[i]
-
-        return tree
+        return {
+            i
+            for i, child in enumerate(tree.children)
+            if not id(child) in matching_lca_children_ids
+        }
 
     # we can delete only nodes directly under the reduced tree's root that are not in between two matching nodes
     # e.g. if b and d are matching leaves, we can delete a and e in ->(a,b,c,d,e) but NOT c
@@ -425,11 +463,9 @@ def __reduce_not_matching_root_children(
             else:
                 deletable_nodes_afterwards.append(i)
 
-        deletable_children_idx = deletable_children_idx + deletable_nodes_afterwards
-        for i in sorted(deletable_children_idx, reverse=True):
-            del tree.children[i]
+        return set(deletable_children_idx + deletable_nodes_afterwards)
 
-    return tree
+    return set()
 
 
 def __get_lca(leaf_nodes: List[ProcessTree]) -> Tuple[ProcessTree, Set[int]]:
@@ -496,13 +532,11 @@ def __create_list_of_all_parents(pt: ProcessTree) -> List[ProcessTree]:
     return ancestors
 
 
-def __revert_renaming(net: PetriNet, pt: ProcessTree, renaming_func: Dict[str, str]):
+def __revert_renaming_in_net(net: PetriNet, renaming_func: Dict[str, str]):
     for transition in net.transitions:
         if transition.label in renaming_func:
             transition.label = renaming_func[transition.label]
 
-    __revert_renaming_in_tree(pt, renaming_func)
-
 
 def __revert_renaming_in_tree(pt: ProcessTree, renaming_func):
     if pt.label in renaming_func:
@@ -1,4 +1,3 @@
-import copy
 import sys
 import time
 
@@ -14,6 +13,7 @@ from cortado_core.alignments.infix_alignments.variants.baseline_approach import
     build_extended_petri_net_for_infix_alignments as build_extended_petri_net_for_infix_alignments_baseline,
 )
 from cortado_core.alignments.prefix_alignments.algorithm import add_to_parameters
+from cortado_core.process_tree_utils.persistent_tree import copy_process_tree
 
 VARIANT_TREE_BASED_PREPROCESSING = 1
 VARIANT_BASELINE_APPROACH = 2
@@ -30,8 +30,9 @@ def calculate_optimal_suffix_alignment(
     copy_tree=True,
     parameters=None,
 ) -> pm4py_typing.AlignmentResult:
-    if copy_tree:
-        process_tree = copy.deepcopy(process_tree)
+    if copy_tree and process_tree.parent is not None:
+        # the net is built for process_tree as root, i.e., a subtree is detached from its parents
+        process_tree = copy_process_tree(process_tree)
 
     start = time.time()
 
@@ -66,6 +67,7 @@ def calculate_optimal_suffix_alignment(
                 True,
                 timeout,
                 use_cortado_tree_converter=use_cortado_tree_converter,
+                copy_tree=copy_tree,
             )
     except TimeoutError:
         return {"timeout": True}
@@ -34,6 +34,9 @@ from cortado_core.eventually_follows_pattern_mining.occurrence_store.occurrence_
     OccurrenceStatisticTracker,
     NoOccurrenceStatisticTracker,
 )
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.partitioned_occurrence_store import (
+    PartitionedOccurrenceStore,
+)
 from cortado_core.eventually_follows_pattern_mining.occurrence_store.rightmost_occurence_store import (
     RightmostOccurrenceStore,
 )
@@ -43,11 +46,10 @@ from cortado_core.eventually_follows_pattern_mining.occurrence_store.occurrence_
     NoOccurrenceListCleaner,
 )
 from cortado_core.eventually_follows_pattern_mining.util.tree import (
-    set_tree_attributes,
+    create_trees_from_groups,
     get_first_ef_node_id_per_node_for_trees,
     EventuallyFollowsStrategy,
 )
-from cortado_core.subprocess_discovery.concurrency_trees.cTrees import cTreeFromcGroup
 from cortado_core.subprocess_discovery.subtree_mining.obj import (
     FrequencyCountingStrategy,
 )
@@ -65,6 +67,13 @@ class Algorithm(Enum):
     InfixPatternCombinationEnumerationGraphOld = 8
 
 
+# algorithms that use the level-wise loop of algorithm_expansion on a single occurrence store
+RIGHTMOST_EXPANSION_ALGORITHMS = [
+    Algorithm.RightmostExpansion,
+    Algorithm.RightmostExpansionOnlyInfixPatterns,
+]
+
+
 def generate_eventually_follows_patterns_from_groups(
     variants: Dict[Group, List[Trace]],
     min_support_count: int,
@@ -73,17 +82,55 @@ def generate_eventually_follows_patterns_from_groups(
     size_tracker: Optional[OccurrenceStatisticTracker] = None,
     ef_strategy: EventuallyFollowsStrategy = EventuallyFollowsStrategy.RealEventuallyFollows,
     max_size: int = 1000,
+    compact_occurrences: bool = False,
+    n_processes: int = 1,
+    top_k: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    memory_budget: Optional[int] = None,
 ):
-    trees = []
+    """
+    Mines the frequent eventually follows patterns of the variants.
+    :param compact_occurrences: store the occurrence lists as arrays (see compact_occurrence_list), only used by the
+    rightmost expansion algorithms
+    :param n_processes: number of worker processes the variants are partitioned across, only supported for the
+    rightmost expansion algorithms. The size tracker is not used in this case.
+    :param top_k: only return the top_k patterns with the highest support (see algorithm_expansion), min_support_count
+    is a lower bound. Only supported for the rightmost expansion algorithms.
+    :param time_budget: time budget in seconds, the patterns of the levels completed within the budget are returned.
+    Only supported for the rightmost expansion algorithms.
+    :param memory_budget: maximum size of the occurrence lists in memory in bytes (per process), the occurrence lists
+    exceeding it are spilled to disk (see SpillingOccurrenceLists). Only supported for the rightmost expansion
+    algorithms.
+    """
+    if algorithm not in RIGHTMOST_EXPANSION_ALGORITHMS and (
+        n_processes > 1
+        or top_k is not None
+        or time_budget is not None
+        or memory_budget is not None
+    ):
+        raise ValueError(
+            "multiple processes, top-k, time and memory budget are only supported for the rightmost expansion algorithms"
+        )
 
-    for group, traces in variants.items():
-        group = group.sort()
-        tree = cTreeFromcGroup(group)
-        tree.n_traces = len(traces)
-        set_tree_attributes(tree)
-        trees.append(tree)
+    groups = [(group.sort(), len(traces)) for group, traces in variants.items()]
+    groups.sort(key=lambda g: g[1], reverse=True)
+    trees = create_trees_from_groups(groups)
 
-    trees.sort(key=lambda t: t.n_traces, reverse=True)
+    if n_processes > 1:
+        return __execute_rightmost_expansion_in_parallel(
+            groups,
+            trees,
+            min_support_count,
+            freq_counting_strategy,
+            algorithm,
+            ef_strategy,
+            max_size,
+            compact_occurrences,
+            n_processes,
+            top_k,
+            time_budget,
+            memory_budget,
+        )
 
     ef_dict = get_first_ef_node_id_per_node_for_trees(trees, ef_strategy)
 
@@ -104,8 +151,52 @@ def generate_eventually_follows_patterns_from_groups(
         ef_dict,
         size_tracker,
         max_size,
+        compact_occurrences,
+        top_k,
+        time_budget,
+        memory_budget,
+    )
+
+
+def __execute_rightmost_expansion_in_parallel(
+    groups,
+    trees,
+    min_support_count,
+    freq_counting_strategy,
+    algorithm: Algorithm,
+    ef_strategy,
+    max_size,
+    compact_occurrences,
+    n_processes,
+    top_k,
+    time_budget,
+    memory_budget,
+):
+    prune_sets = compute_frequent_activity_sets(
+        trees, freq_counting_strategy, min_support_count
     )
 
+    with PartitionedOccurrenceStore(
+        groups,
+        freq_counting_strategy,
+        min_support_count,
+        ef_strategy,
+        n_processes,
+        compact_occurrences,
+        memory_budget,
+    ) as occurrence_store:
+        return generate_eventually_follows_patterns(
+            min_support_count,
+            occurrence_store,
+            LastIterationOccurrenceListCleaner(),
+            prune_sets,
+            generate_only_infix_patterns=algorithm
+            == Algorithm.RightmostExpansionOnlyInfixPatterns,
+            max_iterations=max_size,
+            top_k=top_k,
+            time_budget=time_budget,
+        )
+
 
 def __execute_algorithm(
     trees,
@@ -116,6 +207,10 @@ def __execute_algorithm(
     ef_dict,
     size_tracker,
     max_size,
+    compact_occurrences,
+    top_k,
+    time_budget,
+    memory_budget,
 ):
     if algorithm == Algorithm.InfixPatternCombinationBruteForce:
         return generate_eventually_follows_patterns_using_combination_approach(
@@ -172,15 +267,26 @@ def __execute_algorithm(
         only_infix_patterns = True
 
     occurrence_store = RightmostOccurrenceStore(
-        trees, counting_strategy, min_support_count, ef_dict, size_tracker
-    )
-
-    patterns = generate_eventually_follows_patterns(
+        trees,
+        counting_strategy,
         min_support_count,
-        occurrence_store,
-        LastIterationOccurrenceListCleaner(),
-        prune_sets,
-        generate_only_infix_patterns=only_infix_patterns,
-        max_iterations=max_size,
+        ef_dict,
+        size_tracker,
+        compact_occurrences=compact_occurrences,
+        memory_budget=memory_budget,
     )
+
+    try:
+        patterns = generate_eventually_follows_patterns(
+            min_support_count,
+            occurrence_store,
+            LastIterationOccurrenceListCleaner(),
+            prune_sets,
+            generate_only_infix_patterns=only_infix_patterns,
+            max_iterations=max_size,
+            top_k=top_k,
+            time_budget=time_budget,
+        )
+    finally:
+        occurrence_store.close()
     return patterns
@@ -1,3 +1,5 @@
+import heapq
+import time
 from typing import List, Set, Dict, Optional
 
 from cortado_core.eventually_follows_pattern_mining.candidate_enumeration.pruning_strategy.composed_pruning_strategy import (
@@ -22,8 +24,12 @@ from cortado_core.eventually_follows_pattern_mining.occurrence_store.occurrence_
 )
 from cortado_core.eventually_follows_pattern_mining.util.filter import (
     filter_incomplete_patterns,
+    is_pattern_valid,
 )
 
+# number of candidates processed between two checks of the time budget
+DEADLINE_CHECK_CANDIDATES = 100
+
 
 def generate_eventually_follows_patterns(
     min_support_count: int,
@@ -33,7 +39,21 @@ def generate_eventually_follows_patterns(
     generate_only_infix_patterns: bool = False,
     max_iterations: int = 1000,
     filter_incomplete=True,
+    top_k: Optional[int] = None,
+    time_budget: Optional[float] = None,
 ):
+    """
+    Level-wise mining of the frequent eventually follows patterns.
+    :param top_k: if set, only the k patterns with the highest support (and all patterns with the same support as the
+    k-th pattern) are returned. After each level, the minimum support is raised to the support of the k-th best
+    pattern found so far, min_support_count is only a lower bound.
+    :param time_budget: if set, the mining stops as soon as the time budget (in seconds) is exceeded and the patterns
+    of the levels that were completed so far are returned
+    """
+    deadline = time.time() + time_budget if time_budget is not None else None
+    # supports of the k best patterns found so far (min heap)
+    top_k_supports = []
+
     patterns = dict()
     candidate_generator = RightmostExpansionCandidateGenerator(
         prune_sets, get_pruning_strategy(patterns), not generate_only_infix_patterns
@@ -41,15 +61,33 @@ def generate_eventually_follows_patterns(
     tested_patterns = 0
     candidates = candidate_generator.generate_initial_candidates()
     tested_patterns += len(candidates)
-    occurrence_store.update_occurrence_lists(candidates)
+    if not update_occurrence_lists_within_deadline(
+        occurrence_store, candidates, deadline
+    ):
+        return patterns
     iteration_patterns = remove_not_frequent_patterns_from_candidates(
         candidates, min_support_count
     )
+    # the candidates are generated from the frequent activity sets for min_support_count, the occurrence store needs
+    # the 1-patterns for all of them, even if top-k raises the minimum support
+    occurrence_store.set_frequent_1_patterns(list(iteration_patterns))
+    if top_k is not None:
+        min_support_count = update_min_support_for_top_k(
+            candidates,
+            top_k_supports,
+            top_k,
+            min_support_count,
+            occurrence_store,
+            patterns,
+            filter_incomplete,
+        )
+        iteration_patterns = remove_not_frequent_patterns_from_candidates(
+            candidates, min_support_count
+        )
     frequent_1_sub_patterns = [
         pattern.sub_patterns[0] for pattern in iteration_patterns
     ]
     candidate_generator.set_frequent_1_patterns(frequent_1_sub_patterns)
-    occurrence_store.set_frequent_1_patterns(list(iteration_patterns))
     patterns[1] = set(iteration_patterns)
     iteration = 2
 
@@ -60,7 +98,20 @@ def generate_eventually_follows_patterns(
         )
         tested_patterns += len(candidates)
         # print('Candidates', len(candidates))
-        occurrence_store.update_occurrence_lists(candidates)
+        if not update_occurrence_lists_within_deadline(
+            occurrence_store, candidates, deadline
+        ):
+            break
+        if top_k is not None:
+            min_support_count = update_min_support_for_top_k(
+                candidates,
+                top_k_supports,
+                top_k,
+                min_support_count,
+                occurrence_store,
+                patterns,
+                filter_incomplete,
+            )
         iteration_patterns = remove_not_frequent_patterns_from_candidates(
             candidates, min_support_count
         )
@@ -88,6 +139,68 @@ def generate_eventually_follows_patterns(
     return patterns
 
 
+def update_occurrence_lists_within_deadline(
+    occurrence_store,
+    candidates: List[EventuallyFollowsPattern],
+    deadline: Optional[float],
+) -> bool:
+    """
+    Updates the occurrence lists for the candidates in chunks, s.t. the deadline is checked regularly.
+    :return: False if the deadline was exceeded before all candidates were processed
+    """
+    if deadline is None:
+        occurrence_store.update_occurrence_lists(candidates)
+        return True
+
+    for i in range(0, len(candidates), DEADLINE_CHECK_CANDIDATES):
+        if time.time() > deadline:
+            return False
+        occurrence_store.update_occurrence_lists(
+            candidates[i : i + DEADLINE_CHECK_CANDIDATES]
+        )
+
+    return time.time() <= deadline
+
+
+def update_min_support_for_top_k(
+    candidates: List[EventuallyFollowsPattern],
+    top_k_supports: List[int],
+    top_k: int,
+    min_support_count: int,
+    occurrence_store,
+    patterns: Dict[int, Set[EventuallyFollowsPattern]],
+    filter_incomplete: bool,
+) -> int:
+    """
+    Adds the supports of the frequent candidates to the top-k heap and raises the minimum support to the support of
+    the k-th best pattern. The patterns of previous levels are filtered in place (the dict is shared with the pruning
+    strategy), as well as the minimum support of the occurrence store, which stops counting early.
+    Raising the minimum support does not lose any top-k pattern, as the support is anti-monotone.
+    """
+    for candidate in candidates:
+        if candidate.support < min_support_count:
+            continue
+        # incomplete patterns are not part of the result
+        if filter_incomplete and not is_pattern_valid(candidate):
+            continue
+
+        heapq.heappush(top_k_supports, candidate.support)
+        if len(top_k_supports) > top_k:
+            heapq.heappop(top_k_supports)
+
+    if len(top_k_supports) < top_k or top_k_supports[0] <= min_support_count:
+        return min_support_count
+
+    min_support_count = top_k_supports[0]
+    occurrence_store.min_support_count = min_support_count
+    for k in list(patterns):
+        patterns[k] = set(p for p in patterns[k] if p.support >= min_support_count)
+        if len(patterns[k]) == 0:
+            del patterns[k]
+
+    return min_support_count
+
+
 def remove_not_frequent_patterns_from_candidates(
     candidates: List[EventuallyFollowsPattern], min_support_count: int
 ) -> Set[EventuallyFollowsPattern]:
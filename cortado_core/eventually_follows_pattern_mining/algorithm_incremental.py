@@ -0,0 +1,115 @@
+from typing import Dict, List, Optional, Set
+
+from pm4py.objects.log.obj import Trace
+
+from cortado_core.eventually_follows_pattern_mining.algorithm_expansion import (
+    generate_eventually_follows_patterns,
+)
+from cortado_core.eventually_follows_pattern_mining.obj import EventuallyFollowsPattern
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.incremental_occurrence_store import (
+    IncrementalOccurrenceStore,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.occurrence_list_cleaner import (
+    NoOccurrenceListCleaner,
+)
+from cortado_core.eventually_follows_pattern_mining.util.filter import (
+    filter_incomplete_patterns,
+)
+from cortado_core.eventually_follows_pattern_mining.util.tree import (
+    EventuallyFollowsStrategy,
+    create_trees_from_groups,
+)
+from cortado_core.subprocess_discovery.subtree_mining.activity_relations import (
+    ActivityRelationEncoder,
+    get_frequent_activity_sets,
+)
+from cortado_core.subprocess_discovery.subtree_mining.obj import (
+    FrequencyCountingStrategy,
+)
+from cortado_core.utils.split_graph import Group
+
+
+class IncrementalEventuallyFollowsPatternMiner:
+    """
+    Maintains the frequent eventually follows patterns of a growing set of variants, e.g. when new traces arrive.
+    The result of add_variants equals the result of generate_eventually_follows_patterns_from_groups with the rightmost
+    expansion algorithm on all variants added so far. Instead of rebuilding the trees, the frequent activity sets and
+    all occurrence lists, only the new variants are added to the IncrementalOccurrenceStore, which counts the
+    candidates on the new trees and reuses the supports of the older ones. New traces of known variants only change the
+    weights of their trees for the trace based counting strategies.
+    """
+
+    def __init__(
+        self,
+        min_support_count: int,
+        freq_counting_strategy: FrequencyCountingStrategy,
+        ef_strategy: EventuallyFollowsStrategy = EventuallyFollowsStrategy.RealEventuallyFollows,
+        generate_only_infix_patterns: bool = False,
+        max_size: int = 1000,
+        compact_occurrences: bool = False,
+    ):
+        self.min_support_count = min_support_count
+        self.freq_counting_strategy = freq_counting_strategy
+        self.generate_only_infix_patterns = generate_only_infix_patterns
+        self.max_size = max_size
+        self.occurrence_store = IncrementalOccurrenceStore(
+            freq_counting_strategy, min_support_count, ef_strategy, compact_occurrences
+        )
+        # encoded activity relations of the trees of the occurrence store, in the same order
+        self.activity_relations = ActivityRelationEncoder()
+        # sorted variant -> tree index
+        self.tree_indices: Dict[Group, int] = dict()
+
+    def add_variants(
+        self,
+        variants: Dict[Group, List[Trace]],
+        min_support_count: Optional[int] = None,
+    ) -> Dict[int, Set[EventuallyFollowsPattern]]:
+        """
+        Adds the traces of the variants and mines the frequent patterns of all variants added so far.
+        :param variants: new variants or new traces of variants that were added before
+        :param min_support_count: new minimum support, e.g. if it is relative to the number of traces, the previous one
+        if not given. Patterns that are no longer frequent are removed from the result.
+        :return: frequent patterns per size, like generate_eventually_follows_patterns_from_groups
+        """
+        if min_support_count is not None:
+            self.min_support_count = min_support_count
+
+        for group, traces in variants.items():
+            self.__add_traces(group.sort(), len(traces))
+
+        return self.mine()
+
+    def mine(self) -> Dict[int, Set[EventuallyFollowsPattern]]:
+        self.occurrence_store.start_run(self.min_support_count)
+        patterns = generate_eventually_follows_patterns(
+            self.min_support_count,
+            self.occurrence_store,
+            NoOccurrenceListCleaner(),
+            get_frequent_activity_sets(
+                self.activity_relations.get_encoded(),
+                [tree.n_traces for tree in self.occurrence_store.trees],
+                self.freq_counting_strategy,
+                self.min_support_count,
+            ),
+            generate_only_infix_patterns=self.generate_only_infix_patterns,
+            max_iterations=self.max_size,
+            filter_incomplete=False,
+        )
+        # incomplete patterns are extended in the next run, i.e. their occurrence lists are kept as well
+        self.occurrence_store.finish_run(
+            [pattern for level in patterns.values() for pattern in level]
+        )
+
+        return filter_incomplete_patterns(patterns)
+
+    def __add_traces(self, group: Group, n_traces: int):
+        if group in self.tree_indices:
+            tree = self.occurrence_store.trees[self.tree_indices[group]]
+            tree.n_traces += n_traces
+            return
+
+        tree = create_trees_from_groups([(group, n_traces)])[0]
+        self.tree_indices[group] = len(self.occurrence_store.trees)
+        self.occurrence_store.add_tree(tree)
+        self.activity_relations.add_tree(tree)
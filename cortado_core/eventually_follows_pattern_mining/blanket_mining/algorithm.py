@@ -45,7 +45,7 @@ from cortado_core.eventually_follows_pattern_mining.occurrence_store.util import
 )
 from cortado_core.eventually_follows_pattern_mining.util.filter import is_pattern_valid
 from cortado_core.eventually_follows_pattern_mining.util.is_superpattern import (
-    is_superpattern,
+    SuperpatternIndex,
 )
 from cortado_core.eventually_follows_pattern_mining.util.pattern import (
     get_activities_for_patterns,
@@ -208,35 +208,7 @@ def initialize_with_initial_patterns_for_pruning(
 def postprocess_maximal_patterns(
     maximal: Set[EventuallyFollowsPattern],
 ) -> Set[EventuallyFollowsPattern]:
-    filtered = set()
-    activities_for_pattern = get_activities_for_patterns(maximal)
-    ef_preserving_tree_for_pattern = get_ef_preserving_tree_for_patterns(maximal)
-    superpattern_candidates = maximal.copy()
-
-    for pattern in maximal:
-        is_maximal = True
-        for superpattern_candidate in superpattern_candidates:
-            if pattern.id == superpattern_candidate.id:
-                continue
-
-            if not activities_for_pattern[pattern.id].issubset(
-                activities_for_pattern[superpattern_candidate.id]
-            ):
-                continue
-
-            ef_preserving_tree, ef_dict = ef_preserving_tree_for_pattern[
-                superpattern_candidate.id
-            ]
-
-            if is_superpattern(ef_preserving_tree, pattern, ef_dict):
-                is_maximal = False
-                break
-        if is_maximal:
-            filtered.add(pattern)
-        else:
-            superpattern_candidates.remove(pattern)
-
-    return filtered
+    return SuperpatternIndex(maximal).get_maximal_patterns()
 
 
 def postprocess_maximal_patterns_old(
@@ -273,41 +245,7 @@ def postprocess_maximal_patterns_old(
 def postprocess_closed_patterns(
     closed: Set[EventuallyFollowsPattern],
 ) -> Set[EventuallyFollowsPattern]:
-    filtered = set()
-    activities_for_pattern = get_activities_for_patterns(closed)
-    ef_preserving_tree_for_pattern = get_ef_preserving_tree_for_patterns(closed)
-    superpattern_candidates = closed.copy()
-
-    for pattern in closed:
-        is_closed = True
-        for superpattern_candidate in superpattern_candidates:
-            if pattern.id == superpattern_candidate.id:
-                continue
-
-            if superpattern_candidate.support < pattern.support:
-                continue
-
-            if not activities_for_pattern[pattern.id].issubset(
-                activities_for_pattern[superpattern_candidate.id]
-            ):
-                continue
-
-            ef_preserving_tree, ef_dict = ef_preserving_tree_for_pattern[
-                superpattern_candidate.id
-            ]
-
-            if (
-                is_superpattern(ef_preserving_tree, pattern, ef_dict)
-                and superpattern_candidate.support >= pattern.support
-            ):
-                assert superpattern_candidate.support == pattern.support
-                is_closed = False
-                break
-        if is_closed:
-            filtered.add(pattern)
-        else:
-            superpattern_candidates.remove(pattern)
-    return filtered
+    return SuperpatternIndex(closed).get_closed_patterns()
 
 
 def postprocess_closed_patterns_old(
@@ -3,7 +3,10 @@ from typing import Dict, Tuple, Set
 from cortado_core.eventually_follows_pattern_mining.candidate_enumeration.pruning_strategy.pruning_strategy import (
     PruningStrategy,
 )
-from cortado_core.eventually_follows_pattern_mining.obj import EventuallyFollowsPattern
+from cortado_core.eventually_follows_pattern_mining.obj import (
+    EventuallyFollowsPattern,
+    N_TOKENS_PER_NODE,
+)
 
 
 class InfixSubPatternsPruningStrategy(PruningStrategy):
@@ -37,10 +40,13 @@ class InfixSubPatternsPruningStrategy(PruningStrategy):
             return pattern, 0
 
         new_pattern = pattern.copy()
-        n_removed_nodes = len(pattern.sub_patterns[position])
+        encoding = pattern.get_encoding()
+        n_removed_nodes = len(encoding[position]) // N_TOKENS_PER_NODE
         new_pattern.sub_patterns = (
             new_pattern.sub_patterns[:position]
             + new_pattern.sub_patterns[position + 1 :]
         )
+        # the encoding is reused instead of encoding the remaining sub-patterns again
+        new_pattern.set_encoding(encoding[:position] + encoding[position + 1 :])
 
         return new_pattern, n_removed_nodes
@@ -1,4 +1,6 @@
+import functools
 import uuid
+from typing import List, Optional, Tuple, Union
 
 from cortado_core.subprocess_discovery.concurrency_trees.cTrees import cTreeOperator
 from cortado_core.utils.split_graph import (
@@ -10,7 +12,16 @@ from cortado_core.utils.split_graph import (
     LeafGroup,
 )
 
+# codes of the operators in the pattern encodings, leaves have the code LEAF_CODE
+OPERATOR_CODES = {operator: i for i, operator in enumerate(cTreeOperator)}
+LEAF_CODE = -1
+# operator code, label and number of children
+N_TOKENS_PER_NODE = 3
 
+SubPatternEncoding = Tuple[Union[int, str], ...]
+
+
+@functools.total_ordering
 class EventuallyFollowsPattern:
     def __init__(
         self,
@@ -30,19 +41,71 @@ class EventuallyFollowsPattern:
             leftmost_occurrence_update_required
         )
         self.id = -1
+        self.encoding: Optional[Tuple[SubPatternEncoding, ...]] = None
+        self.hash_value: Optional[int] = None
 
         if self.sub_patterns is None:
             self.sub_patterns = []
 
+    def get_encoding(self) -> Tuple[SubPatternEncoding, ...]:
+        """
+        Canonical encoding of the pattern used for hashing, equality and ordering: the encodings of the sub-patterns
+        (see get_sub_pattern_encoding). It is computed once, i.e. the sub-patterns must not be changed afterwards
+        without calling invalidate_encoding.
+        """
+        if self.encoding is None:
+            n_shared = self.__get_n_sub_patterns_shared_with_predecessor()
+            self.set_encoding(
+                self.predecessor_pattern.get_encoding()[:n_shared]
+                + tuple(
+                    get_sub_pattern_encoding(sp) for sp in self.sub_patterns[n_shared:]
+                )
+                if n_shared > 0
+                else tuple(get_sub_pattern_encoding(sp) for sp in self.sub_patterns)
+            )
+
+        return self.encoding
+
+    def __get_n_sub_patterns_shared_with_predecessor(self) -> int:
+        """
+        Candidates share all sub-patterns but the last one with their predecessor (see pattern.copy), the encodings of
+        these sub-patterns are reused if the predecessor was encoded.
+        """
+        predecessor = self.predecessor_pattern
+        if predecessor is None or predecessor.encoding is None:
+            return 0
+
+        n_shared = 0
+        for sub_pattern, predecessor_sub_pattern in zip(
+            self.sub_patterns[:-1], predecessor.sub_patterns
+        ):
+            if sub_pattern is not predecessor_sub_pattern:
+                break
+            n_shared += 1
+
+        return n_shared
+
+    def set_encoding(self, encoding: Tuple[SubPatternEncoding, ...]):
+        self.encoding = encoding
+        self.hash_value = hash(encoding)
+
+    def invalidate_encoding(self):
+        self.encoding = None
+        self.hash_value = None
+
     def __eq__(self, other):
-        if len(self) != len(other):
-            return False
+        if self is other:
+            return True
+        if not isinstance(other, EventuallyFollowsPattern):
+            return NotImplemented
 
-        for i, sub_pattern in enumerate(self.sub_patterns):
-            if sub_pattern != other.sub_patterns[i]:
-                return False
+        return self.get_encoding() == other.get_encoding()
 
-        return True
+    def __lt__(self, other):
+        if not isinstance(other, EventuallyFollowsPattern):
+            return NotImplemented
+
+        return self.get_encoding() < other.get_encoding()
 
     def __len__(self):
         return len(self.sub_patterns)
@@ -54,7 +117,17 @@ class EventuallyFollowsPattern:
         return "...".join([str(sp) for sp in self.sub_patterns])
 
     def __hash__(self):
-        return hash(self.__str__())
+        if self.hash_value is None:
+            self.hash_value = hash(self.get_encoding())
+
+        return self.hash_value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # hashes of strings are salted per process
+        state["hash_value"] = None
+
+        return state
 
     def copy(self):
         new_pattern = EventuallyFollowsPattern(
@@ -125,6 +198,41 @@ class SubPattern:
         return hash(self.__str__())
 
 
+def get_sub_pattern_encoding(sub_pattern: SubPattern) -> SubPatternEncoding:
+    """
+    Encodes the sub-pattern as the operator code (LEAF_CODE for leaves), the label ("" for operators) and the number of
+    children of each node in preorder, which identifies the sub-pattern (like its string representation).
+    """
+    tokens = []
+    __add_encoding_tokens(sub_pattern, tokens)
+
+    return tuple(tokens)
+
+
+def get_encoded_labels(encoding: SubPatternEncoding) -> List[str]:
+    """
+    :return: labels of the leaves of an encoded sub-pattern in preorder
+    """
+    return [
+        encoding[i + 1]
+        for i in range(0, len(encoding), N_TOKENS_PER_NODE)
+        if encoding[i] == LEAF_CODE
+    ]
+
+
+def __add_encoding_tokens(sub_pattern: SubPattern, tokens: list):
+    if sub_pattern.label is not None:
+        tokens.append(LEAF_CODE)
+        tokens.append(sub_pattern.label)
+    else:
+        tokens.append(OPERATOR_CODES[sub_pattern.operator])
+        tokens.append("")
+
+    tokens.append(len(sub_pattern.children))
+    for child in sub_pattern.children:
+        __add_encoding_tokens(child, tokens)
+
+
 def group_to_ef_pattern(group: Group) -> EventuallyFollowsPattern:
     if isinstance(group, SkipGroup):
         return EventuallyFollowsPattern(
@@ -0,0 +1,175 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Tuple
+
+from cortado_core.subprocess_discovery.concurrency_trees.cTrees import ConcurrencyTree
+
+RightmostOccurrence = Tuple[ConcurrencyTree, ConcurrencyTree, List[ConcurrencyTree]]
+
+
+class TreeNodeTable:
+    """
+    Maps the (DFS) ids of the nodes of a single tree to the nodes, shared by all compact occurrence lists of the tree.
+    """
+
+    def __init__(self, tree: ConcurrencyTree):
+        self.nodes: Dict[int, ConcurrencyTree] = dict()
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            self.nodes[node.id] = node
+            stack.extend(node.children)
+
+
+class CompactRightmostOccurrenceList(Sequence):
+    """
+    Array-backed replacement of the occurrence list of a pattern in a single tree of the RightmostOccurrenceStore,
+    i.e. of list((leftmost_occurrence, rightmost_occurrence, list(root_occurrences))). Instead of object references,
+    node ids are kept in a single int32 array: data[3 * i: 3 * i + 3] holds the leftmost occurrence, the rightmost
+    occurrence and the root occurrence entry of the i-th occurrence. The root occurrences follow as a prefix tree: an
+    entry consists of the entry of the root occurrence without its last node (-1 for the empty prefix) and the id of
+    the last node, s.t. occurrences that extend the same predecessor occurrence share the storage of its root
+    occurrence. Occurrences are materialized as tuples on access, so the list can be used wherever the list of tuples
+    is expected.
+    """
+
+    __slots__ = ("table", "n_occurrences", "data")
+
+    def __init__(self, occurrences: List[RightmostOccurrence], table: TreeNodeTable):
+        self.table = table
+        self.n_occurrences = len(occurrences)
+
+        data = []
+        root_occurrence_entries = []
+        # (prefix entry, node id) -> entry, only needed while the list is built
+        entries: Dict[Tuple[int, int], int] = dict()
+        for lmo, rmo, root_occurrence in occurrences:
+            entry = -1
+            for node in root_occurrence:
+                key = (entry, node.id)
+                if key not in entries:
+                    entries[key] = len(entries)
+                    root_occurrence_entries += key
+                entry = entries[key]
+            data += (lmo.id, rmo.id, entry)
+
+        self.data = array("i", data + root_occurrence_entries)
+
+    @classmethod
+    def from_data(
+        cls, data: array, n_occurrences: int, table: TreeNodeTable
+    ) -> "CompactRightmostOccurrenceList":
+        """
+        Restores a list from its data array, e.g. after it was written to disk.
+        """
+        occurrence_list = cls.__new__(cls)
+        occurrence_list.table = table
+        occurrence_list.n_occurrences = n_occurrences
+        occurrence_list.data = data
+
+        return occurrence_list
+
+    def __len__(self) -> int:
+        return self.n_occurrences
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += self.n_occurrences
+        if not 0 <= i < self.n_occurrences:
+            raise IndexError("occurrence index out of range")
+
+        nodes = self.table.nodes
+        data = self.data
+        root_offset = 3 * self.n_occurrences
+        root_occurrence = []
+        entry = data[3 * i + 2]
+        while entry != -1:
+            root_occurrence.append(nodes[data[root_offset + 2 * entry + 1]])
+            entry = data[root_offset + 2 * entry]
+        root_occurrence.reverse()
+
+        return nodes[data[3 * i]], nodes[data[3 * i + 1]], root_occurrence
+
+    def __iter__(self) -> Iterator[RightmostOccurrence]:
+        for i in range(self.n_occurrences):
+            yield self[i]
+
+    def get_size_in_bytes(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.data)
+
+
+class CompactFullOccurrenceList(Sequence):
+    """
+    Array-backed replacement of the occurrence list of a pattern in a single tree of the FullOccurrenceStore, i.e. of
+    list(list(nodes sorted by preorder id of pattern)). A single int32 array holds an offset table with n + 1 entries
+    followed by the concatenated node ids of all occurrences, the i-th occurrence consists of the node ids between
+    offsets i and i + 1.
+    """
+
+    __slots__ = ("table", "n_occurrences", "data")
+
+    def __init__(self, occurrences: List[List[ConcurrencyTree]], table: TreeNodeTable):
+        self.table = table
+        self.n_occurrences = len(occurrences)
+
+        offsets = [self.n_occurrences + 1]
+        node_ids = []
+        for occurrence in occurrences:
+            node_ids += [node.id for node in occurrence]
+            offsets.append(self.n_occurrences + 1 + len(node_ids))
+
+        self.data = array("i", offsets + node_ids)
+
+    def __len__(self) -> int:
+        return self.n_occurrences
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += self.n_occurrences
+        if not 0 <= i < self.n_occurrences:
+            raise IndexError("occurrence index out of range")
+
+        nodes = self.table.nodes
+        return [
+            nodes[node_id] for node_id in self.data[self.data[i] : self.data[i + 1]]
+        ]
+
+    def __iter__(self) -> Iterator[List[ConcurrencyTree]]:
+        for i in range(self.n_occurrences):
+            yield self[i]
+
+    def get_size_in_bytes(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.data)
+
+
+def get_occurrence_lists_size_in_bytes(occurrence_lists) -> int:
+    """
+    Estimates the memory used by the occurrence lists of an occurrence store (pattern id -> tree index -> occurrence
+    list), excluding the tree nodes and TreeNodeTables shared by all patterns. Compact occurrence lists report the
+    size of their arrays, for lists of tuples/lists, the list, tuple and root occurrence list objects are counted.
+    """
+    size = sys.getsizeof(occurrence_lists)
+
+    for occ_for_trees in occurrence_lists.values():
+        size += sys.getsizeof(occ_for_trees)
+        for occs in occ_for_trees.values():
+            if isinstance(
+                occs, (CompactRightmostOccurrenceList, CompactFullOccurrenceList)
+            ):
+                size += occs.get_size_in_bytes()
+                continue
+
+            size += sys.getsizeof(occs)
+            for occurrence in occs:
+                size += sys.getsizeof(occurrence)
+                if isinstance(occurrence, tuple):
+                    size += sys.getsizeof(occurrence[2])
+
+    return size
@@ -11,13 +11,16 @@ from cortado_core.eventually_follows_pattern_mining.frequency_counting.variant_t
     VariantTransactionCountingStrategy,
 )
 from cortado_core.eventually_follows_pattern_mining.obj import EventuallyFollowsPattern
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.compact_occurrence_list import (
+    CompactFullOccurrenceList,
+    TreeNodeTable,
+)
 from cortado_core.eventually_follows_pattern_mining.occurrence_store.occurrence_statistic_tracker import (
     OccurrenceStatisticTracker,
     NoOccurrenceStatisticTracker,
 )
 from cortado_core.eventually_follows_pattern_mining.occurrence_store.util import (
-    get_leaf_nodes_with_label,
-    get_nodes_with_operator,
+    LabelOperatorIndex,
     updated_sub_pattern_to_single_child_with_sequential_root,
     should_check_only_first_search_node,
 )
@@ -48,8 +51,12 @@ class FullOccurrenceStore:
         min_support_count: int,
         ef_dict,
         size_tracker: Optional[OccurrenceStatisticTracker] = None,
+        label_operator_index: Optional[LabelOperatorIndex] = None,
+        compact_occurrences: bool = False,
     ):
         self.trees = trees
+        # built on the first initial pattern if not given
+        self.label_operator_index = label_operator_index
         # pattern_id -> tree_index -> list(occurrences sorted by preorder id of pattern))
         self.occurrence_lists: Dict[int, Dict[int, List[List[ConcurrencyTree]]]] = (
             dict()
@@ -64,6 +71,19 @@ class FullOccurrenceStore:
         self.size_tracker = (
             size_tracker if size_tracker is not None else NoOccurrenceStatisticTracker()
         )
+        # stores the occurrence lists as CompactFullOccurrenceLists (smaller, but slower to access)
+        self.compact_occurrences = compact_occurrences
+        self.node_tables: Dict[int, TreeNodeTable] = dict()
+
+    def get_label_operator_index(self) -> LabelOperatorIndex:
+        if self.label_operator_index is None:
+            self.label_operator_index = LabelOperatorIndex(self.trees)
+        return self.label_operator_index
+
+    def get_node_table(self, tree_idx: int) -> TreeNodeTable:
+        if tree_idx not in self.node_tables:
+            self.node_tables[tree_idx] = TreeNodeTable(self.trees[tree_idx])
+        return self.node_tables[tree_idx]
 
     def set_frequent_1_patterns(self, frequent_1_patterns):
         self.frequent_1_pattern_ids = dict()
@@ -100,8 +120,10 @@ class FullOccurrenceStore:
     def update_occurrence_lists_for_initial_pattern_with_operator(
         self, pattern: EventuallyFollowsPattern, operator: ConcurrencyTreeOperator
     ):
-        for i, tree in enumerate(self.trees):
-            nodes = get_nodes_with_operator(operator, tree)
+        nodes_per_tree = self.get_label_operator_index().get_nodes_with_operator(
+            operator
+        )
+        for i, nodes in nodes_per_tree.items():
             occurrence_list = [[node] for node in nodes]
             self.update_occurrence_list_for_pattern_and_tree(
                 i, occurrence_list, pattern
@@ -110,8 +132,8 @@ class FullOccurrenceStore:
     def update_occurrence_lists_for_initial_pattern_with_label(
         self, pattern: EventuallyFollowsPattern, label: str
     ):
-        for i, tree in enumerate(self.trees):
-            nodes = get_leaf_nodes_with_label(label, tree)
+        nodes_per_tree = self.get_label_operator_index().get_nodes_with_label(label)
+        for i, nodes in nodes_per_tree.items():
             occurrence_list = [[node] for node in nodes]
             self.update_occurrence_list_for_pattern_and_tree(
                 i, occurrence_list, pattern
@@ -355,6 +377,10 @@ class FullOccurrenceStore:
 
             # TODO niklas: check if needed
             new_occurrence_list.sort(key=lambda o: o[-1].id)
+            if self.compact_occurrences:
+                new_occurrence_list = CompactFullOccurrenceList(
+                    new_occurrence_list, self.get_node_table(tree_idx)
+                )
             self.occurrence_lists[pattern.id][tree_idx] = new_occurrence_list
 
     def remove_pattern(self, pattern: EventuallyFollowsPattern):
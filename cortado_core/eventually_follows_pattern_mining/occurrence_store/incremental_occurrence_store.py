@@ -0,0 +1,215 @@
+from typing import Dict, List, Tuple
+
+from cortado_core.eventually_follows_pattern_mining.frequency_counting.counting_strategy_factory import (
+    get_counting_strategy,
+)
+from cortado_core.eventually_follows_pattern_mining.obj import (
+    EventuallyFollowsPattern,
+    SubPatternEncoding,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.rightmost_occurence_store import (
+    RightmostOccurrenceStore,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.util import (
+    LabelOperatorIndex,
+)
+from cortado_core.eventually_follows_pattern_mining.util.tree import (
+    EventuallyFollowsStrategy,
+    get_first_ef_node_id_per_node,
+)
+from cortado_core.subprocess_discovery.concurrency_trees.cTrees import ConcurrencyTree
+from cortado_core.subprocess_discovery.subtree_mining.obj import (
+    FrequencyCountingStrategy,
+)
+
+PatternKey = Tuple[SubPatternEncoding, ...]
+
+# the occurrence lists are the same for the trace and variant based strategies, the per-tree supports are counted
+# for a single trace and weighted with the number of traces of the tree
+VARIANT_COUNTING_STRATEGIES = {
+    FrequencyCountingStrategy.TraceTransaction: FrequencyCountingStrategy.VariantTransaction,
+    FrequencyCountingStrategy.TraceOccurence: FrequencyCountingStrategy.VariantOccurence,
+    FrequencyCountingStrategy.VariantTransaction: FrequencyCountingStrategy.VariantTransaction,
+    FrequencyCountingStrategy.VariantOccurence: FrequencyCountingStrategy.VariantOccurence,
+}
+
+
+class IncrementalOccurrenceStore:
+    """
+    Occurrence store for generate_eventually_follows_patterns that is kept across several mining runs on a growing
+    set of trees. Patterns are identified by their encoding (see EventuallyFollowsPattern.get_encoding), because the
+    candidate generator creates new pattern objects (and ids) in each run. For each candidate tested in the last run,
+    the support in each tree (for a single trace) and the number of trees it was counted on are kept, the occurrence
+    lists only for the frequent patterns. In a run, a candidate is only counted on the trees added since it was counted last. Only
+    if a candidate that was not frequent becomes frequent, it is counted on the older trees again to rebuild its
+    occurrence lists.
+    The occurrence lists are computed by a RightmostOccurrenceStore without min-support pruning, which is restricted
+    to a range of trees by restricting the occurrence lists of the predecessor pattern.
+    """
+
+    def __init__(
+        self,
+        freq_counting_strategy: FrequencyCountingStrategy,
+        min_support_count: int,
+        ef_strategy: EventuallyFollowsStrategy = EventuallyFollowsStrategy.RealEventuallyFollows,
+        compact_occurrences: bool = False,
+    ):
+        self.trees: List[ConcurrencyTree] = []
+        self.ef_strategy = ef_strategy
+        self.min_support_count = min_support_count
+        self.is_trace_based_counting = freq_counting_strategy in [
+            FrequencyCountingStrategy.TraceTransaction,
+            FrequencyCountingStrategy.TraceOccurence,
+        ]
+        # pattern key -> tree index -> support for a single trace
+        self.tree_supports: Dict[PatternKey, Dict[int, int]] = dict()
+        # pattern key -> number of trees (the first ones) the pattern was counted on
+        self.n_counted_trees: Dict[PatternKey, int] = dict()
+        # pattern key -> tree index -> occurrence list, only for patterns that were frequent when they were counted
+        # last, complete for the first n_counted_trees trees
+        self.occurrence_lists: Dict[PatternKey, Dict[int, list]] = dict()
+        # pattern id of the current run -> pattern key
+        self.pattern_keys: Dict[int, PatternKey] = dict()
+        # occurrence lists of the current run are referenced by the pattern ids of the run
+        self.run_store = RightmostOccurrenceStore(
+            self.trees,
+            get_counting_strategy(
+                VARIANT_COUNTING_STRATEGIES[freq_counting_strategy], self.trees
+            ),
+            0,
+            dict(),
+            label_operator_index=LabelOperatorIndex([]),
+            compact_occurrences=compact_occurrences,
+        )
+
+    def add_tree(self, tree: ConcurrencyTree):
+        tree_idx = len(self.trees)
+        self.trees.append(tree)
+        self.run_store.ef_dict[tree_idx] = get_first_ef_node_id_per_node(
+            tree, self.ef_strategy
+        )
+        self.run_store.label_operator_index.add_tree(tree_idx, tree)
+
+    def start_run(self, min_support_count: int):
+        self.min_support_count = min_support_count
+        self.pattern_keys = dict()
+        self.run_store.occurrence_lists = dict()
+
+    def finish_run(self, frequent_patterns: List[EventuallyFollowsPattern]):
+        """
+        Drops the occurrence lists of the patterns that are not frequent in the last run. The per-tree supports are
+        only kept for the candidates that were tested in the last run. The other candidates are only generated again
+        if their predecessor becomes frequent again, they are then counted on all trees.
+        """
+        frequent_pattern_keys = set(
+            pattern.get_encoding() for pattern in frequent_patterns
+        )
+        for key in list(self.occurrence_lists):
+            if key not in frequent_pattern_keys:
+                del self.occurrence_lists[key]
+
+        tested_pattern_keys = set(self.pattern_keys.values())
+        for key in list(self.tree_supports):
+            if key not in tested_pattern_keys:
+                del self.tree_supports[key]
+                del self.n_counted_trees[key]
+
+        self.pattern_keys = dict()
+        self.run_store.occurrence_lists = dict()
+
+    def set_frequent_1_patterns(self, frequent_1_patterns):
+        self.run_store.set_frequent_1_patterns(frequent_1_patterns)
+
+    def update_occurrence_lists(self, patterns: List[EventuallyFollowsPattern]):
+        for pattern in patterns:
+            self.update_occurrence_lists_for_pattern(pattern)
+
+    def update_occurrence_lists_for_pattern(self, pattern: EventuallyFollowsPattern):
+        key = pattern.get_encoding()
+        self.pattern_keys[pattern.id] = key
+        n_counted_trees = self.n_counted_trees.get(key, 0)
+        tree_supports = self.tree_supports.setdefault(key, dict())
+
+        new_occurrence_lists = self.get_occurrence_lists(
+            pattern, n_counted_trees, len(self.trees)
+        )
+        self.n_counted_trees[key] = len(self.trees)
+        for tree_idx, occurrence_list in new_occurrence_lists.items():
+            tree_supports[tree_idx] = self.get_support_for_single_tree(
+                pattern, tree_idx, occurrence_list
+            )
+
+        support = self.get_support(key)
+        if support < self.min_support_count:
+            self.occurrence_lists.pop(key, None)
+            # like RightmostOccurrenceStore, which keeps the support of infrequent initial patterns
+            pattern.support = support if pattern.predecessor_pattern is None else -1
+            return
+
+        if key not in self.occurrence_lists:
+            self.occurrence_lists[key] = self.get_occurrence_lists(
+                pattern, 0, n_counted_trees
+            )
+        self.occurrence_lists[key].update(new_occurrence_lists)
+        self.run_store.occurrence_lists[pattern.id] = self.occurrence_lists[key]
+        pattern.support = support
+
+    def get_occurrence_lists(
+        self, pattern: EventuallyFollowsPattern, first_tree: int, last_tree: int
+    ) -> Dict[int, list]:
+        """
+        :return: the occurrence lists of the pattern in the trees first_tree, ..., last_tree - 1, the support of the
+        pattern is changed
+        """
+        if first_tree >= last_tree:
+            return dict()
+
+        run_store = self.run_store
+        predecessor_pattern = pattern.predecessor_pattern
+        if predecessor_pattern is None:
+            run_store.update_occurrence_lists_for_initial_pattern(pattern)
+            occurrence_lists = run_store.occurrence_lists.pop(pattern.id, dict())
+            return {
+                tree_idx: occurrence_list
+                for tree_idx, occurrence_list in occurrence_lists.items()
+                if first_tree <= tree_idx < last_tree
+            }
+
+        predecessor_occurrence_lists = run_store.occurrence_lists[
+            predecessor_pattern.id
+        ]
+        run_store.occurrence_lists[predecessor_pattern.id] = {
+            tree_idx: occurrence_list
+            for tree_idx, occurrence_list in predecessor_occurrence_lists.items()
+            if first_tree <= tree_idx < last_tree
+        }
+        run_store.update_occurrence_lists_using_predecessor_patterns(pattern)
+        run_store.occurrence_lists[predecessor_pattern.id] = (
+            predecessor_occurrence_lists
+        )
+
+        return run_store.occurrence_lists.pop(pattern.id, dict())
+
+    def get_support_for_single_tree(
+        self, pattern: EventuallyFollowsPattern, tree_idx: int, occurrence_list
+    ) -> int:
+        counting_strategy = self.run_store.counting_strategy
+        if pattern.predecessor_pattern is None:
+            return counting_strategy.get_support_for_1_pattern(
+                {tree_idx: occurrence_list}
+            )
+
+        return counting_strategy.get_support_for_single_tree(occurrence_list, tree_idx)
+
+    def get_support(self, key: PatternKey) -> int:
+        if not self.is_trace_based_counting:
+            return sum(self.tree_supports[key].values())
+
+        return sum(
+            support * self.trees[tree_idx].n_traces
+            for tree_idx, support in self.tree_supports[key].items()
+        )
+
+    def remove_pattern(self, pattern: EventuallyFollowsPattern):
+        self.occurrence_lists.pop(self.pattern_keys[pattern.id], None)
+        self.run_store.occurrence_lists.pop(pattern.id, None)
@@ -1,5 +1,9 @@
 import abc
 
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.compact_occurrence_list import (
+    get_occurrence_lists_size_in_bytes,
+)
+
 
 class OccurrenceStatisticTracker(abc.ABC):
     @abc.abstractmethod
@@ -10,6 +14,23 @@ class OccurrenceStatisticTracker(abc.ABC):
     def get_max_occurrence_size(self):
         pass
 
+    # the byte sizes are only tracked by some trackers and the spilling statistics only by stores that spill
+    # occurrence lists to disk (see SpillingOccurrenceLists), -1 if not tracked
+    def get_max_occurrence_size_in_bytes(self):
+        return -1
+
+    def track_spill(self, n_bytes: int):
+        pass
+
+    def track_page_in(self, n_bytes: int):
+        pass
+
+    def get_spilled_size_in_bytes(self):
+        return -1
+
+    def get_paged_in_size_in_bytes(self):
+        return -1
+
 
 class NoOccurrenceStatisticTracker(OccurrenceStatisticTracker):
     def track_after_iteration(self, occurrence_list):
@@ -22,6 +43,10 @@ class NoOccurrenceStatisticTracker(OccurrenceStatisticTracker):
 class MaxOccurrenceStatisticTracker(OccurrenceStatisticTracker):
     def __init__(self):
         self.max_size = 0
+        self.max_size_in_bytes = 0
+        # total size of the occurrence lists written to and read from disk (see SpillingOccurrenceLists)
+        self.spilled_size_in_bytes = 0
+        self.paged_in_size_in_bytes = 0
 
     def track_after_iteration(self, occurrence_list):
         size = 0
@@ -33,5 +58,24 @@ class MaxOccurrenceStatisticTracker(OccurrenceStatisticTracker):
         if size > self.max_size:
             self.max_size = size
 
+        size_in_bytes = get_occurrence_lists_size_in_bytes(occurrence_list)
+        if size_in_bytes > self.max_size_in_bytes:
+            self.max_size_in_bytes = size_in_bytes
+
     def get_max_occurrence_size(self):
         return self.max_size
+
+    def get_max_occurrence_size_in_bytes(self):
+        return self.max_size_in_bytes
+
+    def track_spill(self, n_bytes: int):
+        self.spilled_size_in_bytes += n_bytes
+
+    def track_page_in(self, n_bytes: int):
+        self.paged_in_size_in_bytes += n_bytes
+
+    def get_spilled_size_in_bytes(self):
+        return self.spilled_size_in_bytes
+
+    def get_paged_in_size_in_bytes(self):
+        return self.paged_in_size_in_bytes
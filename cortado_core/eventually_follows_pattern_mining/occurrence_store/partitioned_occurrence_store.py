@@ -0,0 +1,160 @@
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import List, Optional, Tuple
+
+from cortado_core.eventually_follows_pattern_mining.frequency_counting.counting_strategy_factory import (
+    get_counting_strategy,
+)
+from cortado_core.eventually_follows_pattern_mining.obj import EventuallyFollowsPattern
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.rightmost_occurence_store import (
+    RightmostOccurrenceStore,
+)
+from cortado_core.eventually_follows_pattern_mining.util.tree import (
+    EventuallyFollowsStrategy,
+    create_trees_from_groups,
+    get_first_ef_node_id_per_node_for_trees,
+)
+from cortado_core.subprocess_discovery.subtree_mining.obj import (
+    FrequencyCountingStrategy,
+)
+from cortado_core.utils.split_graph import Group
+
+UPDATE_OCCURRENCE_LISTS = "update_occurrence_lists"
+SET_FREQUENT_1_PATTERNS = "set_frequent_1_patterns"
+CLOSE = "close"
+
+
+class PartitionedOccurrenceStore:
+    """
+    Drop-in replacement of the RightmostOccurrenceStore for generate_eventually_follows_patterns that partitions the
+    variants across worker processes. Each worker keeps a RightmostOccurrenceStore with the occurrence lists of its
+    partition and computes the partial supports of the candidates, the supports are the sums of the partial supports
+    (all counting strategies are sums over trees). Min-support pruning is applied after the aggregation, therefore the
+    worker stores do not stop early. Patterns that are not frequent or removed by the occurrence list cleaner are
+    removed from the workers with the next update.
+    """
+
+    def __init__(
+        self,
+        groups: List[Tuple[Group, int]],
+        freq_counting_strategy: FrequencyCountingStrategy,
+        min_support_count: int,
+        ef_strategy: EventuallyFollowsStrategy = EventuallyFollowsStrategy.RealEventuallyFollows,
+        n_processes: int = 2,
+        compact_occurrences: bool = False,
+        memory_budget: Optional[int] = None,
+    ):
+        """
+        :param groups: sorted variants (see Group.sort) with their number of traces, assigned round-robin to the
+        workers, i.e., sorting them by the number of traces balances the workers
+        :param memory_budget: memory budget of the occurrence lists of each worker (see RightmostOccurrenceStore)
+        """
+        self.min_support_count = min_support_count
+        self.removed_pattern_ids: List[int] = []
+        self.connections: List[Connection] = []
+        self.processes = []
+
+        for i in range(min(n_processes, len(groups))):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_partition_worker,
+                args=(
+                    worker_connection,
+                    groups[i::n_processes],
+                    freq_counting_strategy,
+                    ef_strategy,
+                    compact_occurrences,
+                    memory_budget,
+                ),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def set_frequent_1_patterns(self, frequent_1_patterns):
+        for connection in self.connections:
+            connection.send((SET_FREQUENT_1_PATTERNS, frequent_1_patterns))
+
+    def update_occurrence_lists(self, patterns: List[EventuallyFollowsPattern]):
+        for connection in self.connections:
+            connection.send(
+                (UPDATE_OCCURRENCE_LISTS, (self.removed_pattern_ids, patterns))
+            )
+        self.removed_pattern_ids = []
+
+        partial_supports = [connection.recv() for connection in self.connections]
+        for i, pattern in enumerate(patterns):
+            pattern.support = sum(supports[i] for supports in partial_supports)
+
+            if pattern.support < self.min_support_count:
+                self.removed_pattern_ids.append(pattern.id)
+                # like RightmostOccurrenceStore, which keeps the support of infrequent initial patterns
+                if pattern.predecessor_pattern is not None:
+                    pattern.support = -1
+
+    def remove_pattern(self, pattern: EventuallyFollowsPattern):
+        self.removed_pattern_ids.append(pattern.id)
+
+    def close(self):
+        for connection, process in zip(self.connections, self.processes):
+            if process.is_alive():
+                connection.send((CLOSE, None))
+            process.join()
+            connection.close()
+
+        self.connections = []
+        self.processes = []
+
+
+def run_partition_worker(
+    connection: Connection,
+    groups: List[Tuple[Group, int]],
+    freq_counting_strategy: FrequencyCountingStrategy,
+    ef_strategy: EventuallyFollowsStrategy,
+    compact_occurrences: bool,
+    memory_budget: Optional[int],
+):
+    trees = create_trees_from_groups(groups)
+    # min support 0: partial supports cannot be pruned
+    store = RightmostOccurrenceStore(
+        trees,
+        get_counting_strategy(freq_counting_strategy, trees),
+        0,
+        get_first_ef_node_id_per_node_for_trees(trees, ef_strategy),
+        compact_occurrences=compact_occurrences,
+        memory_budget=memory_budget,
+    )
+
+    while True:
+        command, args = connection.recv()
+
+        if command == CLOSE:
+            break
+
+        if command == SET_FREQUENT_1_PATTERNS:
+            store.set_frequent_1_patterns(args)
+            continue
+
+        removed_pattern_ids, patterns = args
+        for pattern_id in removed_pattern_ids:
+            store.occurrence_lists.pop(pattern_id, None)
+
+        store.update_occurrence_lists(patterns)
+        for pattern in patterns:
+            # frequent patterns may have no occurrences in this partition (not setdefault, which would page in
+            # spilled occurrence lists)
+            if pattern.id not in store.occurrence_lists:
+                store.occurrence_lists[pattern.id] = dict()
+
+        connection.send([max(pattern.support, 0) for pattern in patterns])
+
+    store.close()
+    connection.close()
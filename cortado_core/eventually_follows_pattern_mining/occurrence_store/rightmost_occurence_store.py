@@ -11,23 +11,27 @@ from cortado_core.eventually_follows_pattern_mining.frequency_counting.variant_t
     VariantTransactionCountingStrategy,
 )
 from cortado_core.eventually_follows_pattern_mining.obj import EventuallyFollowsPattern
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.compact_occurrence_list import (
+    CompactRightmostOccurrenceList,
+    TreeNodeTable,
+)
 from cortado_core.eventually_follows_pattern_mining.occurrence_store.occurrence_statistic_tracker import (
     OccurrenceStatisticTracker,
     NoOccurrenceStatisticTracker,
 )
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.spilling_occurrence_lists import (
+    SpillingOccurrenceLists,
+)
 from cortado_core.eventually_follows_pattern_mining.occurrence_store.util import (
     get_rightmost_occurrences_from_search_node,
     get_first_search_node,
+    join_eventually_follows_occurrences,
     should_check_only_first_search_node,
-    get_nodes_with_operator,
-    get_leaf_nodes_with_label,
+    LabelOperatorIndex,
     updated_sub_pattern_to_single_child_with_sequential_root,
 )
 from cortado_core.eventually_follows_pattern_mining.util.tree import (
     is_eventually_follows_relation,
-    get_right_check_node,
-    get_left_check_node,
-    is_eventually_follows_relation_with_ef_dict,
 )
 from cortado_core.subprocess_discovery.concurrency_trees.cTrees import ConcurrencyTree
 from cortado_core.subprocess_discovery.concurrency_trees.cTrees import (
@@ -43,8 +47,18 @@ class RightmostOccurrenceStore:
         min_support_count: int,
         ef_dict,
         size_tracker: Optional[OccurrenceStatisticTracker] = None,
+        label_operator_index: Optional[LabelOperatorIndex] = None,
+        compact_occurrences: bool = False,
+        memory_budget: Optional[int] = None,
+        spill_directory: Optional[str] = None,
     ):
+        """
+        :param memory_budget: if set, at most memory_budget bytes of occurrence lists are kept in memory, the others
+        are spilled to a temporary file in spill_directory (see SpillingOccurrenceLists). Implies compact_occurrences.
+        """
         self.trees = trees
+        # built on the first initial pattern if not given
+        self.label_operator_index = label_operator_index
         # pattern -> tree_index -> list((leftmost_occurrence, rightmost_occurrence, list(root_occurrences)))
         # maybe one can optimize this data structure. Currently, it enforces that the GC cannot delete any generated pattern.
         # However, id(pattern) is not suitable as a key, because it is only guaranteed to be unique in the lifetime of an object.
@@ -65,17 +79,52 @@ class RightmostOccurrenceStore:
         self.size_tracker = (
             size_tracker if size_tracker is not None else NoOccurrenceStatisticTracker()
         )
+        # stores the occurrence lists as CompactRightmostOccurrenceLists (smaller, but slower to access)
+        self.compact_occurrences = compact_occurrences or memory_budget is not None
+        self.node_tables: Dict[int, TreeNodeTable] = dict()
+        self.memory_budget = memory_budget
+        if memory_budget is not None:
+            self.occurrence_lists = SpillingOccurrenceLists(
+                memory_budget, self.get_node_table, self.size_tracker, spill_directory
+            )
+
+    def get_label_operator_index(self) -> LabelOperatorIndex:
+        if self.label_operator_index is None:
+            self.label_operator_index = LabelOperatorIndex(self.trees)
+        return self.label_operator_index
+
+    def get_node_table(self, tree_idx: int) -> TreeNodeTable:
+        if tree_idx not in self.node_tables:
+            self.node_tables[tree_idx] = TreeNodeTable(self.trees[tree_idx])
+        return self.node_tables[tree_idx]
 
     def set_frequent_1_patterns(self, frequent_1_patterns):
         self.frequent_1_pattern_ids = dict()
         for pattern in frequent_1_patterns:
             self.frequent_1_pattern_ids[pattern] = pattern.id
+            if self.memory_budget is not None:
+                self.occurrence_lists.pin(pattern.id)
 
     def update_occurrence_lists(self, patterns: List[EventuallyFollowsPattern]):
         for pattern in patterns:
             self.update_occurrence_lists_for_pattern(pattern)
+            if self.memory_budget is not None:
+                self.occurrence_lists.seal(pattern.id)
+
+        self.size_tracker.track_after_iteration(self.get_occurrence_lists_in_memory())
+
+    def get_occurrence_lists_in_memory(self):
+        if self.memory_budget is not None:
+            return self.occurrence_lists.in_memory
+
+        return self.occurrence_lists
 
-        self.size_tracker.track_after_iteration(self.occurrence_lists)
+    def close(self):
+        """
+        Removes the spill file, if occurrence lists were spilled.
+        """
+        if self.memory_budget is not None:
+            self.occurrence_lists.close()
 
     def update_occurrence_lists_for_pattern(self, pattern: EventuallyFollowsPattern):
         if pattern.predecessor_pattern is None:
@@ -101,8 +150,10 @@ class RightmostOccurrenceStore:
     def update_occurrence_lists_for_initial_pattern_with_operator(
         self, pattern: EventuallyFollowsPattern, operator: ConcurrencyTreeOperator
     ):
-        for i, tree in enumerate(self.trees):
-            rightmost_occurrence_list = get_nodes_with_operator(operator, tree)
+        nodes_per_tree = self.get_label_operator_index().get_nodes_with_operator(
+            operator
+        )
+        for i, rightmost_occurrence_list in nodes_per_tree.items():
             occurrence_list = [
                 (node, node, [node]) for node in rightmost_occurrence_list
             ]
@@ -113,8 +164,8 @@ class RightmostOccurrenceStore:
     def update_occurrence_lists_for_initial_pattern_with_label(
         self, pattern: EventuallyFollowsPattern, label: str
     ):
-        for i, tree in enumerate(self.trees):
-            rightmost_occurrence_list = get_leaf_nodes_with_label(label, tree)
+        nodes_per_tree = self.get_label_operator_index().get_nodes_with_label(label)
+        for i, rightmost_occurrence_list in nodes_per_tree.items():
             occurrence_list = [
                 (node, node, [node]) for node in rightmost_occurrence_list
             ]
@@ -178,30 +229,12 @@ class RightmostOccurrenceStore:
                     break
                 continue
 
-            matching_frequent_last_sub_pattern_occ_list = matching_frequent_pattern_occ[
-                tree_id
-            ]
-
-            for matching_occurrence in matching_frequent_last_sub_pattern_occ_list:
-                matching_lmo, matching_rmo, matching_ro = matching_occurrence
-                right_check_node = get_right_check_node(matching_occurrence)
-
-                for predecessor_occurrence in predecessor_occurrence_list:
-                    (
-                        predecessor_lmo,
-                        predecessor_rmo,
-                        predecessor_ro,
-                    ) = predecessor_occurrence
-                    left_check_node = get_left_check_node(predecessor_occurrence)
-                    if is_eventually_follows_relation_with_ef_dict(
-                        left_check_node, right_check_node, self.ef_dict[tree_id]
-                    ):
-                        new_ro = copy.copy(predecessor_ro)
-                        new_ro.append(matching_rmo)
-                        occurrence = (predecessor_lmo, matching_rmo, new_ro)
-                        new_occurrence_list.append(occurrence)
-                        if self.is_transaction_based_counting:
-                            break
+            new_occurrence_list = join_eventually_follows_occurrences(
+                predecessor_occurrence_list,
+                matching_frequent_pattern_occ[tree_id],
+                self.ef_dict[tree_id],
+                self.is_transaction_based_counting,
+            )
 
             support_to_gain, early_stopping = self.update_support(
                 tree_id,
@@ -365,6 +398,10 @@ class RightmostOccurrenceStore:
 
             # TODO niklas: check if needed
             new_occurrence_list.sort(key=lambda o: o[1].id)
+            if self.compact_occurrences:
+                new_occurrence_list = CompactRightmostOccurrenceList(
+                    new_occurrence_list, self.get_node_table(tree_idx)
+                )
             self.occurrence_lists[pattern.id][tree_idx] = new_occurrence_list
 
     def remove_pattern(self, pattern: EventuallyFollowsPattern):
@@ -0,0 +1,216 @@
+import mmap
+import sys
+import tempfile
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.compact_occurrence_list import (
+    CompactRightmostOccurrenceList,
+    TreeNodeTable,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.occurrence_statistic_tracker import (
+    OccurrenceStatisticTracker,
+)
+
+OccurrenceListsForTrees = Dict[int, CompactRightmostOccurrenceList]
+
+
+class SpillingOccurrenceLists(MutableMapping):
+    """
+    Replacement of the occurrence_lists dict (pattern id -> tree index -> compact occurrence list) of the
+    RightmostOccurrenceStore that keeps at most memory_budget bytes of occurrence lists in memory. If the budget is
+    exceeded, the occurrence lists of the least recently used patterns are appended to a temporary file, i.e. the
+    candidates of the current level, which are only extended in the next level, and the patterns that were already
+    extended. They are paged back via a memory map when they are accessed. Pinned patterns, i.e. the frequent
+    1-patterns that are used for each extension, stay in memory.
+    A pattern is only spilled after seal was called for it, i.e. after its occurrence lists are complete. Patterns
+    that were paged back are not written again, space of removed patterns in the file is not reused.
+    """
+
+    def __init__(
+        self,
+        memory_budget: int,
+        get_node_table: Callable[[int], TreeNodeTable],
+        size_tracker: OccurrenceStatisticTracker,
+        spill_directory: Optional[str] = None,
+    ):
+        """
+        :param memory_budget: size of the occurrence lists in memory in bytes (see get_occurrence_lists_size_in_bytes)
+        :param spill_directory: directory of the temporary file, the default temporary directory if not given
+        """
+        self.memory_budget = memory_budget
+        self.get_node_table = get_node_table
+        self.size_tracker = size_tracker
+        self.spill_directory = spill_directory
+        # in LRU order
+        self.in_memory: OrderedDict[int, OccurrenceListsForTrees] = OrderedDict()
+        # sizes of the sealed patterns in memory
+        self.sizes: Dict[int, int] = dict()
+        self.pinned: Set[int] = set()
+        self.in_memory_size = 0
+        # pattern id -> (offset, number of bytes), also kept for paged in patterns
+        self.on_disk: Dict[int, Tuple[int, int]] = dict()
+        self.file = None
+        self.file_size = 0
+        self.memory_map: Optional[mmap.mmap] = None
+
+    def __getitem__(self, pattern_id: int) -> OccurrenceListsForTrees:
+        if pattern_id in self.in_memory:
+            self.in_memory.move_to_end(pattern_id)
+            return self.in_memory[pattern_id]
+
+        if pattern_id in self.on_disk:
+            return self.__page_in(pattern_id)
+
+        raise KeyError(pattern_id)
+
+    def __setitem__(self, pattern_id: int, occurrence_lists: OccurrenceListsForTrees):
+        self.__discard(pattern_id)
+        self.in_memory[pattern_id] = occurrence_lists
+
+    def __delitem__(self, pattern_id: int):
+        if pattern_id not in self:
+            raise KeyError(pattern_id)
+        self.__discard(pattern_id)
+
+    def __contains__(self, pattern_id) -> bool:
+        return pattern_id in self.in_memory or pattern_id in self.on_disk
+
+    def __iter__(self):
+        yield from list(self.in_memory)
+        yield from [
+            pattern_id
+            for pattern_id in self.on_disk
+            if pattern_id not in self.in_memory
+        ]
+
+    def __len__(self) -> int:
+        return len(self.in_memory) + sum(
+            1 for pattern_id in self.on_disk if pattern_id not in self.in_memory
+        )
+
+    def seal(self, pattern_id: int):
+        """
+        Marks the occurrence lists of the pattern as complete, i.e. they can be spilled, and spills patterns until the
+        budget is met.
+        """
+        if pattern_id not in self.in_memory or pattern_id in self.sizes:
+            return
+
+        self.sizes[pattern_id] = get_size_in_bytes(self.in_memory[pattern_id])
+        self.in_memory_size += self.sizes[pattern_id]
+        self.in_memory.move_to_end(pattern_id)
+        self.__spill_until_budget_is_met()
+
+    def pin(self, pattern_id: int):
+        self.pinned.add(pattern_id)
+
+    def close(self):
+        if self.memory_map is not None:
+            self.memory_map.close()
+            self.memory_map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __discard(self, pattern_id: int):
+        self.on_disk.pop(pattern_id, None)
+        self.in_memory.pop(pattern_id, None)
+        self.in_memory_size -= self.sizes.pop(pattern_id, 0)
+
+    def __spill_until_budget_is_met(self):
+        if self.in_memory_size <= self.memory_budget:
+            return
+
+        # the most recently used pattern is kept, even if it exceeds the budget on its own
+        most_recently_used = next(reversed(self.in_memory))
+        pattern_ids = []
+        size_to_spill = self.in_memory_size - self.memory_budget
+        for pattern_id in self.in_memory:
+            if size_to_spill <= 0 or pattern_id == most_recently_used:
+                break
+            if pattern_id in self.sizes and pattern_id not in self.pinned:
+                pattern_ids.append(pattern_id)
+                size_to_spill -= self.sizes[pattern_id]
+
+        for pattern_id in pattern_ids:
+            self.__spill(pattern_id)
+
+    def __spill(self, pattern_id: int):
+        if pattern_id not in self.on_disk:
+            data = serialize(self.in_memory[pattern_id])
+            if self.file is None:
+                self.file = tempfile.TemporaryFile(dir=self.spill_directory)
+            self.file.seek(self.file_size)
+            self.file.write(data)
+            self.on_disk[pattern_id] = (self.file_size, len(data))
+            self.file_size += len(data)
+            self.size_tracker.track_spill(len(data))
+
+        del self.in_memory[pattern_id]
+        self.in_memory_size -= self.sizes.pop(pattern_id)
+
+    def __page_in(self, pattern_id: int) -> OccurrenceListsForTrees:
+        offset, n_bytes = self.on_disk[pattern_id]
+        if self.memory_map is None or len(self.memory_map) < offset + n_bytes:
+            # the file grew since it was mapped
+            self.file.flush()
+            if self.memory_map is not None:
+                self.memory_map.close()
+            self.memory_map = mmap.mmap(
+                self.file.fileno(), self.file_size, access=mmap.ACCESS_READ
+            )
+
+        data = array("i")
+        data.frombytes(self.memory_map[offset : offset + n_bytes])
+        occurrence_lists = deserialize(data, self.get_node_table)
+        self.size_tracker.track_page_in(n_bytes)
+
+        self.in_memory[pattern_id] = occurrence_lists
+        self.sizes[pattern_id] = get_size_in_bytes(occurrence_lists)
+        self.in_memory_size += self.sizes[pattern_id]
+        self.__spill_until_budget_is_met()
+
+        return occurrence_lists
+
+
+def get_size_in_bytes(occurrence_lists: OccurrenceListsForTrees) -> int:
+    return sys.getsizeof(occurrence_lists) + sum(
+        occurrence_list.get_size_in_bytes()
+        for occurrence_list in occurrence_lists.values()
+    )
+
+
+def serialize(occurrence_lists: OccurrenceListsForTrees) -> bytes:
+    """
+    Format: number of trees, followed by tree index, number of occurrences, length of the data array and the data
+    array of the compact occurrence list for each tree.
+    """
+    data = array("i", [len(occurrence_lists)])
+    for tree_idx, occurrence_list in occurrence_lists.items():
+        data.extend(
+            (tree_idx, occurrence_list.n_occurrences, len(occurrence_list.data))
+        )
+        data.extend(occurrence_list.data)
+
+    return data.tobytes()
+
+
+def deserialize(
+    data: array, get_node_table: Callable[[int], TreeNodeTable]
+) -> OccurrenceListsForTrees:
+    occurrence_lists = dict()
+    position = 1
+    for _ in range(data[0]):
+        tree_idx, n_occurrences, length = data[position : position + 3]
+        position += 3
+        occurrence_lists[tree_idx] = CompactRightmostOccurrenceList.from_data(
+            data[position : position + length],
+            n_occurrences,
+            get_node_table(tree_idx),
+        )
+        position += length
+
+    return occurrence_lists
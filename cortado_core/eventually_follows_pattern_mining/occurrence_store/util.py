@@ -1,14 +1,126 @@
-from typing import Optional, List
+import bisect
+import copy
+from typing import Dict, Optional, List, Tuple
 
 from cortado_core.eventually_follows_pattern_mining.obj import (
     EventuallyFollowsPattern,
     SubPattern,
 )
+from cortado_core.eventually_follows_pattern_mining.util.tree import (
+    get_left_check_node,
+    get_right_check_node,
+)
 from cortado_core.subprocess_discovery.concurrency_trees.cTrees import (
     cTreeOperator,
     ConcurrencyTree,
 )
 
+RightmostOccurrence = Tuple[ConcurrencyTree, ConcurrencyTree, List[ConcurrencyTree]]
+
+
+class LabelOperatorIndex:
+    """
+    Inverted index from labels and operators to the matching nodes of each tree (in DFS order, like
+    get_leaf_nodes_with_label and get_nodes_with_operator). It is built with a single traversal of each tree and
+    replaces the traversal of all trees for each candidate 1-pattern.
+    """
+
+    def __init__(self, trees: List[ConcurrencyTree]):
+        # label/operator -> tree index -> nodes
+        self.nodes_with_label: Dict[str, Dict[int, List[ConcurrencyTree]]] = dict()
+        self.nodes_with_operator: Dict[
+            cTreeOperator, Dict[int, List[ConcurrencyTree]]
+        ] = dict()
+
+        for tree_idx, tree in enumerate(trees):
+            self.add_tree(tree_idx, tree)
+
+    def add_tree(self, tree_idx: int, tree: ConcurrencyTree):
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if node.label is not None:
+                self.nodes_with_label.setdefault(node.label, dict()).setdefault(
+                    tree_idx, []
+                ).append(node)
+            if node.op is not None:
+                self.nodes_with_operator.setdefault(node.op, dict()).setdefault(
+                    tree_idx, []
+                ).append(node)
+            stack.extend(reversed(node.children))
+
+    def get_nodes_with_label(self, label: str) -> Dict[int, List[ConcurrencyTree]]:
+        return self.nodes_with_label.get(label, dict())
+
+    def get_nodes_with_operator(
+        self, operator: cTreeOperator
+    ) -> Dict[int, List[ConcurrencyTree]]:
+        return self.nodes_with_operator.get(operator, dict())
+
+
+def join_eventually_follows_occurrences(
+    predecessor_occurrence_list: List[RightmostOccurrence],
+    matching_occurrence_list: List[RightmostOccurrence],
+    ef_dict: Dict[int, int],
+    only_first_predecessor: bool,
+) -> List[RightmostOccurrence]:
+    """
+    Joins the occurrences of a predecessor pattern with the occurrences of the 1-pattern of the new sub pattern, i.e.,
+    returns the same occurrences in the same order as checking is_eventually_follows_relation_with_ef_dict for each
+    pair. A predecessor occurrence is eventually followed by a matching occurrence iff the id of the right check node
+    is at least the first eventually follows node id (ef_dict) of the left check node. Therefore, the predecessor
+    occurrences are sorted once by this id, and the predecessor occurrences of a matching occurrence are a prefix of
+    this order, which is found by binary search. Pairs without eventually follows relation are never visited.
+    :param predecessor_occurrence_list: occurrences of the predecessor pattern in a tree
+    :param matching_occurrence_list: occurrences of the 1-pattern of the new sub pattern in the same tree
+    :param ef_dict: first eventually follows node id per node id of the tree
+    :param only_first_predecessor: only join the first predecessor occurrence (in list order) with each matching
+    occurrence, sufficient for transaction-based counting
+    :return: occurrences of the new pattern
+    """
+    # (first ef node id, position in predecessor_occurrence_list)
+    first_ef_ids = []
+    for i, predecessor_occurrence in enumerate(predecessor_occurrence_list):
+        left_check_node_id = get_left_check_node(predecessor_occurrence).id
+        if left_check_node_id in ef_dict:
+            first_ef_ids.append((ef_dict[left_check_node_id], i))
+
+    new_occurrence_list = []
+    if len(first_ef_ids) == 0:
+        return new_occurrence_list
+
+    first_ef_ids.sort()
+    sorted_first_ef_ids = [first_ef_id for first_ef_id, _ in first_ef_ids]
+    sorted_positions = [i for _, i in first_ef_ids]
+    if only_first_predecessor:
+        # smallest position among the first k predecessor occurrences in sorted order
+        prefix_min_positions = []
+        for i in sorted_positions:
+            prefix_min_positions.append(
+                min(prefix_min_positions[-1], i) if prefix_min_positions else i
+            )
+
+    for matching_occurrence in matching_occurrence_list:
+        _, matching_rmo, _ = matching_occurrence
+        n_predecessors = bisect.bisect_right(
+            sorted_first_ef_ids, get_right_check_node(matching_occurrence).id
+        )
+        if n_predecessors == 0:
+            continue
+
+        if only_first_predecessor:
+            positions = [prefix_min_positions[n_predecessors - 1]]
+        else:
+            positions = sorted(sorted_positions[:n_predecessors])
+
+        for i in positions:
+            predecessor_lmo, _, predecessor_ro = predecessor_occurrence_list[i]
+            new_ro = copy.copy(predecessor_ro)
+            new_ro.append(matching_rmo)
+            new_occurrence_list.append((predecessor_lmo, matching_rmo, new_ro))
+
+    return new_occurrence_list
+
 
 def get_leaf_nodes_with_label(
     label: str, tree: ConcurrencyTree
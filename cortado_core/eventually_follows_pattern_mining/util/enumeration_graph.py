@@ -1,15 +1,11 @@
 from typing import Iterable, Optional, Dict, List
 
-from cortado_core.eventually_follows_pattern_mining.blanket_mining.algorithm import (
-    get_activities_for_patterns,
-    get_ef_preserving_tree_for_patterns,
-)
 from cortado_core.eventually_follows_pattern_mining.obj import EventuallyFollowsPattern
 from cortado_core.eventually_follows_pattern_mining.occurrence_store.full_occurrence_store import (
     FullOccurrenceStore,
 )
 from cortado_core.eventually_follows_pattern_mining.util.is_superpattern import (
-    is_superpattern,
+    SuperpatternIndex,
 )
 
 
@@ -32,12 +28,13 @@ class EnumerationNode:
 def build_enumeration_graph(
     patterns: Dict[int, Iterable[EventuallyFollowsPattern]], flat_patterns
 ):
-    activities_for_pattern = get_activities_for_patterns(flat_patterns)
     graph_root = EnumerationNode(pattern=None)
     graph_node_for_pattern = dict()
-    ef_preserving_trees_for_patterns = get_ef_preserving_tree_for_patterns(
-        flat_patterns
-    )
+    superpattern_index = SuperpatternIndex(flat_patterns)
+    position_for_pattern = {
+        pattern.id: position
+        for position, pattern in enumerate(superpattern_index.patterns)
+    }
 
     for k, k_patterns in patterns.items():
         for pattern in k_patterns:
@@ -52,8 +49,8 @@ def build_enumeration_graph(
                     patterns,
                     pattern,
                     k,
-                    activities_for_pattern,
-                    ef_preserving_trees_for_patterns,
+                    superpattern_index,
+                    position_for_pattern,
                 )
                 for predecessor_id in direct_predecessors:
                     graph_node_for_pattern[predecessor_id].direct_successors.add(node)
@@ -119,25 +116,26 @@ def build_enumeration_graph_for_combined_patterns(
 
 
 def __get_predecessors(
-    infix_patterns, pattern, k, activities_for_pattern, ef_preserving_trees_for_pattern
+    infix_patterns, pattern, k, superpattern_index, position_for_pattern
 ):
-    pattern_activities = activities_for_pattern[pattern.id]
     direct_predecessors = set()
     all_predecessors = set()
     search_direct = True
-    pattern_ef_preserving_tree, ef_dict = ef_preserving_trees_for_pattern[pattern.id]
+    position = position_for_pattern[pattern.id]
+    sub_pattern_candidate_ids = {
+        candidate.id
+        for candidate in superpattern_index.get_patterns(
+            superpattern_index.get_subpattern_candidates(position)
+        )
+    }
 
     for it_k in range(k - 1, 0, -1):
         sub_pattern_candidates = infix_patterns[it_k]
         for sub_pattern_candidate in sub_pattern_candidates:
-            if not activities_for_pattern[sub_pattern_candidate.id].issubset(
-                pattern_activities
-            ):
+            if sub_pattern_candidate.id not in sub_pattern_candidate_ids:
                 continue
 
-            if is_superpattern(
-                pattern_ef_preserving_tree, sub_pattern_candidate, ef_dict
-            ):
+            if superpattern_index.is_superpattern(position, sub_pattern_candidate):
                 if search_direct:
                     direct_predecessors.add(sub_pattern_candidate.id)
                     all_predecessors.add(sub_pattern_candidate.id)
@@ -1,5 +1,7 @@
 import copy
 import uuid
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from cortado_core.eventually_follows_pattern_mining.frequency_counting.variant_transaction_counting_strategy import (
     VariantTransactionCountingStrategy,
@@ -10,6 +12,7 @@ from cortado_core.eventually_follows_pattern_mining.occurrence_store.rightmost_o
 from cortado_core.eventually_follows_pattern_mining.util.tree import (
     get_root,
     get_rightmost_leaf,
+    get_first_ef_node_id_per_node_for_trees,
 )
 from cortado_core.subprocess_discovery.concurrency_trees.cTrees import (
     ConcurrencyTree,
@@ -19,12 +22,20 @@ from cortado_core.subprocess_discovery.concurrency_trees.cTrees import (
 from cortado_core.eventually_follows_pattern_mining.obj import (
     EventuallyFollowsPattern,
     SubPattern,
+    get_encoded_labels,
 )
 
 
 def is_superpattern(
-    ef_preserving_tree: ConcurrencyTree, pattern: EventuallyFollowsPattern, ef_dict
+    ef_preserving_tree: ConcurrencyTree,
+    pattern: EventuallyFollowsPattern,
+    ef_dict,
+    enumerated_pattern: Optional[List[EventuallyFollowsPattern]] = None,
 ):
+    """
+    :param enumerated_pattern: result of get_enumerated_pattern for the pattern, to reuse the enumeration if the
+    pattern is checked against several trees
+    """
     occ_store = RightmostOccurrenceStore(
         [ef_preserving_tree], VariantTransactionCountingStrategy(), 1, ef_dict
     )
@@ -34,9 +45,14 @@ def is_superpattern(
     if not are_all_1_patterns_frequent:
         return False
 
-    for p in enumerate_pattern(pattern, pid):
+    if enumerated_pattern is None:
+        enumerated_pattern = enumerate_pattern(pattern, pid)
+
+    for p in enumerated_pattern:
         if p.predecessor_pattern is not None:
             p.predecessor_pattern.support = 1
+        # the store does not set the support if there are no occurrences, enumerated patterns may be reused
+        p.support = 0
         occ_store.update_occurrence_lists([p])
         if p.support != 1:
             return False
@@ -44,8 +60,29 @@ def is_superpattern(
     return True
 
 
-def init_ef_1_patterns(pattern, occ_store):
-    idx = 0
+def get_enumerated_pattern(
+    pattern: EventuallyFollowsPattern,
+) -> List[EventuallyFollowsPattern]:
+    """
+    :return: the patterns of enumerate_pattern with the ids used by is_superpattern
+    """
+    labels_to_initialize, operators_to_initialize = get_1_patterns_to_initialize(
+        pattern
+    )
+    enumerated_pattern = []
+    for p in enumerate_pattern(
+        pattern, len(labels_to_initialize) + len(operators_to_initialize)
+    ):
+        # enumerate_pattern reuses the pattern object
+        enumerated = p.copy()
+        enumerated.id = p.id
+        enumerated.predecessor_pattern = p.predecessor_pattern
+        enumerated_pattern.append(enumerated)
+
+    return enumerated_pattern
+
+
+def get_1_patterns_to_initialize(pattern: EventuallyFollowsPattern):
     labels_to_initialize = set()
     operators_to_initialize = set()
     for infix_pattern in pattern.sub_patterns[1:]:
@@ -61,6 +98,15 @@ def init_ef_1_patterns(pattern, occ_store):
         else:
             labels_to_initialize.add(infix_pattern.label)
 
+    return labels_to_initialize, operators_to_initialize
+
+
+def init_ef_1_patterns(pattern, occ_store):
+    idx = 0
+    labels_to_initialize, operators_to_initialize = get_1_patterns_to_initialize(
+        pattern
+    )
+
     patterns_to_initialize = []
     for label in labels_to_initialize:
         ip = SubPattern(label=label, id=0, depth=0)
@@ -177,6 +223,8 @@ def enumerate_pattern(pattern: EventuallyFollowsPattern, pid):
 
         for infix_pattern, height_diff in infix_pattern_enumeration:
             new_pattern.sub_patterns[-1] = infix_pattern
+            # the pattern object is reused for all yielded patterns
+            new_pattern.invalidate_encoding()
             new_pattern.id = pid
             new_pattern.predecessor_pattern = predecessor
             new_pattern.rightmost_leaf = get_rightmost_leaf(infix_pattern)
@@ -228,3 +276,244 @@ def enumerate_infix_pattern(
         patterns += child_patterns
 
     return patterns, current_id, child_parent.parent, last_height
+
+
+class SuperpatternIndex:
+    """
+    Index of a set of patterns that restricts superpattern and subpattern checks to plausible candidates. An occurrence
+    of a pattern in the ef-preserving tree of a superpattern maps the leaves of the pattern to distinct leaves with the
+    same labels and preserves their relations, i.e., the labels (as a multiset) and the label relations (see
+    get_label_relations) of a pattern are contained in the ones of each superpattern. Both are encoded as a signature of
+    bits, with a bit for the i-th occurrence of each label and for each relation, such that the containment is a subset
+    check of the signatures. For each bit, the positions of the patterns with the bit set are kept as a bitset, the
+    candidates for a query are computed by combining these bitsets. Only the candidates are checked with
+    is_superpattern.
+    """
+
+    def __init__(self, patterns: Iterable[EventuallyFollowsPattern]):
+        self.patterns: List[EventuallyFollowsPattern] = list(patterns)
+        self.all_patterns = (1 << len(self.patterns)) - 1
+        # signature key (see get_signature_keys) -> bit
+        self.signature_bits: Dict[tuple, int] = dict()
+        self.signatures: List[List[int]] = []
+        positions_for_bit: List[List[int]] = []
+        positions_for_support: Dict[int, List[int]] = dict()
+
+        for position, pattern in enumerate(self.patterns):
+            signature = []
+            for key in get_signature_keys(pattern):
+                bit = self.signature_bits.setdefault(key, len(self.signature_bits))
+                if bit == len(positions_for_bit):
+                    positions_for_bit.append([])
+                positions_for_bit[bit].append(position)
+                signature.append(bit)
+            self.signatures.append(signature)
+            positions_for_support.setdefault(pattern.support, []).append(position)
+
+        # rare bits first, they remove most of the candidates
+        for signature in self.signatures:
+            signature.sort(key=lambda b: len(positions_for_bit[b]))
+
+        # bit -> bitset of the patterns with the bit set
+        self.patterns_with_bit: List[int] = [
+            self.__to_bitset(positions) for positions in positions_for_bit
+        ]
+        # support -> bitset of the patterns with the support
+        self.patterns_with_support: Dict[int, int] = {
+            support: self.__to_bitset(positions)
+            for support, positions in positions_for_support.items()
+        }
+        # position -> ef-preserving tree and its ef dict, created for the checked candidates only
+        self.ef_preserving_trees: Dict[int, Tuple[ConcurrencyTree, Any]] = dict()
+
+    def get_superpattern_candidates(self, position: int) -> int:
+        """
+        :param position: position of the pattern in patterns
+        :return: bitset of the positions of the patterns whose signature contains the signature of the pattern,
+        including the pattern itself
+        """
+        candidates = self.all_patterns
+        for bit in self.signatures[position]:
+            candidates &= self.patterns_with_bit[bit]
+            if candidates == 0:
+                break
+
+        return candidates
+
+    def get_subpattern_candidates(self, position: int) -> int:
+        """
+        :param position: position of the pattern in patterns
+        :return: bitset of the positions of the patterns whose signature is contained in the signature of the pattern,
+        including the pattern itself
+        """
+        signature = set(self.signatures[position])
+        excluded = 0
+        for bit, patterns_with_bit in enumerate(self.patterns_with_bit):
+            if bit not in signature:
+                excluded |= patterns_with_bit
+
+        return self.all_patterns & ~excluded
+
+    def get_patterns(self, bitset: int) -> List[EventuallyFollowsPattern]:
+        return [self.patterns[position] for position in self.__iterate_bitset(bitset)]
+
+    def is_superpattern(
+        self,
+        position: int,
+        pattern: EventuallyFollowsPattern,
+        enumerated_pattern: Optional[List[EventuallyFollowsPattern]] = None,
+    ):
+        """
+        :param enumerated_pattern: see is_superpattern
+        :return: True if the pattern at the position is a superpattern of the given pattern
+        """
+        if self.patterns[position] == pattern:
+            # compares the cached encodings, no occurrence check needed
+            return True
+
+        if position not in self.ef_preserving_trees:
+            ef_preserving_tree = get_ef_preserving_concurrency_tree(
+                self.patterns[position]
+            )
+            self.ef_preserving_trees[position] = (
+                ef_preserving_tree,
+                get_first_ef_node_id_per_node_for_trees([ef_preserving_tree]),
+            )
+        ef_preserving_tree, ef_dict = self.ef_preserving_trees[position]
+
+        return is_superpattern(ef_preserving_tree, pattern, ef_dict, enumerated_pattern)
+
+    def get_maximal_patterns(self) -> Set[EventuallyFollowsPattern]:
+        """
+        :return: the patterns that have no superpattern in the index
+        """
+        return self.__filter_patterns(with_same_support=False)
+
+    def get_closed_patterns(self) -> Set[EventuallyFollowsPattern]:
+        """
+        :return: the patterns that have no superpattern with the same support in the index
+        """
+        return self.__filter_patterns(with_same_support=True)
+
+    def __filter_patterns(
+        self, with_same_support: bool
+    ) -> Set[EventuallyFollowsPattern]:
+        filtered = set()
+        # filtered out patterns are no candidates anymore, a superpattern of them has a superpattern among the
+        # remaining candidates as well
+        remaining_candidates = self.all_patterns
+
+        for position, pattern in enumerate(self.patterns):
+            candidates = self.get_superpattern_candidates(position)
+            candidates &= remaining_candidates & ~(1 << position)
+            if with_same_support:
+                # the support is anti-monotone, a superpattern cannot have a higher support
+                candidates &= self.patterns_with_support[pattern.support]
+
+            enumerated_pattern = (
+                get_enumerated_pattern(pattern) if candidates != 0 else None
+            )
+            if any(
+                self.is_superpattern(candidate, pattern, enumerated_pattern)
+                for candidate in self.__iterate_bitset(candidates)
+            ):
+                remaining_candidates &= ~(1 << position)
+            else:
+                filtered.add(pattern)
+
+        return filtered
+
+    def __to_bitset(self, positions: List[int]) -> int:
+        bitset = bytearray((len(self.patterns) + 7) // 8)
+        for position in positions:
+            bitset[position >> 3] |= 1 << (position & 7)
+
+        return int.from_bytes(bitset, "little")
+
+    @staticmethod
+    def __iterate_bitset(bitset: int):
+        while bitset:
+            lowest_bit = bitset & -bitset
+            yield lowest_bit.bit_length() - 1
+            bitset ^= lowest_bit
+
+
+def get_closed_and_maximal_patterns(
+    patterns: Dict[int, Iterable[EventuallyFollowsPattern]],
+) -> Tuple[Set[EventuallyFollowsPattern], Set[EventuallyFollowsPattern]]:
+    """
+    Computes the closed and the maximal patterns of a result of the pattern mining algorithms in one call, sharing
+    the index and the ef-preserving trees of the patterns.
+    :param patterns: patterns per size
+    :return: closed patterns, maximal patterns
+    """
+    index = SuperpatternIndex(
+        pattern for level in patterns.values() for pattern in level
+    )
+
+    return index.get_closed_patterns(), index.get_maximal_patterns()
+
+
+def get_signature_keys(pattern: EventuallyFollowsPattern) -> List[tuple]:
+    """
+    :return: (label, i) for the i-th occurrence (starting with 0) of each label and the label relations
+    """
+    # the labels are read from the cached encoding instead of traversing the sub-patterns
+    label_counts = Counter()
+    for encoding in pattern.get_encoding():
+        label_counts.update(get_encoded_labels(encoding))
+
+    return [
+        (label, i) for label, count in label_counts.items() for i in range(count)
+    ] + list(get_label_relations(pattern))
+
+
+def get_label_relations(pattern: EventuallyFollowsPattern) -> Set[tuple]:
+    """
+    :return: (Sequential, a, b) if a leaf with label b follows a leaf with label a, in the same sub-pattern or in a
+    later one, and (Concurrent, a, b) with a <= b if two leaves with the labels are concurrent
+    """
+    relations = set()
+    labels_of_previous_sub_patterns = set()
+
+    for sub_pattern in pattern.sub_patterns:
+        labels = __add_label_relations(sub_pattern, relations)
+        relations.update(
+            (cTreeOperator.Sequential, previous_label, label)
+            for previous_label in labels_of_previous_sub_patterns
+            for label in labels
+        )
+        labels_of_previous_sub_patterns.update(labels)
+
+    return relations
+
+
+def __add_label_relations(sub_pattern: SubPattern, relations: Set[tuple]) -> Set[str]:
+    if sub_pattern.label is not None:
+        return {sub_pattern.label}
+
+    labels_of_previous_children = set()
+    for child in sub_pattern.children:
+        labels = __add_label_relations(child, relations)
+        if sub_pattern.operator == cTreeOperator.Sequential:
+            relations.update(
+                (cTreeOperator.Sequential, previous_label, label)
+                for previous_label in labels_of_previous_children
+                for label in labels
+            )
+        elif sub_pattern.operator == cTreeOperator.Concurrent:
+            relations.update(
+                (cTreeOperator.Concurrent, *sorted((previous_label, label)))
+                for previous_label in labels_of_previous_children
+                for label in labels
+            )
+        labels_of_previous_children.update(labels)
+
+    return labels_of_previous_children
+
+
+def get_labels(sub_pattern: SubPattern) -> List[str]:
+    if sub_pattern.label is not None:
+        return [sub_pattern.label]
+
+    return [label for child in sub_pattern.children for label in get_labels(child)]
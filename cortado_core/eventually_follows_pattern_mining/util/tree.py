@@ -5,10 +5,14 @@ from cortado_core.eventually_follows_pattern_mining.obj import (
     SubPattern,
     EventuallyFollowsPattern,
 )
-from cortado_core.subprocess_discovery.concurrency_trees.cTrees import ConcurrencyTree
+from cortado_core.subprocess_discovery.concurrency_trees.cTrees import (
+    ConcurrencyTree,
+    cTreeFromcGroup,
+)
 from cortado_core.subprocess_discovery.concurrency_trees.cTrees import (
     cTreeOperator as ConcurrencyTreeOperator,
 )
+from cortado_core.utils.split_graph import Group
 
 
 class EventuallyFollowsStrategy(Enum):
@@ -31,6 +35,23 @@ def __set_tree_attributes_bfs(tree: ConcurrencyTree, offset: int):
             queue += current.children
 
 
+def create_trees_from_groups(groups: List[Tuple[Group, int]]) -> List[ConcurrencyTree]:
+    """
+    Creates the concurrency trees used for mining from variants.
+    :param groups: sorted variants (see Group.sort) with their number of traces
+    :return: one tree per variant, in the order of groups
+    """
+    trees = []
+
+    for group, n_traces in groups:
+        tree = cTreeFromcGroup(group)
+        tree.n_traces = n_traces
+        set_tree_attributes(tree)
+        trees.append(tree)
+
+    return trees
+
+
 def set_tree_attributes(tree: ConcurrencyTree):
     __set_tree_attributes_bfs(tree, 0)
     __set_tree_attributes_dfs(tree, 0, 0)
@@ -1,7 +1,7 @@
 import itertools
 import logging
 from collections import OrderedDict
-from typing import List, Tuple, Dict, OrderedDict, FrozenSet, Iterable, Union
+from typing import List, Tuple, Dict, OrderedDict, FrozenSet, Iterable, Union, Optional
 
 import pm4py
 from pm4py.objects.log.obj import EventLog, Trace, Event
@@ -9,6 +9,10 @@ from pm4py.objects.process_tree.obj import Operator, ProcessTree
 from pm4py.objects.process_tree.utils.generic import parse as pt_parse
 from pm4py.stats import get_event_attribute_values
 
+from cortado_core.freezing.freezing_cache import (
+    FreezingCache,
+    get_frozen_subtrees_fingerprint,
+)
 from cortado_core.freezing.project_log import project_log
 from cortado_core.freezing.reinsert_frozen_subtrees import reinsert_frozen_subtrees
 from cortado_core.freezing.project_trace import project_trace
@@ -33,6 +37,7 @@ def add_trace_to_pt_language_with_freezing(
     add_missing_frozen_subtrees_at_root_level: bool = False,
     add_artificial_start_end: bool = True,
     pool=None,
+    cache: Optional[FreezingCache] = None,
 ) -> Tuple[ProcessTree, List[ProcessTree]]:
     """
     Checks if a given trace can be replayed on the given process tree. If not, the tree will be altered to accept the
@@ -43,6 +48,8 @@ def add_trace_to_pt_language_with_freezing(
     :param pt: ProcessTree
     :param log: EventLog or list of typed traces, accepted by pt
     :param trace: trace that should be accepted by pt in the end
+    :param cache: cache that is reused when traces are added one after another with the same frozen subtrees, pass the
+    same instance to every call
     :return: process tree that accepts the given log and trace
     """
     for pt_1, pt_2 in itertools.combinations(frozen_subtrees, 2):
@@ -57,6 +64,9 @@ def add_trace_to_pt_language_with_freezing(
     if isinstance(trace, Trace):
         trace = TypedTrace(trace, InfixType.NOT_AN_INFIX)
 
+    if cache is not None:
+        cache.invalidate_if_tree_changed(pt)
+
     if not typed_trace_fits_process_tree(trace, pt):
         # deepcopy frozen subtrees because otherwise they might get changed due to process tree changes
         # frozen_subtrees = [copy.deepcopy(frozen_subtree) for frozen_subtree in frozen_subtrees]
@@ -85,8 +95,19 @@ def add_trace_to_pt_language_with_freezing(
 
         incremental_projected_logs: Dict[FrozenSet[Tuple[ProcessTree, int]], EventLog]
         final_projected_log: EventLog
+        frozen_subtrees_fingerprint = None
+        if cache is not None:
+            # computed once per call, project_log drops the cache entries if other subtrees were frozen before
+            frozen_subtrees_fingerprint = get_frozen_subtrees_fingerprint(
+                frozen_subtrees_replacement_label
+            )
+
         incremental_projected_logs, final_projected_log = project_log(
-            pt, log, frozen_subtrees_replacement_label
+            pt,
+            log,
+            frozen_subtrees_replacement_label,
+            cache=cache,
+            frozen_subtrees_fingerprint=frozen_subtrees_fingerprint,
         )
 
         incremental_projected_traces: Dict[FrozenSet[Tuple[ProcessTree, int]], Trace]
@@ -128,6 +149,7 @@ def add_trace_to_pt_language_with_freezing(
             incremental_projected_traces,
             trace,
             add_missing_frozen_subtrees_at_root_level=add_missing_frozen_subtrees_at_root_level,
+            cache=cache,
         )
         print(pt)
 
@@ -137,6 +159,9 @@ def add_trace_to_pt_language_with_freezing(
         logging.debug(res_print)
 
         assert typed_trace_fits_process_tree(trace, pt)
+
+    if cache is not None:
+        cache.set_resulting_tree(pt)
     return pt, frozen_subtrees
 
 
@@ -0,0 +1,61 @@
+from typing import Dict, Optional, OrderedDict, Set, Tuple
+
+from pm4py.objects.log.obj import Trace
+from pm4py.objects.process_tree.obj import ProcessTree
+
+from cortado_core.models.infix_type import InfixType
+from cortado_core.process_tree_utils.persistent_tree import (
+    PersistentProcessTree,
+    to_persistent_tree,
+)
+
+Variant = Tuple[Tuple[str, ...], InfixType]
+FrozenSubtreesFingerprint = Tuple[Tuple[str, PersistentProcessTree], ...]
+
+
+class FreezingCache:
+    """
+    Keeps intermediate results of add_trace_to_pt_language_with_freezing between calls, i.e., when traces are added
+    one after another with the same frozen subtrees.
+    - projected traces per variant.
+    - execution numbers per (subtree, replacement label).
+    Both stay valid as long as the process tree passed to the next call is the one returned by the previous call and
+    the frozen subtrees (see get_frozen_subtrees_fingerprint) do not change. Otherwise, e.g., if the user edited the
+    tree or froze other subtrees, all entries are dropped.
+    """
+
+    def __init__(self):
+        self.projected_traces: Dict[Variant, Tuple[Trace, ...]] = {}
+        self.execution_numbers: Dict[Tuple[PersistentProcessTree, str], Set] = {}
+        self.tree: Optional[PersistentProcessTree] = None
+        self.frozen_subtrees_fingerprint: Optional[FrozenSubtreesFingerprint] = None
+
+    def invalidate_if_tree_changed(self, pt: ProcessTree):
+        if self.tree is not None and self.tree != to_persistent_tree(pt):
+            self.clear()
+
+    def set_frozen_subtrees_fingerprint(self, fingerprint: FrozenSubtreesFingerprint):
+        if fingerprint != self.frozen_subtrees_fingerprint:
+            self.clear()
+            self.frozen_subtrees_fingerprint = fingerprint
+
+    def set_resulting_tree(self, pt: ProcessTree):
+        self.tree = to_persistent_tree(pt)
+
+    def clear(self):
+        self.projected_traces = {}
+        self.execution_numbers = {}
+
+
+def get_frozen_subtrees_fingerprint(
+    frozen_subtrees: OrderedDict[Tuple[ProcessTree, int], str],
+) -> FrozenSubtreesFingerprint:
+    # replacement labels are derived from the object ids of the frozen subtrees, the snapshot covers their structure
+    return tuple(
+        (replacement_label, to_persistent_tree(k[0]))
+        for k, replacement_label in frozen_subtrees.items()
+    )
+
+
+def get_variant(trace: Trace, infix_type: InfixType) -> Variant:
+    return tuple(e["concept:name"] for e in trace), infix_type
@@ -1,9 +1,16 @@
-from typing import Dict, Tuple, List, FrozenSet, OrderedDict, Union
+from typing import Dict, Tuple, List, FrozenSet, OrderedDict, Union, Optional
 
 from pm4py.objects.log.obj import EventLog, Trace, Event
 from pm4py.objects.process_tree.obj import ProcessTree
 from pm4py.objects.process_tree.utils.generic import parse as pt_parse
 import pm4py.visualization.process_tree.visualizer as tree_vis
+from cortado_core.freezing.freezing_cache import (
+    FreezingCache,
+    FrozenSubtreesFingerprint,
+    Variant,
+    get_frozen_subtrees_fingerprint,
+    get_variant,
+)
 from cortado_core.models.infix_type import InfixType
 
 from cortado_core.process_tree_utils.miscellaneous import (
@@ -32,19 +39,39 @@ def project_log(
     pt: ProcessTree,
     log: Union[EventLog, List[TypedTrace]],
     frozen_subtrees: OrderedDict[Tuple[ProcessTree, int], str],
+    cache: Optional[FreezingCache] = None,
+    frozen_subtrees_fingerprint: Optional[FrozenSubtreesFingerprint] = None,
 ) -> Tuple[Dict[FrozenSet[Tuple[ProcessTree, int]], EventLog], EventLog]:
+    """
+    :param cache: reuses the projections of variants that were projected in previous calls with the same frozen subtrees
+    :param frozen_subtrees_fingerprint: fingerprint of frozen_subtrees if already computed by the caller, only used
+    with a cache
+    """
     if isinstance(log, EventLog):
         log = [TypedTrace(trace, InfixType.NOT_AN_INFIX) for trace in log]
 
-    # assumption: log is replayable on process tree without deviations
-    alignments = []
-    for trace in log:
-        alignment = calculate_alignment_typed_trace(pt, trace)
-        if trace.infix_type != InfixType.NOT_AN_INFIX:
-            alignment = generate_full_alignment_based_on_infix_alignment(
-                trace.infix_type, alignment
+    if cache is not None:
+        if frozen_subtrees_fingerprint is None:
+            frozen_subtrees_fingerprint = get_frozen_subtrees_fingerprint(
+                frozen_subtrees
             )
-        alignments.append(alignment)
+        cache.set_frozen_subtrees_fingerprint(frozen_subtrees_fingerprint)
+
+    # every variant is aligned and projected only once, the projections are shared between traces of the same variant
+    projections: Dict[Variant, Tuple[Trace, ...]] = {}
+    for typed_trace in log:
+        variant = get_variant(typed_trace.trace, typed_trace.infix_type)
+        if variant in projections:
+            continue
+        if cache is not None and variant in cache.projected_traces:
+            projections[variant] = cache.projected_traces[variant]
+            continue
+
+        projections[variant] = __project_trace_incrementally(
+            pt, typed_trace, frozen_subtrees
+        )
+        if cache is not None:
+            cache.projected_traces[variant] = projections[variant]
 
     replaced_frozen_subtrees: List[Tuple[ProcessTree, int]] = []
     incrementally_projected_logs: Dict[FrozenSet[Tuple[ProcessTree, int]], EventLog] = (
@@ -52,116 +79,151 @@ def project_log(
     )
     final_projected_log: EventLog
 
-    for frozen_subtree in frozen_subtrees:
+    for i, frozen_subtree in enumerate(frozen_subtrees):
         # incrementally replace the frozen subtree(s)
-
         replaced_frozen_subtrees.append(frozen_subtree)
-        res = []
-
-        for i, alignment in enumerate(alignments):
-            current_infix_type = log[i].infix_type
-            assert (
-                not alignment_contains_deviation(alignment)
-                or current_infix_type != InfixType.NOT_AN_INFIX
-            )
-            trace = Trace()
-
-            if current_infix_type == InfixType.NOT_AN_INFIX:
-                for step in alignment["alignment"]:
-                    # executed transition always corresponds to a node in the process tree
-                    current_pt: ProcessTree = step[0][1][0]
-                    assert type(current_pt) is ProcessTree
-                    # determine if current_pt is frozen
-                    current_pt_frozen = False
-                    for f_pt, f_pt_id in replaced_frozen_subtrees:
-                        if subtree_is_part_of_tree_based_on_obj_id(current_pt, f_pt):
-                            current_pt_frozen = True
-
-                    activity_label = None
-                    if is_visible_leaf(current_pt) and not current_pt_frozen:
-                        activity_label = step[1][1]
-                    elif (
-                        current_pt_frozen
-                        and pt_dict_key(current_pt) in replaced_frozen_subtrees
-                    ):
-                        if step[0][1][1] == "active":
-                            activity_label = (
-                                frozen_subtrees[pt_dict_key(current_pt)] + "+ACTIVATED"
-                            )
-                        elif step[0][1][1] == "closed":
-                            activity_label = (
-                                frozen_subtrees[pt_dict_key(current_pt)] + "+CLOSED"
-                            )
-                    if activity_label:
-                        event = Event()
-                        event["concept:name"] = activity_label
-                        trace.append(event)
-            else:
-                infix_opened = False
-                open_frozen_trees = []
-                for step in alignment["alignment"]:
-                    # executed transition always corresponds to a node in the process tree
-                    current_pt: ProcessTree = step[0][1][0]
-                    assert type(current_pt) is ProcessTree
-                    # determine if current_pt is frozen
-                    current_pt_frozen = False
-                    for f_pt, f_pt_id in replaced_frozen_subtrees:
-                        if subtree_is_part_of_tree_based_on_obj_id(current_pt, f_pt):
-                            current_pt_frozen = True
-
-                    if not infix_opened and is_sync_move(step):
-                        infix_opened = True
-                        # insert open replacement labels for frozen subtrees opened before infix
-                        for open_pt in open_frozen_trees:
-                            replacement_label = (
-                                frozen_subtrees[pt_dict_key(open_pt)] + "+ACTIVATED"
-                            )
-                            trace.append(Event({"concept:name": replacement_label}))
-                    elif infix_opened and not alignment_step_represents_no_deviation(
-                        step
-                    ):
-                        # the rest of the alignment has deviations and the infix closed
-                        infix_opened = False
-                        # insert closing replacement labels for open frozen subtrees
-                        for open_pt in reversed(open_frozen_trees):
-                            replacement_label = (
-                                frozen_subtrees[pt_dict_key(open_pt)] + "+CLOSED"
-                            )
-                            trace.append(Event({"concept:name": replacement_label}))
-                        break
-
-                    if pt_dict_key(current_pt) in replaced_frozen_subtrees:
-                        if step[0][1][1] == "active":
-                            open_frozen_trees.append(current_pt)
-                            if infix_opened:
-                                replacement_label = (
-                                    frozen_subtrees[pt_dict_key(current_pt)]
-                                    + "+ACTIVATED"
-                                )
-                                trace.append(Event({"concept:name": replacement_label}))
-
-                        elif step[0][1][1] == "closed":
-                            open_frozen_trees.remove(current_pt)
-                            if infix_opened:
-                                replacement_label = (
-                                    frozen_subtrees[pt_dict_key(current_pt)] + "+CLOSED"
-                                )
-                                trace.append(Event({"concept:name": replacement_label}))
-
-                    if (
-                        is_visible_leaf(current_pt)
-                        and is_sync_move(step)
-                        and not current_pt_frozen
-                    ):
-                        trace.append(Event({"concept:name": step[1][1]}))
-
-            typed_trace = TypedTrace(trace, log[i].infix_type)
-            res.append(typed_trace)
+        res = [
+            TypedTrace(projections[get_variant(t.trace, t.infix_type)][i], t.infix_type)
+            for t in log
+        ]
         incrementally_projected_logs[frozenset(replaced_frozen_subtrees)] = res
         final_projected_log = res
     return incrementally_projected_logs, final_projected_log
 
 
+def __project_trace_incrementally(
+    pt: ProcessTree,
+    typed_trace: TypedTrace,
+    frozen_subtrees: OrderedDict[Tuple[ProcessTree, int], str],
+) -> Tuple[Trace, ...]:
+    """
+    Projects a trace that fits pt once for every prefix of frozen_subtrees, i.e., the i-th projection replaces the first
+    i+1 frozen subtrees.
+    """
+    # assumption: trace is replayable on process tree without deviations
+    alignment = calculate_alignment_typed_trace(pt, typed_trace)
+    if typed_trace.infix_type != InfixType.NOT_AN_INFIX:
+        alignment = generate_full_alignment_based_on_infix_alignment(
+            typed_trace.infix_type, alignment
+        )
+
+    replaced_frozen_subtrees: List[Tuple[ProcessTree, int]] = []
+    projections = []
+    for frozen_subtree in frozen_subtrees:
+        replaced_frozen_subtrees.append(frozen_subtree)
+        projections.append(
+            __project_alignment(
+                alignment,
+                typed_trace.infix_type,
+                replaced_frozen_subtrees,
+                frozen_subtrees,
+            )
+        )
+
+    return tuple(projections)
+
+
+def __project_alignment(
+    alignment,
+    current_infix_type: InfixType,
+    replaced_frozen_subtrees: List[Tuple[ProcessTree, int]],
+    frozen_subtrees: OrderedDict[Tuple[ProcessTree, int], str],
+) -> Trace:
+    assert (
+        not alignment_contains_deviation(alignment)
+        or current_infix_type != InfixType.NOT_AN_INFIX
+    )
+    trace = Trace()
+
+    if current_infix_type == InfixType.NOT_AN_INFIX:
+        for step in alignment["alignment"]:
+            # executed transition always corresponds to a node in the process tree
+            current_pt: ProcessTree = step[0][1][0]
+            assert type(current_pt) is ProcessTree
+            # determine if current_pt is frozen
+            current_pt_frozen = False
+            for f_pt, f_pt_id in replaced_frozen_subtrees:
+                if subtree_is_part_of_tree_based_on_obj_id(current_pt, f_pt):
+                    current_pt_frozen = True
+
+            activity_label = None
+            if is_visible_leaf(current_pt) and not current_pt_frozen:
+                activity_label = step[1][1]
+            elif (
+                current_pt_frozen
+                and pt_dict_key(current_pt) in replaced_frozen_subtrees
+            ):
+                if step[0][1][1] == "active":
+                    activity_label = (
+                        frozen_subtrees[pt_dict_key(current_pt)] + "+ACTIVATED"
+                    )
+                elif step[0][1][1] == "closed":
+                    activity_label = (
+                        frozen_subtrees[pt_dict_key(current_pt)] + "+CLOSED"
+                    )
+            if activity_label:
+                event = Event()
+                event["concept:name"] = activity_label
+                trace.append(event)
+    else:
+        infix_opened = False
+        open_frozen_trees = []
+        for step in alignment["alignment"]:
+            # executed transition always corresponds to a node in the process tree
+            current_pt: ProcessTree = step[0][1][0]
+            assert type(current_pt) is ProcessTree
+            # determine if current_pt is frozen
+            current_pt_frozen = False
+            for f_pt, f_pt_id in replaced_frozen_subtrees:
+                if subtree_is_part_of_tree_based_on_obj_id(current_pt, f_pt):
+                    current_pt_frozen = True
+
+            if not infix_opened and is_sync_move(step):
+                infix_opened = True
+                # insert open replacement labels for frozen subtrees opened before infix
+                for open_pt in open_frozen_trees:
+                    replacement_label = (
+                        frozen_subtrees[pt_dict_key(open_pt)] + "+ACTIVATED"
+                    )
+                    trace.append(Event({"concept:name": replacement_label}))
+            elif infix_opened and not alignment_step_represents_no_deviation(step):
+                # the rest of the alignment has deviations and the infix closed
+                infix_opened = False
+                # insert closing replacement labels for open frozen subtrees
+                for open_pt in reversed(open_frozen_trees):
+                    replacement_label = (
+                        frozen_subtrees[pt_dict_key(open_pt)] + "+CLOSED"
+                    )
+                    trace.append(Event({"concept:name": replacement_label}))
+                break
+
+            if pt_dict_key(current_pt) in replaced_frozen_subtrees:
+                if step[0][1][1] == "active":
+                    open_frozen_trees.append(current_pt)
+                    if infix_opened:
+                        replacement_label = (
+                            frozen_subtrees[pt_dict_key(current_pt)] + "+ACTIVATED"
+                        )
+                        trace.append(Event({"concept:name": replacement_label}))
+
+                elif step[0][1][1] == "closed":
+                    open_frozen_trees.remove(current_pt)
+                    if infix_opened:
+                        replacement_label = (
+                            frozen_subtrees[pt_dict_key(current_pt)] + "+CLOSED"
+                        )
+                        trace.append(Event({"concept:name": replacement_label}))
+
+            if (
+                is_visible_leaf(current_pt)
+                and is_sync_move(step)
+                and not current_pt_frozen
+            ):
+                trace.append(Event({"concept:name": step[1][1]}))
+
+    return trace
+
+
 if __name__ == "__main__":
     pt_1: ProcessTree = pt_parse(
         "-> (*(X(->('A','B'),->('C','D')),tau) ,->('E',->('A','F')) )"
@@ -1,4 +1,3 @@
-import copy
 from typing import List, Dict, Set, Tuple, OrderedDict, FrozenSet, Union
 
 from pm4py.objects.log.obj import Trace, Event
@@ -19,6 +18,7 @@ from cortado_core.process_tree_utils.miscellaneous import (
     subtree_is_part_of_tree_based_on_obj_id,
     is_leaf_node,
 )
+from cortado_core.process_tree_utils.persistent_tree import copy_process_tree
 from cortado_core.process_tree_utils.to_petri_net_transition_bordered import (
     apply as pt_to_petri_net,
 )
@@ -79,7 +79,7 @@ def project_trace(
         Tuple[ProcessTree, int], Tuple[ProcessTree, int]
     ] = {}
     for k in frozen_subtrees_replacement_labels:
-        tree_copy = copy.deepcopy(k[0])
+        tree_copy = copy_process_tree(k[0])
         mapping_copied_tree_to_original_tree[pt_dict_key(tree_copy)] = k
         copied_frozen_subtrees.append(tree_copy)
         copied_frozen_subtrees_replacement_label[pt_dict_key(tree_copy)] = (
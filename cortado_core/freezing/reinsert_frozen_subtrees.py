@@ -1,8 +1,7 @@
 import collections
-import copy
 import math
 import logging
-from typing import Dict, List, Tuple, OrderedDict, FrozenSet
+from typing import Dict, List, Tuple, OrderedDict, FrozenSet, Optional
 
 from pm4py.objects.process_tree.obj import ProcessTree
 from pm4py.objects.process_tree.utils.generic import parse as pt_parse
@@ -18,12 +17,14 @@ from pm4py.objects.petri_net.utils import align_utils
 
 from pm4py.objects.conversion.process_tree.converter import apply as pt_to_net
 
+from cortado_core.freezing.freezing_cache import FreezingCache, get_variant
 from cortado_core.process_tree_utils.miscellaneous import (
     is_leaf_node,
     replace_tree_in_children,
     get_root,
     pt_dict_key,
 )
+from cortado_core.process_tree_utils.persistent_tree import to_persistent_tree
 import pm4py.visualization.process_tree.visualizer as tree_vis
 
 from cortado_core.process_tree_utils.reduction import (
@@ -33,6 +34,7 @@ from cortado_core.process_tree_utils.reduction import (
 )
 from cortado_core.utils.alignment_utils import typed_trace_fits_process_tree
 from cortado_core.utils.lca_utils import find_lowest_common_ancestor
+from cortado_core.utils.trace import TypedTrace
 
 
 def reinsert_frozen_subtrees(
@@ -43,6 +45,7 @@ def reinsert_frozen_subtrees(
     incremental_projected_traces: Dict[FrozenSet[Tuple[ProcessTree, int]], Trace],
     original_trace: Trace,
     add_missing_frozen_subtrees_at_root_level: bool = False,
+    cache: Optional[FreezingCache] = None,
 ) -> ProcessTree:
     # tree_vis.view(tree_vis.apply(pt, parameters={"format": "svg"}))
 
@@ -137,13 +140,13 @@ def reinsert_frozen_subtrees(
             logging.debug("lca", lca)
 
             while not appropriate_insert_position_found:
-                tree_copy_for_assert_statement = copy.deepcopy(pt)
+                tree_snapshot_for_assert_statement = to_persistent_tree(pt)
                 # non-standard case ==> put subtree to be inserted in parallel next to the remaining tree
-                ACTIVATED_execution_numbers = calculate_execution_numbers(
-                    insert_candidate, replacement_label + "+ACTIVATED"
+                ACTIVATED_execution_numbers = __get_execution_numbers(
+                    insert_candidate, replacement_label + "+ACTIVATED", cache
                 )
-                CLOSED_execution_numbers = calculate_execution_numbers(
-                    insert_candidate, replacement_label + "+CLOSED"
+                CLOSED_execution_numbers = __get_execution_numbers(
+                    insert_candidate, replacement_label + "+CLOSED", cache
                 )
                 intersection = ACTIVATED_execution_numbers.intersection(
                     CLOSED_execution_numbers
@@ -190,14 +193,10 @@ def reinsert_frozen_subtrees(
                 pt = get_root(pt)
 
                 # check if insert_candidate is suited, i.e., all traces fit
-                appropriate_insert_position_found = True
                 # tree_vis.view(tree_vis.apply(pt, parameters={"format": "svg"}))
-                if typed_trace_fits_process_tree(projected_trace, pt):
-                    for trace in projected_log:
-                        if not typed_trace_fits_process_tree(trace, pt):
-                            appropriate_insert_position_found = False
-                else:
-                    appropriate_insert_position_found = False
+                appropriate_insert_position_found = __all_traces_fit_process_tree(
+                    projected_trace, projected_log, pt
+                )
 
                 # undo changes if insert_candidate is not suited
                 if not appropriate_insert_position_found:
@@ -214,7 +213,7 @@ def reinsert_frozen_subtrees(
                     insert_candidate.parent = inserted_parallel.parent
                     del inserted_parallel
                     assert insert_candidate.parent
-                    assert tree_copy_for_assert_statement == pt
+                    assert tree_snapshot_for_assert_statement == to_persistent_tree(pt)
                     insert_candidate = insert_candidate.parent
                     logging.debug("NEXT iteration")
 
@@ -231,16 +230,46 @@ def reinsert_frozen_subtrees(
     return pt
 
 
+def __get_execution_numbers(
+    tree: ProcessTree, label: str, cache: Optional[FreezingCache]
+) -> set:
+    if cache is None:
+        return calculate_execution_numbers(tree, label)
+
+    key = (to_persistent_tree(tree), label)
+    if key not in cache.execution_numbers:
+        cache.execution_numbers[key] = calculate_execution_numbers(tree, label)
+
+    return cache.execution_numbers[key]
+
+
+def __all_traces_fit_process_tree(
+    projected_trace: TypedTrace, projected_log: List[TypedTrace], pt: ProcessTree
+) -> bool:
+    # traces of the same variant are checked only once, checking stops at the first trace that does not fit
+    checked_variants = set()
+    for trace in [projected_trace] + list(projected_log):
+        variant = get_variant(trace.trace, trace.infix_type)
+        if variant in checked_variants:
+            continue
+        checked_variants.add(variant)
+
+        if not typed_trace_fits_process_tree(trace, pt):
+            return False
+
+    return True
+
+
 def post_process_tree(pt: ProcessTree, excluded_subtrees=[]) -> ProcessTree:
     tree_changed = True
     while tree_changed:
-        pt_before_post_process = copy.deepcopy(pt)
+        pt_before_post_process = to_persistent_tree(pt)
         pt = remove_operator_node_with_one_or_no_child(
             pt, excluded_subtrees=excluded_subtrees
         )
         pt = general_tau_reduction(pt, excluded_subtrees=excluded_subtrees)
         apply_reduction_rules(pt, excluded_subtrees=excluded_subtrees)
-        if pt == pt_before_post_process:
+        if to_persistent_tree(pt) == pt_before_post_process:
             tree_changed = False
     return get_root(pt)
 
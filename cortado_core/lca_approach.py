@@ -17,8 +17,8 @@ from cortado_core.process_tree_utils.miscellaneous import (
     get_height,
     get_number_silent_leaves,
     get_number_nodes,
-    is_leaf_node,
     get_index_of_pt_in_children_list,
+    set_preorder_ids_in_tree,
 )
 from cortado_core.process_tree_utils.reduction import (
     apply_reduction_rules,
@@ -27,17 +27,10 @@ from cortado_core.process_tree_utils.reduction import (
 from cortado_core.process_tree_utils.to_petri_net_transition_bordered import (
     apply as pt_to_petri_net,
 )
-from cortado_core.utils.alignment_utils import (
-    is_log_move,
-    alignment_step_represents_no_deviation,
-    is_sync_move,
-    get_first_deviation,
-    calculate_alignment_typed_trace,
-)
+from cortado_core.utils.alignment_utils import calculate_alignment_typed_trace
 from cortado_core.utils.deviation_solvers import (
-    DeviationType,
+    get_deviation,
     get_deviation_solver,
-    Deviation,
 )
 from cortado_core.utils.start_and_end_activities import (
     add_artificial_start_and_end_to_pt,
@@ -63,6 +56,7 @@ def add_trace_to_pt_language(
     add_artificial_start_end=True,
     pool: Optional[multiprocessing.pool.Pool] = None,
     only_first_matching_alignment=True,
+    concurrent_lca_rewrites=False,
 ) -> ProcessTree:
     """
     Checks if a given trace can be replayed on the given process tree. If not, the tree will be altered to accept the
@@ -73,6 +67,8 @@ def add_trace_to_pt_language(
     :param try_pulling_lca_down:
     :param add_artificial_start_end:
     :param pool: Pool to parallelize alignment computations
+    :param concurrent_lca_rewrites: if the LCA is pulled down, continue the repair on the rewritten tree, and align
+    the already added traces in the pool while the sublog of the LCA is prepared (requires pool)
     :return: process tree that accepts the given log and trace
     """
 
@@ -89,6 +85,7 @@ def add_trace_to_pt_language(
         try_pulling_lca_down=try_pulling_lca_down,
         add_artificial_start_end=add_artificial_start_end,
         pool=pool,
+        concurrent_lca_rewrites=concurrent_lca_rewrites,
     )
 
 
@@ -122,6 +119,7 @@ def __add_trace_to_pt_language(
     try_pulling_lca_down=False,
     add_artificial_start_end=True,
     pool: Optional[multiprocessing.pool.Pool] = None,
+    concurrent_lca_rewrites=False,
 ) -> ProcessTree:
     pt, trace, log, art_nodes_added = __add_artificial_start_end_activities(
         pt, trace, log, add_artificial_start_end
@@ -139,7 +137,13 @@ def __add_trace_to_pt_language(
         if alignment["cost"] >= STD_MODEL_LOG_MOVE_COST:
             # deviation found
             pt = __repair_process_tree(
-                pt, log, alignment, try_pulling_lca_down, pool, trace.infix_type
+                pt,
+                log,
+                alignment,
+                try_pulling_lca_down,
+                pool,
+                trace.infix_type,
+                concurrent_lca_rewrites,
             )
         else:
             deviation = False
@@ -159,104 +163,15 @@ def __repair_process_tree(
     try_pulling_lca_down: bool,
     pool: Optional[multiprocessing.pool.Pool],
     infix_type: InfixType,
+    concurrent_lca_rewrites: bool = False,
 ) -> ProcessTree:
     logging.debug("repair_process_tree()")
 
     deviation = get_deviation(alignment)
-    solver = get_deviation_solver(deviation, infix_type, try_pulling_lca_down, pool)
-    return solver.solve(deviation, pt_root, log)
-
-
-def get_deviation(alignment) -> Deviation:
-    step, i = get_first_deviation(alignment)
-    if step is None:
-        logging.debug("found no deviation")
-        return Deviation(
-            DeviationType.NO_DEVIATION, (None, -1), (None, -1), alignment, i
-        )
-
-    logging.debug("deviation at ", i)
-    exec_pt_leave_before_deviation = __get_leaf_before_deviation(alignment, i)
-    exec_pt_leave_after_deviation = __get_leaf_after_deviation(alignment, i)
-
-    if (
-        exec_pt_leave_before_deviation[0] is None
-        and exec_pt_leave_after_deviation[0] is None
-    ):
-        return Deviation(
-            DeviationType.NOT_ENCLOSED, (None, -1), (None, -1), alignment, i
-        )
-
-    if (
-        exec_pt_leave_before_deviation[0] is not None
-        and exec_pt_leave_after_deviation[0] is not None
-    ):
-        return Deviation(
-            DeviationType.ENCLOSED,
-            exec_pt_leave_before_deviation,
-            exec_pt_leave_after_deviation,
-            alignment,
-            i,
-        )
-
-    if exec_pt_leave_before_deviation[0] is not None:
-        return Deviation(
-            DeviationType.LEFT_ENCLOSED,
-            exec_pt_leave_before_deviation,
-            (None, -1),
-            alignment,
-            i,
-        )
-
-    return Deviation(
-        DeviationType.RIGHT_ENCLOSED,
-        (None, -1),
-        exec_pt_leave_after_deviation,
-        alignment,
-        i,
+    solver = get_deviation_solver(
+        deviation, infix_type, try_pulling_lca_down, pool, concurrent_lca_rewrites
     )
-
-
-def __get_leaf_before_deviation(
-    alignment: AlignmentResult, deviation_i: int
-) -> tuple[ProcessTree, int]:
-    exec_pt_leave_before_deviation = None
-    h = deviation_i - 1
-    while h >= 0 and not exec_pt_leave_before_deviation:
-        step_before: Tuple = alignment["alignment"][h]
-        if alignment_step_represents_no_deviation(step_before) and is_leaf_node(
-            step_before[0][1][0]
-        ):
-            exec_pt_leave_before_deviation = step_before[0][1][0]
-        h -= 1
-
-    return exec_pt_leave_before_deviation, h + 1
-
-
-def __get_leaf_after_deviation(
-    alignment: AlignmentResult, deviation_i: int
-) -> tuple[ProcessTree, int]:
-    exec_pt_leave_after_deviation = None
-    j = deviation_i + 1
-    while j < len(alignment["alignment"]) and not exec_pt_leave_after_deviation:
-        step_after: Tuple = alignment["alignment"][j]
-        if alignment_step_represents_no_deviation(step_after) and is_leaf_node(
-            step_after[0][1][0]
-        ):
-            exec_pt_leave_after_deviation = step_after[0][1][0]
-        j += 1
-
-    return exec_pt_leave_after_deviation, j - 1
-
-
-def set_preorder_ids_in_tree(pt: ProcessTree, current_index=0) -> int:
-    pt.id = current_index
-    current_index += 1
-
-    for child in pt.children:
-        current_index = set_preorder_ids_in_tree(child, current_index)
-
-    return current_index
+    return solver.solve(deviation, pt_root, log)
 
 
 def test_im():
@@ -0,0 +1,115 @@
+import random
+import time
+from typing import List, Set, Tuple
+
+from more_itertools import partitions
+from pm4py.objects.petri_net.obj import PetriNet
+
+from cortado_core.model_repair.algorithm import Subtrace, align_subtraces
+
+
+def naive_align_subtraces(subtraces: Set[Subtrace], similiarty_threshold=0.5):
+    # previous implementation of align_subtraces, kept as reference for the benchmark
+    def _are_similar(
+        trace1: Tuple[str], trace2: Tuple[str], similiarty_threshold: float
+    ):
+        intersection: Set[str] = set(trace1).intersection(set(trace2))
+        return (
+            len(intersection) / len(trace1) >= similiarty_threshold
+            and len(intersection) / len(trace2) >= similiarty_threshold
+        )
+
+    n_max = max([*map(lambda t: len(t), subtraces), 0])
+    for n in range(n_max, 0, -1):
+        for subtrace in [sub for sub in subtraces if len(sub) == n]:
+            candidates = []
+            for partition in partitions(subtrace.trace):
+                partition = [tuple(p) for p in partition]
+                if len(partition) == 1:
+                    candidates.append(((), *partition, ()))
+                elif len(partition) == 3:
+                    candidates.append(partition)
+                elif len(partition) == 2:
+                    candidates.append((*partition, ()))
+                    candidates.append(((), *partition))
+
+            for b0, b1, b2 in sorted(
+                candidates, key=lambda part: len(part[1]), reverse=True
+            ):
+                if _are_similar(subtrace.trace, b1, similiarty_threshold):
+                    continue
+                if b1 in list(map(lambda sub: sub.trace, subtraces)):
+                    subtraces.remove(subtrace)
+                    for b in (b0, b1, b2):
+                        if len(b) > 0:
+                            subtraces.add(
+                                Subtrace(
+                                    b, subtrace.location, subtrace.previous_last_place
+                                )
+                            )
+                    break
+
+    res: List[List[Subtrace]] = []
+    for subtrace in subtraces:
+        eq_class_found = False
+        for eq_class in res:
+            eq_match = True
+            for other_subtrace in eq_class:
+                if not _are_similar(
+                    subtrace.trace, other_subtrace.trace, similiarty_threshold
+                ):
+                    eq_match = False
+            if eq_match:
+                eq_class.append(subtrace)
+                eq_class_found = True
+                break
+        if not eq_class_found:
+            res.append([subtrace])
+    return {frozenset(eq_class) for eq_class in res}
+
+
+def generate_subtraces(
+    n_subtraces: int, n_activities: int, max_length: int, n_places: int, seed: int
+) -> List[Subtrace]:
+    rng = random.Random(seed)
+    activities = [f"a{i}" for i in range(n_activities)]
+    places = [PetriNet.Place(f"p{i}") for i in range(n_places)]
+    # short building blocks that are concatenated, s.t. longer subtraces can be split into existing ones
+    blocks = [
+        tuple(rng.choices(activities, k=rng.randint(1, 3))) for _ in range(n_activities)
+    ]
+
+    subtraces = []
+    for _ in range(n_subtraces):
+        trace = ()
+        while len(trace) < rng.randint(1, max_length):
+            trace += rng.choice(blocks)
+        location = frozenset(rng.sample(places, rng.randint(1, 2)))
+        subtraces.append(Subtrace(trace, location))
+
+    return subtraces
+
+
+def benchmark(n_subtraces: int):
+    subtraces = generate_subtraces(
+        n_subtraces, n_activities=40, max_length=8, n_places=20, seed=n_subtraces
+    )
+
+    start = time.perf_counter()
+    expected = naive_align_subtraces(set(subtraces))
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = align_subtraces(set(subtraces))
+    indexed_time = time.perf_counter() - start
+
+    assert result == expected
+    print(
+        f"{n_subtraces} subtraces: naive {naive_time:.2f}s, indexed {indexed_time:.2f}s, "
+        f"{len(result)} groups"
+    )
+
+
+if __name__ == "__main__":
+    for n in [500, 1000, 2000, 4000]:
+        benchmark(n)
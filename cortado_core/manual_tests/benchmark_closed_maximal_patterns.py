@@ -0,0 +1,94 @@
+import sys
+import time
+
+from cortado_core.eventually_follows_pattern_mining.algorithm import (
+    Algorithm,
+    generate_eventually_follows_patterns_from_groups,
+)
+from cortado_core.eventually_follows_pattern_mining.util.is_superpattern import (
+    get_closed_and_maximal_patterns,
+    is_superpattern,
+)
+from cortado_core.eventually_follows_pattern_mining.util.pattern import (
+    get_activities_for_patterns,
+    get_ef_preserving_tree_for_patterns,
+)
+from cortado_core.manual_tests.benchmark_variant_performances import generate_log
+from cortado_core.subprocess_discovery.subtree_mining.obj import (
+    FrequencyCountingStrategy,
+)
+from cortado_core.utils.cvariants import get_concurrency_variants
+
+
+def get_maximal_patterns_pairwise(patterns):
+    """
+    Pairwise maximal pattern filtering with the activity set check only, as before the SuperpatternIndex.
+    """
+    activities_for_pattern = get_activities_for_patterns(patterns)
+    ef_preserving_trees = dict()
+    superpattern_candidates = set(patterns)
+    maximal = set()
+
+    for pattern in patterns:
+        is_maximal = True
+        for candidate in superpattern_candidates:
+            if pattern.id == candidate.id or not activities_for_pattern[
+                pattern.id
+            ].issubset(activities_for_pattern[candidate.id]):
+                continue
+
+            if candidate.id not in ef_preserving_trees:
+                ef_preserving_trees.update(
+                    get_ef_preserving_tree_for_patterns([candidate])
+                )
+            ef_preserving_tree, ef_dict = ef_preserving_trees[candidate.id]
+            if is_superpattern(ef_preserving_tree, pattern, ef_dict):
+                is_maximal = False
+                break
+
+        if is_maximal:
+            maximal.add(pattern)
+        else:
+            superpattern_candidates.remove(pattern)
+
+    return maximal
+
+
+def benchmark(
+    n_traces: int = 40000,
+    traces_per_variant: int = 20,
+    min_support_count: int = 2,
+    compare_pairwise: bool = False,
+):
+    """
+    Mines the patterns of a generated log and computes the closed and maximal patterns. With the default arguments,
+    the mining result contains about 90k patterns. The pairwise filtering is quadratic in the number of patterns,
+    i.e., it should only be compared for smaller outputs.
+    """
+    variants = get_concurrency_variants(generate_log(n_traces, traces_per_variant))
+    start = time.time()
+    patterns = generate_eventually_follows_patterns_from_groups(
+        variants,
+        min_support_count,
+        FrequencyCountingStrategy.VariantTransaction,
+        Algorithm.RightmostExpansion,
+    )
+    flat_patterns = [pattern for level in patterns.values() for pattern in level]
+    print(
+        f"mining: {len(variants)} variants, {len(flat_patterns)} patterns, {time.time() - start:.2f}s"
+    )
+
+    start = time.time()
+    closed, maximal = get_closed_and_maximal_patterns(patterns)
+    print(
+        f"indexed: {len(closed)} closed, {len(maximal)} maximal, {time.time() - start:.2f}s"
+    )
+
+    if compare_pairwise:
+        start = time.time()
+        pairwise_maximal = get_maximal_patterns_pairwise(flat_patterns)
+        print(f"pairwise: {len(pairwise_maximal)} maximal, {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    benchmark(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,83 @@
+import random
+import time
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+from types import SimpleNamespace
+
+from pm4py.objects.log.obj import Event, EventLog, Trace
+from pm4py.objects.log.util.xes import (
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+)
+
+from cortado_core.performance.variant_performance import assign_variants_performances
+from cortado_core.utils.cvariants import get_concurrency_variants
+
+ACTIVITIES = "abcdefghij"
+
+
+def generate_log(n_traces: int, traces_per_variant: int, seed: int = 0) -> EventLog:
+    """
+    Generates a log with roughly n_traces / traces_per_variant variants. Each trace consists of 6 to 10 steps of one or
+    two overlapping activities.
+    """
+    rng = random.Random(seed)
+    structures = []
+    for _ in range(n_traces // traces_per_variant):
+        structures.append(
+            [
+                rng.sample(ACTIVITIES, rng.choice([1, 1, 2]))
+                for _ in range(rng.randint(6, 10))
+            ]
+        )
+
+    traces = []
+    for i in range(n_traces):
+        time = datetime(2020, 1, 1) + timedelta(hours=rng.randint(0, 10000))
+        events = []
+        for step in structures[i % len(structures)]:
+            step_end = time
+            for activity in step:
+                event = Event()
+                event["concept:name"] = activity
+                event[DEFAULT_START_TIMESTAMP_KEY] = time + timedelta(
+                    seconds=rng.randint(0, 60)
+                )
+                event[DEFAULT_TIMESTAMP_KEY] = event[
+                    DEFAULT_START_TIMESTAMP_KEY
+                ] + timedelta(seconds=rng.randint(120, 3600))
+                step_end = max(step_end, event[DEFAULT_TIMESTAMP_KEY])
+                events.append(event)
+            time = step_end + timedelta(seconds=rng.randint(1, 600))
+        traces.append(Trace(events))
+
+    return EventLog(traces)
+
+
+def get_variants(log: EventLog):
+    return {
+        i: (variant, traces, [], SimpleNamespace(is_user_defined=False))
+        for i, (variant, traces) in enumerate(get_concurrency_variants(log).items())
+    }
+
+
+def benchmark(n_traces: int = 30000, traces_per_variant: int = 2, processes: int = 4):
+    log = generate_log(n_traces, traces_per_variant)
+
+    for name, kwargs in [
+        ("sequential", {}),
+        ("indexed", {"indexed": True}),
+        ("parallel", {"processes": processes}),
+    ]:
+        variants = get_variants(log)
+        start = time.time()
+        if "processes" in kwargs:
+            with Pool(kwargs["processes"]) as pool:
+                assign_variants_performances(variants, pool=pool)
+        else:
+            assign_variants_performances(variants, **kwargs)
+        print(f"{name}: {len(variants)} variants, {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -52,13 +52,15 @@ from cortado_core.utils.petri_net_utils import (
     get_transitions_by_label,
 )
 
-from more_itertools import partitions
 
 from pm4py.vis import view_petri_net, view_alignments
 import pm4py.visualization.process_tree.visualizer as tree_vis
 
 SHOW_VISUALIZATIONS = False
 
+Variant = Tuple[str, ...]
+VariantAlignments = Dict[Variant, AlignmentResult]
+
 
 @dataclass
 class Subtrace:
@@ -157,30 +159,82 @@ def add_parallel_silent_transitions(
             petri_utils.add_arc_from_to(tau, place, petri_net)
 
 
-def repair_for_loops(
+def get_variant(trace: Trace) -> Variant:
+    return tuple(event["concept:name"] for event in trace)
+
+
+def group_log_by_variant(log: EventLog) -> Tuple[EventLog, List[int]]:
+    """
+    Keeps one trace per variant. Alignments only depend on the sequence of activities, so every alignment pass of the
+    repair calculates one alignment per variant and weights it by the number of traces of the variant where
+    frequencies matter.
+    :param log: event log
+    :return: log containing one trace per variant and the number of traces per variant (same order)
+    """
+    variants: Dict[Variant, int] = {}
+    variant_log = EventLog()
+    multiplicities = []
+
+    for trace in log:
+        variant = get_variant(trace)
+        if variant in variants:
+            multiplicities[variants[variant]] += 1
+        else:
+            variants[variant] = len(variant_log)
+            variant_log.append(trace)
+            multiplicities.append(1)
+
+    return variant_log, multiplicities
+
+
+def align_variants(
     petri_net: PetriNet,
     initial_marking: Marking,
     final_marking: Marking,
-    log: EventLog,
+    variant_log: EventLog,
     pool: Optional[Pool] = None,
-):
+) -> List[AlignmentResult]:
+    if len(variant_log) == 0:
+        return []
+
     if pool:
-        alignments = calculate_alignments_parallel(
-            log,
+        return calculate_alignments_parallel(
+            variant_log,
             petri_net,
             initial_marking,
             final_marking,
             parameters={"ret_tuple_as_trans_desc": True},
             pool=pool,
         )
-    else:
-        alignments = calculate_alignment(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-        )
+
+    return calculate_alignment(
+        variant_log,
+        petri_net,
+        initial_marking,
+        final_marking,
+        parameters={"ret_tuple_as_trans_desc": True},
+    )
+
+
+def repair_for_loops(
+    petri_net: PetriNet,
+    initial_marking: Marking,
+    final_marking: Marking,
+    log: EventLog,
+    pool: Optional[Pool] = None,
+) -> VariantAlignments:
+    """
+    Adds loops to the petri net for repeated subtraces of log moves.
+    :return: alignments of all variants on the petri net before the loops were added
+    """
+    variant_log, _ = group_log_by_variant(log)
+    alignments = align_variants(
+        petri_net, initial_marking, final_marking, variant_log, pool=pool
+    )
+    variant_alignments = {
+        get_variant(trace): alignment
+        for trace, alignment in zip(variant_log, alignments)
+    }
 
     subtraces: Set[Subtrace] = set()
 
@@ -198,6 +252,8 @@ def repair_for_loops(
 
     add_loops(petri_net, sublogs, pool=pool)
 
+    return variant_alignments
+
 
 def repair_for_subprocess_and_skipped_events(
     petri_net: PetriNet,
@@ -205,28 +261,31 @@ def repair_for_subprocess_and_skipped_events(
     final_marking: Marking,
     log: EventLog,
     pool: Optional[Pool] = None,
+    previous_alignments: Optional[VariantAlignments] = None,
 ):
     global_cost_function = get_global_cost_function(
-        petri_net, initial_marking, final_marking, log, pool=pool
+        petri_net,
+        initial_marking,
+        final_marking,
+        log,
+        pool=pool,
+        previous_alignments=previous_alignments,
     )
+    model_cost_function = {t: global_cost_function(t) for t in petri_net.transitions}
 
+    variant_log, _ = group_log_by_variant(log)
     alignments = []
-    for trace in log:
+    for trace in variant_log:
+        parameters = {
+            "ret_tuple_as_trans_desc": True,
+            PARAM_TRACE_COST_FUNCTION: [global_cost_function(act) for act in trace],
+            PARAM_MODEL_COST_FUNCTION: model_cost_function,
+        }
         if pool:
             alignment = pool.apply_async(
                 calculate_alignment_a_star,
                 args=[trace, petri_net, initial_marking, final_marking],
-                kwds={
-                    "parameters": {
-                        "ret_tuple_as_trans_desc": True,
-                        PARAM_TRACE_COST_FUNCTION: [
-                            global_cost_function(act) for act in trace
-                        ],
-                        PARAM_MODEL_COST_FUNCTION: {
-                            t: global_cost_function(t) for t in petri_net.transitions
-                        },
-                    }
-                },
+                kwds={"parameters": parameters},
             )
         else:
             alignment = calculate_alignment(
@@ -234,15 +293,7 @@ def repair_for_subprocess_and_skipped_events(
                 petri_net,
                 initial_marking,
                 final_marking,
-                parameters={
-                    "ret_tuple_as_trans_desc": True,
-                    PARAM_TRACE_COST_FUNCTION: [
-                        global_cost_function(act) for act in trace
-                    ],
-                    PARAM_MODEL_COST_FUNCTION: {
-                        t: global_cost_function(t) for t in petri_net.transitions
-                    },
-                },
+                parameters=parameters,
                 variant=variants_calculate_alignments.state_equation_a_star,
             )
 
@@ -279,34 +330,21 @@ def remove_infrequent_nodes(
 ):
     if threshold < 0:
         raise ValueError("threshold has to be greater or equal to 0.")
-    if pool:
-        alignments = calculate_alignments_parallel(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-            pool=pool,
-        )
-    else:
-        alignments = calculate_alignment(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-        )
+    variant_log, multiplicities = group_log_by_variant(log)
+    alignments = align_variants(
+        petri_net, initial_marking, final_marking, variant_log, pool=pool
+    )
 
     place_counter = Counter(initial_marking)
     transition_counter = Counter()
-    for alignment in alignments:
+    for alignment, multiplicity in zip(alignments, multiplicities):
         assert not alignment_contains_deviation(alignment)
         for move in alignment["alignment"]:
             transition = petri_utils.get_transition_by_name(petri_net, move[0][1])
             assert transition is not None
-            transition_counter[transition] += 1
+            transition_counter[transition] += multiplicity
             for place in petri_utils.post_set(transition):
-                place_counter[place] += 1
+                place_counter[place] += multiplicity
     for infrequent_place in [
         place for place in petri_net.places if place_counter[place] <= threshold
     ]:
@@ -327,32 +365,46 @@ def get_global_cost_function(
     final_marking: Marking,
     log: EventLog,
     pool: Optional[Pool] = None,
+    previous_alignments: Optional[VariantAlignments] = None,
 ):
-    if pool:
-        alignments = calculate_alignments_parallel(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-            pool=pool,
-        )
-    else:
-        alignments = calculate_alignment(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-        )
+    """
+    Calculates the cost function based on the frequencies of log and model moves.
+    :param previous_alignments: alignments of the variants on a previous version of the petri net. The repairs only add
+    behavior to the net, so variants that fitted the previous version still fit and their previous alignments are
+    reused. Fitting alignments can contain model moves on silent transitions, therefore, their moves are still counted.
+    Only the deviating variants are aligned again.
+    """
+    variant_log, multiplicities = group_log_by_variant(log)
+    alignments = []
+    if previous_alignments is not None:
+        fitting_multiplicities = []
+        deviating_log = EventLog()
+        deviating_multiplicities = []
+        for trace, multiplicity in zip(variant_log, multiplicities):
+            previous_alignment = previous_alignments.get(get_variant(trace))
+            if previous_alignment is not None and not alignment_contains_deviation(
+                previous_alignment
+            ):
+                alignments.append(previous_alignment)
+                fitting_multiplicities.append(multiplicity)
+            else:
+                deviating_log.append(trace)
+                deviating_multiplicities.append(multiplicity)
+
+        variant_log = deviating_log
+        multiplicities = fitting_multiplicities + deviating_multiplicities
+
+    alignments += align_variants(
+        petri_net, initial_marking, final_marking, variant_log, pool=pool
+    )
     log_move_counter = Counter()
     model_move_counter = Counter()
-    for alignment in alignments:
+    for alignment, multiplicity in zip(alignments, multiplicities):
         for move in alignment["alignment"]:
             if is_log_move(move):
-                log_move_counter[move[1][0]] += 1
+                log_move_counter[move[1][0]] += multiplicity
             elif is_model_move(move):
-                model_move_counter[move[0][1]] += 1
+                model_move_counter[move[0][1]] += multiplicity
     if len(log_move_counter) > 0 and len(model_move_counter) > 0:
         devMax = max(*log_move_counter.values(), *model_move_counter.values())
     elif len(model_move_counter) > 0:
@@ -383,6 +435,7 @@ def repair_petri_net_with_log(
     """
     Splits the log into fitting and non-fitting traces.
     Then the process model is repaired s.t. the log will then fit all traces.
+    All alignment passes are calculated once per variant.
     :param petri_net: petri_net to repaired
     :param initial_marking: initial marking of the petri net
     :param final_marking: final marking of the petri net
@@ -390,31 +443,24 @@ def repair_petri_net_with_log(
     :param pool: Pool to parallelize alignment computations
     :return: process model that accepts the given log
     """
-
-    repair_for_loops(petri_net, initial_marking, final_marking, log, pool=pool)
-    repair_for_subprocess_and_skipped_events(
+    alignments = repair_for_loops(
         petri_net, initial_marking, final_marking, log, pool=pool
     )
+    repair_for_subprocess_and_skipped_events(
+        petri_net,
+        initial_marking,
+        final_marking,
+        log,
+        pool=pool,
+        previous_alignments=alignments,
+    )
     remove_infrequent_nodes(petri_net, initial_marking, final_marking, log, pool=pool)
 
     if __debug__:
-        if pool:
-            final_alignments = calculate_alignments_parallel(
-                log,
-                petri_net,
-                initial_marking,
-                final_marking,
-                parameters={"ret_tuple_as_trans_desc": True},
-                pool=pool,
-            )
-        else:
-            final_alignments = calculate_alignment(
-                log,
-                petri_net,
-                initial_marking,
-                final_marking,
-                parameters={"ret_tuple_as_trans_desc": True},
-            )
+        variant_log, _ = group_log_by_variant(log)
+        final_alignments = align_variants(
+            petri_net, initial_marking, final_marking, variant_log, pool=pool
+        )
 
         for alignment in final_alignments:
             assert not alignment_contains_deviation(alignment)
@@ -631,6 +677,25 @@ def get_skipped_transitions(alignment: AlignmentResult, petri_net: PetriNet):
     return skipped_trans
 
 
+def get_split_candidates(
+    trace: Tuple[str, ...],
+) -> List[Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Returns all splits of trace into (b0, b1, b2) with trace = b0 + b1 + b2, sorted by the length of b1 (descending).
+    Splits with the same length of b1 keep the order in which more_itertools.partitions enumerates the corresponding
+    partitions, i.e., the trace itself, then all splits into two parts, then all splits into three parts.
+    """
+    n = len(trace)
+    candidates = [((), trace, ())]
+    for i in range(1, n):
+        candidates.append((trace[:i], trace[i:], ()))
+        candidates.append(((), trace[:i], trace[i:]))
+    for i, j in combinations(range(1, n), 2):
+        candidates.append((trace[:i], trace[i:j], trace[j:]))
+
+    return sorted(candidates, key=lambda part: len(part[1]), reverse=True)
+
+
 def align_subtraces(
     subtraces: Set[Subtrace],
     similiarty_threshold=0.5,
@@ -639,75 +704,83 @@ def align_subtraces(
     Implementation of algorithm 5.
     Group subtraces into sets based on their shared activities ignoring ordering.
     """
+    activity_sets: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+
+    def _get_activities(trace: Tuple[str, ...]) -> FrozenSet[str]:
+        if trace not in activity_sets:
+            activity_sets[trace] = frozenset(trace)
+        return activity_sets[trace]
 
     def _are_similar(
         trace1: Tuple[str], trace2: Tuple[str], similiarty_threshold: float
     ):
-        intersection: Set[str] = set(trace1).intersection(set(trace2))
+        intersection = len(_get_activities(trace1) & _get_activities(trace2))
         return (
-            len(intersection) / len(trace1) >= similiarty_threshold
-            and len(intersection) / len(trace2) >= similiarty_threshold
+            intersection / len(trace1) >= similiarty_threshold
+            and intersection / len(trace2) >= similiarty_threshold
         )
 
+    # number of subtraces per sequence of activities, subtraces with the same sequence differ in their location
+    sequences = Counter(sub.trace for sub in subtraces)
+
+    def _add(subtrace: Subtrace):
+        if subtrace not in subtraces:
+            subtraces.add(subtrace)
+            sequences[subtrace.trace] += 1
+
     n_max = max([*map(lambda t: len(t), subtraces), 0])
     for n in range(n_max, 0, -1):
         for subtrace in [sub for sub in subtraces if len(sub) == n]:
-            candidates = []
-            for partition in partitions(subtrace.trace):
-                partition = [tuple(p) for p in partition]
-                if len(partition) == 1:
-                    candidates.append(((), *partition, ()))
-                elif len(partition) == 3:
-                    candidates.append(partition)
-                elif len(partition) == 2:
-                    candidates.append((*partition, ()))
-                    candidates.append(((), *partition))
-
             # sort for getting maximal length b1 with original subtrace and b1 being dissimilar
-            for b0, b1, b2 in sorted(
-                candidates, key=lambda part: len(part[1]), reverse=True
-            ):
+            for b0, b1, b2 in get_split_candidates(subtrace.trace):
                 if _are_similar(subtrace.trace, b1, similiarty_threshold):
                     continue
-                if b1 in list(map(lambda sub: sub.trace, subtraces)):
+                if sequences[b1] > 0:
                     subtraces.remove(subtrace)
-                    if len(b0) > 0:
-                        subtraces.add(
-                            Subtrace(
-                                b0, subtrace.location, subtrace.previous_last_place
+                    sequences[subtrace.trace] -= 1
+                    for b in (b0, b1, b2):
+                        if len(b) > 0:
+                            _add(
+                                Subtrace(
+                                    b, subtrace.location, subtrace.previous_last_place
+                                )
                             )
-                        )
-                    if len(b1) > 0:
-                        subtraces.add(
-                            Subtrace(
-                                b1, subtrace.location, subtrace.previous_last_place
-                            )
-                        )
-                    if len(b2) > 0:
-                        subtraces.add(
-                            Subtrace(
-                                b2, subtrace.location, subtrace.previous_last_place
-                            )
-                        )
                     break
 
-    # group subtraces into equivalence classes w.r.t. similarity
+    # group subtraces into equivalence classes w.r.t. similarity. A subtrace can only be similar to subtraces that
+    # share an activity with it (if the threshold is positive), so only the classes that contain such a subtrace are
+    # candidates. The first candidate class (in order of creation) whose members are all similar is chosen.
     res: List[List[Subtrace]] = []
+    classes_per_activity: Dict[str, Set[int]] = {}
     for subtrace in subtraces:
-        eq_class_found = False
-        for eq_class in res:
-            eq_match = True
-            for other_subtrace in eq_class:
-                if not _are_similar(
-                    subtrace.trace, other_subtrace.trace, similiarty_threshold
-                ):
-                    eq_match = False
-            if eq_match:
-                eq_class.append(subtrace)
-                eq_class_found = True
+        if similiarty_threshold > 0:
+            candidates = sorted(
+                set().union(
+                    *(
+                        classes_per_activity.get(activity, ())
+                        for activity in _get_activities(subtrace.trace)
+                    )
+                )
+            )
+        else:
+            candidates = range(len(res))
+
+        eq_class_index = None
+        for i in candidates:
+            if all(
+                _are_similar(subtrace.trace, other_subtrace.trace, similiarty_threshold)
+                for other_subtrace in res[i]
+            ):
+                eq_class_index = i
                 break
-        if not eq_class_found:
-            res.append([subtrace])
+
+        if eq_class_index is None:
+            eq_class_index = len(res)
+            res.append([])
+        res[eq_class_index].append(subtrace)
+        for activity in _get_activities(subtrace.trace):
+            classes_per_activity.setdefault(activity, set()).add(eq_class_index)
+
     return {frozenset(eq_class) for eq_class in res}
 
 
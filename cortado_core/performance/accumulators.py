@@ -0,0 +1,157 @@
+import math
+from typing import Dict, Iterable, Optional
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy (logarithmic buckets, see DDSketch). The value at a rank is
+    estimated with a relative error of at most relative_accuracy, quantiles interpolate between ranks. Memory depends on
+    the range of the values, not on their number, and two sketches with the same accuracy are merged by adding the
+    bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy has to be in (0, 1).")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def _bucket(self, value: float) -> int:
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def _value(self, bucket: int) -> float:
+        return 2 * self.gamma**bucket / (self.gamma + 1)
+
+    def add(self, value: float):
+        if value > 0:
+            bucket = self._bucket(value)
+            self.positive[bucket] = self.positive.get(bucket, 0) + 1
+        elif value < 0:
+            bucket = self._bucket(-value)
+            self.negative[bucket] = self.negative.get(bucket, 0) + 1
+        else:
+            self.zeros += 1
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch"):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("only sketches with the same accuracy can be merged.")
+        for bucket, count in other.positive.items():
+            self.positive[bucket] = self.positive.get(bucket, 0) + count
+        for bucket, count in other.negative.items():
+            self.negative[bucket] = self.negative.get(bucket, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates the q-quantile with linear interpolation between the closest ranks like np.percentile, i.e. between
+        the estimated values at the ranks floor(q * (count - 1)) and ceil(q * (count - 1)).
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q has to be in [0, 1].")
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        lower = self._value_at_rank(math.floor(rank))
+        upper = self._value_at_rank(math.ceil(rank))
+        return lower + (upper - lower) * (rank - math.floor(rank))
+
+    def _value_at_rank(self, rank: int) -> float:
+        seen = 0
+        for bucket in sorted(self.negative, reverse=True):
+            seen += self.negative[bucket]
+            if seen > rank:
+                return -self._value(bucket)
+        seen += self.zeros
+        if seen > rank:
+            return 0
+        for bucket in sorted(self.positive):
+            seen += self.positive[bucket]
+            if seen > rank:
+                return self._value(bucket)
+
+
+class StatsAccumulator:
+    """
+    Accumulates the statistics of aggregators.stats for values that arrive one after another, with memory independent
+    of the number of values. Accumulators of partitions of the values (e.g. computed in different processes) are
+    combined with merge. Mean and standard deviation are exact (Welford/Chan), median and percentiles are estimated by
+    a QuantileSketch.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        # number of values including None, like "n" of aggregators.stats
+        self.n = 0
+        self.n_not_none = 0
+        self.sum = 0
+        self.mean = 0
+        # sum of squared differences from the mean
+        self.m2 = 0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value: Optional[float]):
+        self.n += 1
+        if value is None:
+            return
+
+        self.n_not_none += 1
+        self.sum += value
+        delta = value - self.mean
+        self.mean += delta / self.n_not_none
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+
+    def add_all(self, values: Iterable[Optional[float]]):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "StatsAccumulator"):
+        if other.n_not_none > 0:
+            n = self.n_not_none + other.n_not_none
+            delta = other.mean - self.mean
+            self.mean += delta * other.n_not_none / n
+            self.m2 += other.m2 + delta**2 * self.n_not_none * other.n_not_none / n
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+            self.sum += other.sum
+            self.n_not_none = n
+        self.n += other.n
+        self.sketch.merge(other.sketch)
+
+    def to_stats(self) -> Optional[dict]:
+        """
+        Returns the statistics in the format of aggregators.stats, None if no value (except None) was added.
+        """
+        if self.n_not_none == 0:
+            return None
+
+        median = self.sketch.quantile(0.5)
+        stats = {
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "median": median,
+            "n": self.n,
+            "n_not_none": self.n_not_none,
+            "50th": median,
+            "95th": self.sketch.quantile(0.95),
+        }
+        if self.n_not_none > 1:
+            stats["stdev"] = math.sqrt(max(self.m2, 0) / (self.n_not_none - 1))
+            if stats["mean"] != 0:
+                stats["percentage_variance"] = (stats["stdev"] / stats["mean"]) * 100
+        else:
+            stats["stdev"] = 0
+            stats["percentage_variance"] = 0
+        return stats
@@ -1,4 +1,6 @@
+import math
 import statistics
+from typing import List, Optional, Sequence
 
 import numpy as np
 
@@ -46,6 +48,120 @@ def stats(values):
         return None
 
 
+def stats_with_confidence_intervals(values, confidence: float = 0.95):
+    """
+    Same as stats, but additionally reports confidence intervals for the mean (normal approximation) and the median
+    (distribution-free, between order statistics) if the values are a random sample of a larger population.
+    """
+    result = stats(values)
+    if result is None:
+        return None
+
+    values = sorted(v for v in values if v is not None)
+    n = len(values)
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    mean_error = z * result["stdev"] / math.sqrt(n)
+    # the number of values below the median is Binomial(n, 0.5), ranks are 1-based
+    lower_rank = max(1, math.floor(n / 2 - z * math.sqrt(n) / 2))
+    upper_rank = min(n, math.ceil(1 + n / 2 + z * math.sqrt(n) / 2))
+
+    result["confidence"] = confidence
+    result["mean_ci"] = (result["mean"] - mean_error, result["mean"] + mean_error)
+    result["median_ci"] = (values[lower_rank - 1], values[upper_rank - 1])
+    return result
+
+
+def stats_vectorized(values):
+    """
+    Same statistics as stats, computed with NumPy on a float64 array (NaN for None) instead of separate passes of the
+    statistics module over python lists. Results are python floats (stats keeps the type of the values, e.g., int or
+    Decimal) and may differ from stats by floating point rounding.
+    """
+    return stats_batch([values])[0]
+
+
+def stats_batch(value_groups: Sequence[Optional[Sequence]]) -> List[Optional[dict]]:
+    """
+    Computes stats for many groups of values (e.g. the values of all tree nodes) at once. The values of all groups are
+    concatenated into one array that is sorted once by (group, value), i.e., memory is linear in the total number of
+    values regardless of how the group sizes differ. Min, max, median and percentiles are read at the group offsets of
+    the sorted array, mean and standard deviation are computed with per-group sums (np.bincount).
+    In contrast to stats, all statistics except the counts are python floats.
+    :param value_groups: lists of values that may contain None, a group may be None
+    :return: result of stats per group
+    """
+    n_groups = len(value_groups)
+    lengths = [len(g) if g is not None else 0 for g in value_groups]
+    values = np.fromiter(
+        (np.nan if v is None else v for g in value_groups if g for v in g),
+        dtype=np.float64,
+        count=sum(lengths),
+    )
+    group_ids = np.repeat(np.arange(n_groups), lengths)
+    not_none = ~np.isnan(values)
+    values = values[not_none]
+    group_ids = group_ids[not_none]
+
+    counts = np.bincount(group_ids, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    last = np.maximum(counts - 1, 0)
+    sorted_values = values[np.lexsort((values, group_ids))]
+    if len(sorted_values) == 0:
+        return [None] * n_groups
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.bincount(group_ids, weights=values, minlength=n_groups) / counts
+        squared_deviations = np.bincount(
+            group_ids, weights=(values - means[group_ids]) ** 2, minlength=n_groups
+        )
+        stdevs = np.sqrt(squared_deviations / (counts - 1))
+
+    def _value_at(ranks: np.ndarray) -> np.ndarray:
+        # groups without values may point behind the array, their results are never read
+        return sorted_values[np.minimum(starts + ranks, len(sorted_values) - 1)]
+
+    def _percentiles(q: float) -> np.ndarray:
+        # linear interpolation between the closest ranks, like np.percentile
+        position = q * last
+        lower = np.floor(position).astype(int)
+        upper = np.ceil(position).astype(int)
+        lower_values = _value_at(lower)
+        return lower_values + (_value_at(upper) - lower_values) * (position - lower)
+
+    minimums = _value_at(np.zeros(n_groups, dtype=int))
+    maximums = _value_at(last)
+    medians = _percentiles(0.5)
+    percentiles_95 = _percentiles(0.95)
+
+    results = []
+    for i, group in enumerate(value_groups):
+        if group is None or counts[i] == 0:
+            results.append(None)
+            continue
+
+        result = {
+            "min": float(minimums[i]),
+            "max": float(maximums[i]),
+            "mean": float(means[i]),
+            "median": float(medians[i]),
+            "n": len(group),
+            "n_not_none": int(counts[i]),
+            "50th": float(medians[i]),
+            "95th": float(percentiles_95[i]),
+        }
+        if counts[i] > 1:
+            result["stdev"] = float(stdevs[i])
+            if result["mean"] != 0:
+                result["percentage_variance"] = (result["stdev"] / result["mean"]) * 100
+        else:
+            result["stdev"] = 0
+            result["percentage_variance"] = 0
+        results.append(result)
+
+    return results
+
+
 def stat_stats(stats_list):
     if stats_list is None:
         return None
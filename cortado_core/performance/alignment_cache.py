@@ -0,0 +1,142 @@
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from pm4py.objects.process_tree.obj import ProcessTree
+
+from cortado_core.process_tree_utils.persistent_tree import get_path_from_root
+
+NodePath = Tuple[int, ...]
+EncodedAlignment = List[tuple]
+CacheKey = Tuple[str, str, str, object]
+
+
+class LifecycleAlignmentCache:
+    """
+    Keeps the alignments of lifecycle variants on the low-level (start/complete) net of a process tree between calls of
+    get_tree_performance_intervals, e.g., when only the selected tree nodes or the aggregation change.
+    Entries are keyed by (tree fingerprint, alignment variant, alignment parameters digest, lifecycle variant), the
+    digest covers the alignment time limit as well (see get_alignment_params_digest). The alignments refer to tree nodes
+    by their path from the root instead of the node objects, s.t. they can be restored for any tree with the same
+    structure, e.g., a tree that was parsed again or the copy of a tree in a worker process.
+    Only the alignments of the max_trees most recently used tree fingerprints are kept, i.e., the alignments of a tree
+    are dropped some edits later.
+    """
+
+    def __init__(self, max_trees: int = 1):
+        self.max_trees = max_trees
+        # tree fingerprint -> (alignment variant, parameters digest, lifecycle variant) -> alignments, fitness
+        self.alignments: OrderedDict[
+            str, Dict[tuple, Tuple[List[EncodedAlignment], float]]
+        ] = OrderedDict()
+
+    def get(self, key: CacheKey) -> Optional[Tuple[List[EncodedAlignment], float]]:
+        tree_alignments = self.alignments.get(key[0], None)
+        if tree_alignments is None:
+            return None
+
+        self.alignments.move_to_end(key[0])
+        return tree_alignments.get(key[1:], None)
+
+    def set(self, key: CacheKey, alignments: List[EncodedAlignment], fitness: float):
+        if key[0] not in self.alignments:
+            self.alignments[key[0]] = {}
+        self.alignments.move_to_end(key[0])
+        self.alignments[key[0]][key[1:]] = (alignments, fitness)
+
+        while len(self.alignments) > self.max_trees:
+            self.alignments.popitem(last=False)
+
+    def __len__(self):
+        return sum(len(tree_alignments) for tree_alignments in self.alignments.values())
+
+
+def get_tree_fingerprint(pt: ProcessTree) -> str:
+    """
+    Returns a digest of the structure of pt, i.e., of the operators and labels. Unlike the tree, the digest is hashed
+    and compared in constant time when used in cache keys.
+    """
+    return hashlib.sha1(repr(__to_structure_repr(pt)).encode("utf-8")).hexdigest()
+
+
+def __to_structure_repr(pt: ProcessTree) -> tuple:
+    return (
+        str(pt.operator),
+        pt.label,
+        tuple(__to_structure_repr(c) for c in pt.children),
+    )
+
+
+def get_cache_key_prefix(
+    pt: ProcessTree, alignment_variant: str, alignment_params: dict
+) -> Tuple[str, str, str]:
+    """
+    Returns the part of the cache key that is shared by all lifecycle variants, append the lifecycle variant to get the
+    key of an entry. Compute it once per tree and call, the fingerprint walks the whole tree.
+    :param alignment_params: parameters including the alignment time limit
+    """
+    return (
+        get_tree_fingerprint(pt),
+        alignment_variant,
+        get_alignment_params_digest(alignment_params),
+    )
+
+
+def get_alignment_params_digest(alignment_params: dict) -> str:
+    """
+    Returns a digest of the alignment parameters that does not depend on the insertion order of (nested) dicts, e.g.,
+    of cost functions.
+    """
+    return hashlib.sha1(
+        repr(__to_stable_repr(alignment_params)).encode("utf-8")
+    ).hexdigest()
+
+
+def __to_stable_repr(value):
+    if isinstance(value, dict):
+        return tuple(sorted((repr(k), __to_stable_repr(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(__to_stable_repr(v) for v in value)
+
+    return repr(value)
+
+
+def get_nodes_by_path(
+    pt: ProcessTree, path: NodePath = ()
+) -> Dict[NodePath, ProcessTree]:
+    nodes = {path: pt}
+    for i, child in enumerate(pt.children):
+        nodes.update(get_nodes_by_path(child, path + (i,)))
+
+    return nodes
+
+
+def encode_alignment(alignment) -> EncodedAlignment:
+    """
+    Replaces the tree nodes in the transition names ((tree node, lifecycle), see to_petri_net_transition_bordered) of
+    a sync product aware alignment by their paths from the root.
+    """
+    paths = {}
+    encoded = []
+    for (log_name, model_name), labels in alignment:
+        if model_name != ">>":
+            node, lifecycle = model_name
+            if id(node) not in paths:
+                paths[id(node)] = get_path_from_root(node)
+            model_name = (paths[id(node)], lifecycle)
+        encoded.append(((log_name, model_name), labels))
+
+    return encoded
+
+
+def decode_alignment(
+    alignment: EncodedAlignment, nodes_by_path: Dict[NodePath, ProcessTree]
+):
+    decoded = []
+    for (log_name, model_name), labels in alignment:
+        if model_name != ">>":
+            path, lifecycle = model_name
+            model_name = (nodes_by_path[path], lifecycle)
+        decoded.append(((log_name, model_name), labels))
+
+    return decoded
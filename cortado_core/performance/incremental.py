@@ -0,0 +1,285 @@
+from typing import Dict, List, Optional, Tuple
+
+from pm4py.algo.conformance.alignments.petri_net import algorithm as net_alignment
+from pm4py.algo.filtering.log.variants import variants_filter
+from pm4py.objects.log.obj import EventLog, Trace
+from pm4py.objects.log.util.interval_lifecycle import to_interval
+
+from cortado_core.performance.accumulators import StatsAccumulator
+from cortado_core.performance.aggregators import avg
+from cortado_core.performance.alignment_cache import (
+    LifecycleAlignmentCache,
+    NodePath,
+    get_cache_key_prefix,
+    get_nodes_by_path,
+)
+from cortado_core.performance.subvariant_performance import (
+    SubvariantWithPerformance,
+    WaitingTimeEvent,
+    get_timestamp_matrices,
+    get_waiting_time_events,
+)
+from cortado_core.performance.tree_performance import (
+    compute_performances_streaming,
+    get_all_alignments,
+    get_lifecycle_alignment_params,
+    to_low_level_log,
+)
+from cortado_core.performance.variant_performance import (
+    build_variant_event_index,
+    durations_to_seconds,
+    get_group_durations_indexed,
+    get_groups_preorder,
+    unique_activity_names,
+    unique_names,
+)
+from cortado_core.process_tree_utils.persistent_tree import get_path_from_root
+from cortado_core.utils.split_graph import Group
+from cortado_core.utils.timestamp_utils import TimeUnit
+
+
+class VariantPerformanceAccumulator:
+    """
+    Incremental version of assign_variants_performances for a single variant. New traces of the variant are added with
+    add_traces, which only processes these traces, and accumulators of partitions of the traces of the variant are
+    combined with merge. The accumulators are kept per group (in preorder) and performance key, s.t. accumulators
+    created for different copies of the variant, e.g. in worker processes, can be merged.
+    """
+
+    def __init__(self, variant: Group, relative_accuracy: float = 0.01):
+        self.variant = variant
+        self.relative_accuracy = relative_accuracy
+        self.accumulators: Dict[Tuple[int, str], StatsAccumulator] = {}
+
+    def add_traces(self, traces: List[Trace]):
+        log = to_interval(EventLog(traces))
+        v_unique = unique_names(self.variant)
+        unique_activity_names(log)
+        event_index = build_variant_event_index(v_unique, log)
+
+        group_positions = {
+            id(g): i for i, g in enumerate(get_groups_preorder(self.variant))
+        }
+        for group, key, durations in get_group_durations_indexed(
+            self.variant, v_unique, event_index
+        ):
+            self.__get_accumulator((group_positions[id(group)], key)).add_all(
+                durations_to_seconds(durations)
+            )
+
+    def merge(self, other: "VariantPerformanceAccumulator"):
+        for key, accumulator in other.accumulators.items():
+            self.__get_accumulator(key).merge(accumulator)
+
+    def assign(self):
+        """
+        Writes the statistics into the performance dicts of the groups of the variant.
+        """
+        groups = get_groups_preorder(self.variant)
+        for (position, key), accumulator in self.accumulators.items():
+            groups[position].performance[key] = accumulator.to_stats()
+
+    def __get_accumulator(self, key: Tuple[int, str]) -> StatsAccumulator:
+        if key not in self.accumulators:
+            self.accumulators[key] = StatsAccumulator(self.relative_accuracy)
+        return self.accumulators[key]
+
+
+class SubvariantPerformanceAccumulator:
+    """
+    Incremental version of calculate_subvariant_performance. In contrast to calculate_subvariant_performance, the
+    global performance is the distribution of the duration of each trace, because a duration that depends on the
+    traces added before cannot be merged across partitions.
+    """
+
+    def __init__(
+        self,
+        subvariant,
+        time_granularity: TimeUnit,
+        relative_accuracy: float = 0.01,
+    ):
+        self.subvariant = subvariant
+        self.time_granularity = time_granularity
+        self.waiting_time_events = get_waiting_time_events(subvariant)
+        self.global_accumulator = StatsAccumulator(relative_accuracy)
+        self.service_time_accumulators: Dict[Tuple[str, int], StatsAccumulator] = {
+            (node.activity, node.activity_instance): StatsAccumulator(relative_accuracy)
+            for nodes in subvariant
+            for node in nodes
+            if node.lifecycle != "start"
+        }
+        self.waiting_time_accumulators = [
+            StatsAccumulator(relative_accuracy) for _ in self.waiting_time_events
+        ]
+
+    def add_traces(self, traces: List[Trace]):
+        matrices = get_timestamp_matrices(
+            to_interval(EventLog(traces)), self.time_granularity
+        )
+
+        self.global_accumulator.add_all(
+            durations_to_seconds(
+                matrices.get_trace_completes() - matrices.get_trace_starts()
+            )
+        )
+        for nodes in self.subvariant:
+            for node in nodes:
+                if node.lifecycle == "start":
+                    continue
+                self.service_time_accumulators[
+                    (node.activity, node.activity_instance)
+                ].add_all(durations_to_seconds(matrices.get_service_times(node)))
+
+        for waiting_time_event, accumulator in zip(
+            self.waiting_time_events, self.waiting_time_accumulators
+        ):
+            accumulator.add_all(
+                durations_to_seconds(
+                    matrices.get_column(waiting_time_event.complete)
+                    - matrices.get_column(waiting_time_event.start)
+                )
+            )
+
+    def merge(self, other: "SubvariantPerformanceAccumulator"):
+        self.global_accumulator.merge(other.global_accumulator)
+        for key, accumulator in other.service_time_accumulators.items():
+            self.service_time_accumulators[key].merge(accumulator)
+        for accumulator, other_accumulator in zip(
+            self.waiting_time_accumulators, other.waiting_time_accumulators
+        ):
+            accumulator.merge(other_accumulator)
+
+    def to_subvariant_performance(self) -> SubvariantWithPerformance:
+        for nodes in self.subvariant:
+            for node in nodes:
+                if node.lifecycle == "start":
+                    continue
+                node.performance_stats = self.service_time_accumulators[
+                    (node.activity, node.activity_instance)
+                ].to_stats()
+
+        waiting_time_events = [
+            WaitingTimeEvent(e.start, e.complete, accumulator.to_stats(), e.anchor)
+            for e, accumulator in zip(
+                self.waiting_time_events, self.waiting_time_accumulators
+            )
+        ]
+
+        return SubvariantWithPerformance(
+            self.subvariant,
+            waiting_time_events,
+            global_performance_stats=self.global_accumulator.to_stats(),
+        )
+
+
+class TreePerformanceAccumulator:
+    """
+    Incremental version of get_tree_performance_streaming. Only the lifecycle variants of new traces that were not
+    seen before are aligned (the alignments are kept in a LifecycleAlignmentCache) and only the new traces are
+    evaluated. The accumulators are kept per node path, s.t. accumulators created for different copies of the tree,
+    e.g. in worker processes, can be merged.
+    """
+
+    def __init__(
+        self,
+        pt,
+        selected_tree_nodes=None,
+        alignment_variant=net_alignment.Variants.VERSION_STATE_EQUATION_A_STAR,
+        alignment_params=None,
+        alignments_aggregator=avg,
+        instances_aggregator=avg,
+        relative_accuracy: float = 0.01,
+        alignment_cache: Optional[LifecycleAlignmentCache] = None,
+    ):
+        self.pt = pt
+        self.selected_tree_nodes = selected_tree_nodes
+        self.alignment_variant = alignment_variant
+        self.alignment_params = alignment_params if alignment_params else {}
+        self.alignments_aggregator = alignments_aggregator
+        self.instances_aggregator = instances_aggregator
+        self.relative_accuracy = relative_accuracy
+        self.alignment_cache = (
+            alignment_cache
+            if alignment_cache is not None
+            else LifecycleAlignmentCache()
+        )
+        # service, idle, waiting and cycle times
+        self.accumulators: Tuple[Dict[NodePath, StatsAccumulator], ...] = tuple(
+            {} for _ in range(4)
+        )
+        self.variant_fitness: Dict[Tuple[str, ...], float] = {}
+
+    def add_traces(self, log: EventLog, pool=None):
+        log_lifecycle = to_low_level_log(log)
+        alignments, log_lifecycle, _ = get_all_alignments(
+            self.pt,
+            log_lifecycle,
+            alignment_variant=self.alignment_variant,
+            alignment_params=self.alignment_params,
+            pool=pool,
+            cache=self.alignment_cache,
+        )
+
+        key_prefix = get_cache_key_prefix(
+            self.pt,
+            self.alignment_variant.name,
+            get_lifecycle_alignment_params(self.alignment_params),
+        )
+        for variant in variants_filter.get_variants(log_lifecycle):
+            _, fitness = self.alignment_cache.get(key_prefix + (variant,))
+            self.variant_fitness[variant] = fitness
+
+        new_accumulators = compute_performances_streaming(
+            self.pt,
+            log_lifecycle,
+            alignments,
+            self.selected_tree_nodes,
+            alignments_aggregator=self.alignments_aggregator,
+            instances_aggregator=self.instances_aggregator,
+            relative_accuracy=self.relative_accuracy,
+        )
+        for node_accumulators, new_node_accumulators in zip(
+            self.accumulators, new_accumulators
+        ):
+            for t, accumulator in new_node_accumulators.items():
+                self.__merge_accumulator(
+                    node_accumulators, get_path_from_root(t), accumulator
+                )
+
+    def merge(self, other: "TreePerformanceAccumulator"):
+        for node_accumulators, other_node_accumulators in zip(
+            self.accumulators, other.accumulators
+        ):
+            for path, accumulator in other_node_accumulators.items():
+                self.__merge_accumulator(node_accumulators, path, accumulator)
+        self.variant_fitness.update(other.variant_fitness)
+
+    def to_stats(self):
+        """
+        :return: statistics per tree node for service, idle, waiting and cycle times, mean fitness of the lifecycle
+        variants
+        """
+        nodes_by_path = get_nodes_by_path(self.pt)
+        stats = tuple(
+            {
+                nodes_by_path[path]: accumulator.to_stats()
+                for path, accumulator in node_accumulators.items()
+            }
+            for node_accumulators in self.accumulators
+        )
+        mean_fitness = (
+            sum(self.variant_fitness.values()) / len(self.variant_fitness)
+            if self.variant_fitness
+            else None
+        )
+        return stats, mean_fitness
+
+    def __merge_accumulator(
+        self,
+        node_accumulators: Dict[NodePath, StatsAccumulator],
+        path: NodePath,
+        accumulator: StatsAccumulator,
+    ):
+        if path not in node_accumulators:
+            node_accumulators[path] = StatsAccumulator(self.relative_accuracy)
+        node_accumulators[path].merge(accumulator)
@@ -0,0 +1,89 @@
+import math
+import random
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pm4py.objects.log.obj import EventLog, Trace
+from pm4py.objects.log.util.xes import DEFAULT_START_TIMESTAMP_KEY
+from pm4py.util.xes_constants import (
+    DEFAULT_NAME_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+    DEFAULT_TRANSITION_KEY,
+)
+
+TimeWindow = Tuple[Optional[datetime], Optional[datetime]]
+
+
+def sample_log_by_variant(
+    log: EventLog, sample_size: int, seed: Optional[int] = None
+) -> EventLog:
+    """
+    Draws a random sample of traces that is stratified by variant (activities and lifecycle transitions). The sample
+    size of each variant is proportional to its frequency (largest remainder rounding), s.t. statistics over the sample
+    do not need to be weighted. Variants that are too infrequent to get a share of the sample are not contained.
+    :param sample_size: number of traces in the sample, the log is returned if it does not contain more traces
+    :return: sampled traces in the order of the log
+    """
+    if sample_size >= len(log):
+        return log
+
+    traces_per_variant: Dict[Tuple, List[int]] = {}
+    for i, trace in enumerate(log):
+        traces_per_variant.setdefault(get_lifecycle_variant(trace), []).append(i)
+
+    quotas = {
+        variant: sample_size * len(indices) / len(log)
+        for variant, indices in traces_per_variant.items()
+    }
+    allocation = {variant: math.floor(q) for variant, q in quotas.items()}
+    remaining = sample_size - sum(allocation.values())
+    for variant in sorted(
+        quotas, key=lambda v: quotas[v] - allocation[v], reverse=True
+    )[:remaining]:
+        allocation[variant] += 1
+
+    rng = random.Random(seed)
+    sampled_indices = sorted(
+        i
+        for variant, indices in traces_per_variant.items()
+        for i in rng.sample(indices, allocation[variant])
+    )
+
+    return __copy_log_with_traces(log, [log[i] for i in sampled_indices])
+
+
+def filter_log_by_time_window(log: EventLog, time_window: TimeWindow) -> EventLog:
+    """
+    Keeps the traces whose events all lie in the time window.
+    :param time_window: (start, end), None for an open bound
+    """
+    start, end = time_window
+
+    def contained(trace: Trace) -> bool:
+        return all(
+            (
+                start is None
+                or e.get(DEFAULT_START_TIMESTAMP_KEY, e[DEFAULT_TIMESTAMP_KEY]) >= start
+            )
+            and (end is None or e[DEFAULT_TIMESTAMP_KEY] <= end)
+            for e in trace
+        )
+
+    return __copy_log_with_traces(log, [t for t in log if contained(t)])
+
+
+def get_lifecycle_variant(trace: Trace) -> Tuple:
+    return tuple(
+        (e[DEFAULT_NAME_KEY], e.get(DEFAULT_TRANSITION_KEY, None)) for e in trace
+    )
+
+
+def __copy_log_with_traces(log: EventLog, traces: List[Trace]) -> EventLog:
+    return EventLog(
+        traces,
+        attributes=log.attributes,
+        extensions=log.extensions,
+        classifiers=log.classifiers,
+        omni_present=log.omni_present,
+        properties=log.properties,
+    )
@@ -7,13 +7,19 @@ from pm4py.objects.log.util.xes import (
 )
 
 from cortado_core.performance.aggregators import stats
+from cortado_core.performance.variant_performance import durations_to_seconds
 from cortado_core.utils.cvariants import ACTIVITY_INSTANCE_KEY, SubvariantNode
-from cortado_core.utils.timestamp_utils import TimeUnit, transform_timestamp
+from cortado_core.utils.timestamp_utils import TimeUnit, to_utc, transform_timestamp
 
 from collections import defaultdict
-from typing import List, Any
+from typing import List, Any, Dict, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
+# datetime64 units that truncate timestamps like transform_timestamp, by name of the TimeUnit
+DATETIME64_UNITS = {"SEC": "s", "MIN": "m", "HOUR": "h", "DAY": "D", "MONTH": "M"}
+
 
 @dataclass
 class WaitingTimeEvent:
@@ -36,12 +42,57 @@ class SubvariantWithPerformance:
     global_performance_stats: Any
 
 
+@dataclass
+class TimestampMatrices:
+    """
+    Start and complete timestamps of the traces of a subvariant, one row per trace and one column per
+    (activity, activity instance). Timestamps are transformed to the time granularity and given in microseconds since
+    the epoch (exact in float64), NaN if a trace has no such activity instance.
+    """
+
+    columns: Dict[Tuple[str, int], int]
+    start: np.ndarray
+    complete: np.ndarray
+
+    def get_trace_starts(self) -> np.ndarray:
+        if len(self.columns) == 0:
+            return np.full(len(self.start), np.nan)
+        # fmin/fmax ignore NaN
+        return np.fmin.reduce(self.start, axis=1)
+
+    def get_trace_completes(self) -> np.ndarray:
+        if len(self.columns) == 0:
+            return np.full(len(self.complete), np.nan)
+        return np.fmax.reduce(self.complete, axis=1)
+
+    def get_service_times(self, node: SubvariantNode) -> np.ndarray:
+        column = self.columns[(node.activity, node.activity_instance)]
+        return self.complete[:, column] - self.start[:, column]
+
+    def get_column(self, node: SubvariantNode) -> np.ndarray:
+        column = self.columns[(node.activity, node.activity_instance)]
+        return (
+            self.start[:, column]
+            if node.lifecycle == "start"
+            else self.complete[:, column]
+        )
+
+
 def calculate_subvariant_performance(
-    subvariant, traces, time_granularity: TimeUnit
+    subvariant, traces, time_granularity: TimeUnit, columnar: bool = False
 ) -> SubvariantWithPerformance:
+    """
+    :param columnar: if True, the timestamps are transformed once into TimestampMatrices and all service and waiting
+    times are computed by array arithmetic on them
+    """
     log = EventLog(traces)
     log = to_interval(log)
 
+    if columnar:
+        return __calculate_subvariant_performance_columnar(
+            subvariant, log, time_granularity
+        )
+
     global_stats = __get_global_performance_stats(log, time_granularity)
     service_times_per_activity = __get_service_times_per_activity(log, time_granularity)
 
@@ -59,6 +110,71 @@ def calculate_subvariant_performance(
     )
 
 
+def __calculate_subvariant_performance_columnar(
+    subvariant, interval_log: EventLog, time_granularity: TimeUnit
+) -> SubvariantWithPerformance:
+    matrices = get_timestamp_matrices(interval_log, time_granularity)
+
+    # like __get_global_performance_stats, the earliest start and latest completion are carried over to the next traces
+    trace_start = np.fmin.accumulate(matrices.get_trace_starts())
+    trace_complete = np.fmax.accumulate(matrices.get_trace_completes())
+    global_stats = stats(durations_to_seconds(trace_complete - trace_start))
+
+    for parallel_subvariant_nodes in subvariant:
+        for subvariant_node in parallel_subvariant_nodes:
+            if subvariant_node.lifecycle == "start":
+                continue
+
+            subvariant_node.performance_stats = stats(
+                durations_to_seconds(matrices.get_service_times(subvariant_node))
+            )
+
+    waiting_time_events = get_waiting_time_events(subvariant)
+    for waiting_time_event in waiting_time_events:
+        waiting_time_event.performance_stats = stats(
+            durations_to_seconds(
+                matrices.get_column(waiting_time_event.complete)
+                - matrices.get_column(waiting_time_event.start)
+            )
+        )
+
+    return SubvariantWithPerformance(
+        subvariant,
+        waiting_time_events,
+        global_performance_stats=global_stats,
+    )
+
+
+def get_timestamp_matrices(
+    interval_log: EventLog, time_granularity: TimeUnit
+) -> TimestampMatrices:
+    columns = {}
+    rows, cols, start_timestamps, complete_timestamps = [], [], [], []
+    for row, trace in enumerate(interval_log):
+        for event in trace:
+            key = (event[DEFAULT_NAME_KEY], event[ACTIVITY_INSTANCE_KEY])
+            rows.append(row)
+            cols.append(columns.setdefault(key, len(columns)))
+            start_timestamps.append(to_utc(event[DEFAULT_START_TIMESTAMP_KEY]))
+            complete_timestamps.append(to_utc(event[DEFAULT_TIMESTAMP_KEY]))
+
+    start = np.full((len(interval_log), len(columns)), np.nan)
+    complete = np.full((len(interval_log), len(columns)), np.nan)
+    start[rows, cols] = __to_microseconds(start_timestamps, time_granularity)
+    complete[rows, cols] = __to_microseconds(complete_timestamps, time_granularity)
+
+    return TimestampMatrices(columns, start, complete)
+
+
+def __to_microseconds(timestamps, time_granularity: TimeUnit) -> np.ndarray:
+    timestamps = np.array(timestamps, dtype="datetime64[us]")
+    unit = DATETIME64_UNITS.get(time_granularity.name, None)
+    if unit is not None:
+        timestamps = timestamps.astype(f"datetime64[{unit}]").astype("datetime64[us]")
+
+    return timestamps.astype(np.int64).astype(np.float64)
+
+
 def __get_global_performance_stats(interval_log: EventLog, time_granularity: TimeUnit):
     durations = []
     min_timestamp = None
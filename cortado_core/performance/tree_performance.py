@@ -1,17 +1,32 @@
+from bisect import bisect_left
 from copy import copy, deepcopy
+from dataclasses import dataclass
 from datetime import datetime
+from multiprocessing.pool import Pool
 from typing import List, Tuple, Optional, Dict
 
+import numpy as np
 from tqdm import tqdm
 
 import pm4py.visualization.process_tree.visualizer as tree_vis
+from cortado_core.performance.accumulators import StatsAccumulator
+from cortado_core.performance.aggregators import avg, stats_with_confidence_intervals
+from cortado_core.performance.alignment_cache import (
+    EncodedAlignment,
+    LifecycleAlignmentCache,
+    decode_alignment,
+    encode_alignment,
+    get_cache_key_prefix,
+    get_nodes_by_path,
+)
+from cortado_core.performance.sampling import (
+    TimeWindow,
+    filter_log_by_time_window,
+    sample_log_by_variant,
+)
 from cortado_core.performance.utils import (
-    get_alignment_activities,
-    get_alignment_events,
-    get_alignment_tree_nodes,
-    get_all_indices,
-    get_alignment_tree_lf,
-    get_tree_instances,
+    AlignmentIndex,
+    get_alignment_event_positions,
     get_all_nodes,
 )
 from pm4py.algo.conformance.alignments.petri_net import algorithm as net_alignment
@@ -33,6 +48,7 @@ from .service_time import compute_service_times, compute_idle_times
 from .waiting_time import get_enabling_nodes
 from ..process_tree_utils import to_petri_net_transition_bordered
 from cortado_core.process_tree_utils.miscellaneous import is_tau_leaf
+from cortado_core.utils.parallel_utils import MIN_CHUNKS
 
 
 def create_low_level_tree(pt, parent=None, instances={}):
@@ -112,6 +128,23 @@ def get_low_level_net(net: PetriNet):
     return net, im, fm, instances
 
 
+@dataclass
+class PerformancePlan:
+    """
+    Alignment steps whose timestamps determine the performance of a tree node in an alignment. The plan only depends on
+    the alignment, i.e., it is computed once per variant and evaluated for all traces of the variant.
+    Per instance of the node:
+    - service_intervals: (start step, complete step) of the (child) activity instances
+    - enabling_steps: step of the enabling event, the start step if the node is enabled by the root
+    - start_steps, complete_steps: steps of the first start and the last completion
+    """
+
+    service_intervals: List[List[Tuple[int, int]]]
+    enabling_steps: List[int]
+    start_steps: List[int]
+    complete_steps: List[int]
+
+
 def compute_performances_intervals(tree, log, alignments, selected_tree_nodes=None):
     if selected_tree_nodes is None:
         tree_nodes = get_all_nodes(tree)
@@ -123,70 +156,140 @@ def compute_performances_intervals(tree, log, alignments, selected_tree_nodes=No
     all_waiting_times = {t: [None for _ in range(len(log))] for t in tree_nodes}
     all_cycle_times = {t: [None for _ in range(len(log))] for t in tree_nodes}
 
-    cache = {}
-    for t in tree_nodes:
-        # *tau* nodes
-        if is_tau_leaf(t):
-            continue
-        child_nodes = get_all_nodes(t) - {t}
-        enabling_nodes = get_enabling_nodes(t)
-        for trace_idx, trace in enumerate(log):
-            variant = variants_util.get_variant_from_trace(trace)
-            trace_alignments = alignments[variant]
-
-            all_service_times[t][trace_idx] = [
-                None for _ in range(len(trace_alignments))
-            ]
-            all_waiting_times[t][trace_idx] = [
-                None for _ in range(len(trace_alignments))
-            ]
-            all_idle_times[t][trace_idx] = [None for _ in range(len(trace_alignments))]
-            all_cycle_times[t][trace_idx] = [None for _ in range(len(trace_alignments))]
-
-            for alignment_idx, alignment in enumerate(trace_alignments):
-                if (trace_idx, alignment_idx) in cache:
-                    (
-                        alignment_tree_nodes,
-                        alignment_events,
-                        alignment_activities,
-                        alignment_active_close,
-                    ) = cache[(trace_idx, alignment_idx)]
-                else:
-                    alignment_tree_nodes = get_alignment_tree_nodes(alignment)
-                    alignment_events = get_alignment_events(alignment, trace)
-                    alignment_activities = get_alignment_activities(alignment)
-                    alignment_active_close = get_alignment_tree_lf(alignment)
-                    cache[(trace_idx, alignment_idx)] = (
-                        alignment_tree_nodes,
-                        alignment_events,
-                        alignment_activities,
-                        alignment_active_close,
-                    )
+    for (
+        t,
+        trace_indices,
+        service_times,
+        idle_times,
+        waiting_times,
+        cycle_times,
+    ) in __evaluate_variants(tree_nodes, log, alignments):
+        for i, trace_idx in enumerate(trace_indices):
+            all_service_times[t][trace_idx] = service_times[i]
+            all_idle_times[t][trace_idx] = idle_times[i]
+            all_waiting_times[t][trace_idx] = waiting_times[i]
+            all_cycle_times[t][trace_idx] = cycle_times[i]
 
-                performance = compute_performance_trace(
-                    t,
-                    alignment,
-                    child_nodes,
-                    enabling_nodes,
-                    alignment_tree_nodes,
-                    alignment_events,
-                    alignment_activities,
-                    alignment_active_close,
-                )
-                all_service_times[t][trace_idx][alignment_idx] = (
-                    performance.service_times if performance else None
-                )
-                all_idle_times[t][trace_idx][alignment_idx] = (
-                    performance.idle_times if performance else None
+    return all_service_times, all_idle_times, all_waiting_times, all_cycle_times
+
+
+def compute_performances_streaming(
+    tree,
+    log,
+    alignments,
+    selected_tree_nodes=None,
+    alignments_aggregator=avg,
+    instances_aggregator=avg,
+    relative_accuracy: float = 0.01,
+    chunk_size: int = 1000,
+) -> Tuple[Dict[CortadoProcessTree, StatsAccumulator], ...]:
+    """
+    Computes the same statistics as apply_aggregation(compute_performances_intervals(...), stats, alignments_aggregator,
+    instances_aggregator) without materializing the intervals of all traces. The intervals of at most chunk_size traces
+    are evaluated at once and immediately reduced to one value per trace and node, which updates a StatsAccumulator of
+    the node. Memory is therefore O(nodes) (plus one chunk) and the accumulators of partitions of a log can be merged.
+    Median and percentiles are estimated with a relative error of at most relative_accuracy.
+    :return: accumulators per node for service, idle, waiting and cycle times
+    """
+    if selected_tree_nodes is None:
+        tree_nodes = get_all_nodes(tree)
+    else:
+        tree_nodes = selected_tree_nodes
+
+    accumulators = tuple(
+        {t: StatsAccumulator(relative_accuracy) for t in tree_nodes} for _ in range(4)
+    )
+
+    for t, _, *measures in __evaluate_variants(tree_nodes, log, alignments, chunk_size):
+        for node_accumulators, values in zip(accumulators, measures):
+            accumulator = node_accumulators[t]
+            for trace_values in values:
+                accumulator.add(
+                    alignments_aggregator(
+                        [
+                            decide_aggregator(instances, instances_aggregator)
+                            for instances in trace_values
+                        ]
+                    )
                 )
-                all_waiting_times[t][trace_idx][alignment_idx] = (
-                    performance.waiting_times if performance else None
+
+    return accumulators
+
+
+def __evaluate_variants(tree_nodes, log, alignments, chunk_size=None):
+    """
+    Evaluates the performance plans of all (non tau) tree nodes for the traces of each variant.
+    Yields (tree node, trace indices, service times, idle times, waiting times, cycle times) per variant (and chunk of
+    at most chunk_size traces), where each measure contains a list per trace with the value per alignment (None if
+    the node has no performance in the alignment).
+    """
+    # *tau* nodes
+    tree_nodes = [t for t in tree_nodes if not is_tau_leaf(t)]
+    child_nodes = {t: get_all_nodes(t) - {t} for t in tree_nodes}
+    enabling_nodes = {t: get_enabling_nodes(t) for t in tree_nodes}
+
+    traces_per_variant = {}
+    for trace_idx, trace in enumerate(log):
+        variant = variants_util.get_variant_from_trace(trace)
+        traces_per_variant.setdefault(variant, []).append(trace_idx)
+
+    for variant, trace_indices in traces_per_variant.items():
+        trace_alignments = alignments[variant]
+        alignment_indices = [AlignmentIndex(a) for a in trace_alignments]
+        plans = {
+            t: [
+                compute_performance_plan(
+                    t, child_nodes[t], enabling_nodes[t], alignment_index
                 )
-                all_cycle_times[t][trace_idx][alignment_idx] = (
-                    performance.cycle_times if performance else None
+                for alignment_index in alignment_indices
+            ]
+            for t in tree_nodes
+        }
+        event_positions = [get_alignment_event_positions(a) for a in trace_alignments]
+
+        n_chunk = chunk_size if chunk_size else len(trace_indices)
+        for chunk_start in range(0, len(trace_indices), n_chunk):
+            chunk_indices = trace_indices[chunk_start : chunk_start + n_chunk]
+            timestamps = get_timestamps([log[i] for i in chunk_indices])
+            # timestamps per trace and alignment step, None for model moves
+            step_timestamps = [
+                timestamps[:, positions] for positions in event_positions
+            ]
+
+            for t in tree_nodes:
+                service_times, idle_times, waiting_times, cycle_times = (
+                    [[None] * len(trace_alignments) for _ in chunk_indices]
+                    for _ in range(4)
                 )
 
-    return all_service_times, all_idle_times, all_waiting_times, all_cycle_times
+                for alignment_idx, plan in enumerate(plans[t]):
+                    if plan is None:
+                        continue
+
+                    performances = evaluate_performance_plan(
+                        plan, step_timestamps[alignment_idx]
+                    )
+                    for i, performance in enumerate(performances):
+                        service_times[i][alignment_idx] = performance.service_times
+                        idle_times[i][alignment_idx] = performance.idle_times
+                        waiting_times[i][alignment_idx] = performance.waiting_times
+                        cycle_times[i][alignment_idx] = performance.cycle_times
+
+                yield t, chunk_indices, service_times, idle_times, waiting_times, cycle_times
+
+
+def get_timestamps(traces) -> np.ndarray:
+    """
+    Returns the timestamps of traces of the same variant as an object array of shape (#traces, len(trace) + 1). The
+    last column is None, s.t. indexing with the event positions of an alignment (-1 for model moves) yields None for
+    model moves.
+    """
+    n_events = len(traces[0]) if traces else 0
+    timestamps = np.full((len(traces), n_events + 1), None, dtype=object)
+    for i, trace in enumerate(traces):
+        timestamps[i, :n_events] = [e[DEFAULT_TIMESTAMP_KEY] for e in trace]
+
+    return timestamps
 
 
 def reduce_alignments(alignments):
@@ -208,168 +311,163 @@ def compute_performance_trace(
     alignment_activities,
     alignment_active_close,
 ) -> PerformanceMeasures:
-    instances = get_all_indices(alignment_tree_nodes, tree)
+    plan = compute_performance_plan(
+        tree, child_nodes, enabling_nodes, AlignmentIndex(alignment)
+    )
+    if plan is None:
+        return None
+
+    step_timestamps = np.full((1, len(alignment_events)), None, dtype=object)
+    step_timestamps[0, :] = [
+        e[DEFAULT_TIMESTAMP_KEY] if e else None for e in alignment_events
+    ]
+
+    return evaluate_performance_plan(plan, step_timestamps)[0]
+
+
+def compute_performance_plan(
+    tree: CortadoProcessTree,
+    child_nodes,
+    enabling_nodes,
+    alignment_index: AlignmentIndex,
+) -> Optional[PerformancePlan]:
+    instances = alignment_index.get_indices(tree)
     instances = [instances[i : i + 2] for i in range(0, len(instances), 2)]
 
     if len(instances) == 0:
         return None
 
-    parent_indices = get_all_indices(alignment_tree_nodes, tree.parent)
+    parent_indices = alignment_index.get_indices(tree.parent)
     parent_active_indices = [
-        i for i in parent_indices if i == -1 or alignment_active_close[i] == "active"
+        i
+        for i in parent_indices
+        if i == -1 or alignment_index.active_close[i] == "active"
     ]
 
     enabling_indices = [
-        i for n in enabling_nodes for i in get_all_indices(alignment_tree_nodes, n)
+        i for n in enabling_nodes for i in alignment_index.get_indices(n)
     ]
-    enabling_completing_indices = [
+    enabling_completing_indices = sorted(
         i
         for i in enabling_indices
-        if alignment_activities[i] and "complete" in alignment_activities[i] or i == -1
-    ]
+        if i == -1
+        or alignment_index.activities[i]
+        and "complete" in alignment_index.activities[i]
+    )
+
+    if len(tree.children) > 0:
+        child_node_ids = alignment_index.get_contained_nodes(child_nodes)
+        child_start_steps = alignment_index.get_start_steps(child_node_ids)
+        child_complete_steps = alignment_index.get_complete_steps(child_node_ids)
 
-    waiting_times = []
-    service_times = []
-    cycle_times = []
-    idle_times = []
+    plan = PerformancePlan(
+        service_intervals=[], enabling_steps=[], start_steps=[], complete_steps=[]
+    )
 
     for self_index_start, self_index_end in instances:
         if len(tree.children) == 0:
-            self_start_event = alignment_events[self_index_start]
-            self_complete_event = alignment_events[self_index_end]
-            service_time_intervals = [
-                [
-                    (
-                        self_start_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_start_event
-                        else None
-                    ),
-                    (
-                        self_complete_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_complete_event
-                        else None
-                    ),
-                ]
-            ]
+            self_start = self_index_start
+            self_complete = self_index_end
+            service_intervals = [(self_start, self_complete)]
         else:
             # restrict search to range self_start to self_end
-            starting_nodes_indices = [
-                i
-                for i in range(self_index_start, self_index_end)
-                if (
-                    bool(alignment_activities[i])
-                    and alignment[i]
-                    and "start" in alignment_activities[i]
-                )
-                and alignment_tree_nodes[i] in child_nodes
-            ]
-            if not starting_nodes_indices:
+            first_start = bisect_left(child_start_steps, self_index_start)
+            if (
+                first_start == len(child_start_steps)
+                or child_start_steps[first_start] >= self_index_end
+            ):
                 # only log moves of child nodes
                 return None
-            self_start_event = min(starting_nodes_indices)
-            self_start_event = alignment_events[self_start_event]
-
-            completing_indices = [
-                i
-                for i in range(self_index_start, self_index_end)
-                if (alignment_activities[i] and "complete" in alignment_activities[i])
-                and alignment_tree_nodes[i] in child_nodes
-            ]
-            if not completing_indices:
+            self_start = child_start_steps[first_start]
+
+            last_complete = bisect_left(child_complete_steps, self_index_end) - 1
+            if (
+                last_complete < 0
+                or child_complete_steps[last_complete] < self_index_start
+            ):
                 # only log moves of child nodes
                 return None
-            self_complete_event = max(completing_indices)
-            self_complete_event = alignment_events[self_complete_event]
+            self_complete = child_complete_steps[last_complete]
 
-            activity_instances = get_tree_instances(
-                alignment[self_index_start:self_index_end], nodes=child_nodes
+            service_intervals = alignment_index.get_tree_instances(
+                child_node_ids, self_index_start, self_index_end
             )
-            activity_instances_events = [
-                (
-                    alignment_events[self_index_start + ai[0]],
-                    alignment_events[self_index_start + ai[1]],
-                )
-                for ai in activity_instances
-            ]
-            service_time_intervals = [
-                [
-                    ai[0][DEFAULT_TIMESTAMP_KEY] if ai[0] else None,
-                    ai[1][DEFAULT_TIMESTAMP_KEY] if ai[1] else None,
-                ]
-                for ai in activity_instances_events
-            ]
-
-        service_times.append(compute_service_times(service_time_intervals))
-        idle_times.append(compute_idle_times(service_time_intervals))
 
         if tree.parent and tree.parent.operator == Operator.PARALLEL:
-            parent_active_index = max(
-                [i for i in parent_active_indices if i < self_index_start]
+            last_parent_active = (
+                bisect_left(parent_active_indices, self_index_start) - 1
             )
+            assert last_parent_active >= 0, "parent not active"
+            parent_active_index = parent_active_indices[last_parent_active]
         else:
             parent_active_index = self_index_start
 
-        candidates = [i for i in enabling_completing_indices if i < parent_active_index]
-        if not candidates:
+        last_candidate = (
+            bisect_left(enabling_completing_indices, parent_active_index) - 1
+        )
+        if last_candidate < 0:
             # Should not happen
             assert False, "no enabling candidates"
 
-        max_enabling = max(candidates)
+        max_enabling = enabling_completing_indices[last_candidate]
+
+        plan.service_intervals.append(service_intervals)
         # enabled by root
-        if max_enabling == -1:
-            waiting_times.append(
-                (
-                    (
-                        self_start_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_start_event
-                        else None
-                    ),
-                    (
-                        self_start_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_start_event
-                        else None
-                    ),
-                )
-            )
-            cycle_times.append(
-                [
-                    (
-                        self_start_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_start_event
-                        else None
-                    ),
-                    (
-                        self_complete_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_complete_event
-                        else None
-                    ),
-                ]
-            )
-            continue
+        plan.enabling_steps.append(self_start if max_enabling == -1 else max_enabling)
+        plan.start_steps.append(self_start)
+        plan.complete_steps.append(self_complete)
+
+    return plan
+
+
+def evaluate_performance_plan(
+    plan: PerformancePlan, step_timestamps: np.ndarray
+) -> List[PerformanceMeasures]:
+    """
+    Evaluates the plan for all traces of a variant at once.
+    :param plan: plan of a tree node for an alignment of the variant
+    :param step_timestamps: timestamps per trace (rows) and alignment step (columns), None for model moves
+    :return: performance measures per trace
+    """
+    n_instances = len(plan.start_steps)
+    offsets = [0]
+    for intervals in plan.service_intervals:
+        offsets.append(offsets[-1] + 2 * len(intervals))
+
+    # gather all required timestamps of all traces at once: service interval bounds, enabling, start and completion
+    steps = [
+        step for intervals in plan.service_intervals for i in intervals for step in i
+    ]
+    steps += plan.enabling_steps + plan.start_steps + plan.complete_steps
+    n_service_steps = offsets[-1]
+
+    performances = []
+    for values in step_timestamps[:, steps].tolist():
+        enabling = values[n_service_steps : n_service_steps + n_instances]
+        start = values[
+            n_service_steps + n_instances : n_service_steps + 2 * n_instances
+        ]
+        complete = values[n_service_steps + 2 * n_instances :]
 
-        enabling_event = alignment_events[max_enabling]
-        waiting_time_interval = (
-            enabling_event[DEFAULT_TIMESTAMP_KEY] if enabling_event else None,
-            self_start_event[DEFAULT_TIMESTAMP_KEY] if self_start_event else None,
-        )
-        waiting_times.append(waiting_time_interval)
-        cycle_times.append(
-            [
-                enabling_event[DEFAULT_TIMESTAMP_KEY] if enabling_event else None,
-                (
-                    self_complete_event[DEFAULT_TIMESTAMP_KEY]
-                    if self_complete_event
-                    else None
-                ),
+        service_times = []
+        idle_times = []
+        for i in range(n_instances):
+            service_time_intervals = [
+                [values[j], values[j + 1]] for j in range(offsets[i], offsets[i + 1], 2)
             ]
+            service_times.append(compute_service_times(service_time_intervals))
+            idle_times.append(compute_idle_times(service_time_intervals))
+
+        performances.append(
+            PerformanceMeasures(
+                service_times=service_times,
+                idle_times=idle_times,
+                waiting_times=list(zip(enabling, start)),
+                cycle_times=[list(c) for c in zip(enabling, complete)],
+            )
         )
 
-    return PerformanceMeasures(
-        service_times=service_times,
-        idle_times=idle_times,
-        waiting_times=waiting_times,
-        cycle_times=cycle_times,
-    )
+    return performances
 
 
 def get_tree_performance_intervals(
@@ -379,7 +477,16 @@ def get_tree_performance_intervals(
     alignment_time_limit=None,
     alignment_params={},
     selected_tree_nodes=None,
+    pool: Optional[Pool] = None,
+    alignment_cache: Optional[LifecycleAlignmentCache] = None,
+    time_window: Optional[TimeWindow] = None,
 ):
+    """
+    :param time_window: if given, only the traces whose events lie in the time window (start, end) are aligned and
+    evaluated. If no trace lies in the time window, the performances of all nodes are empty and the fitness is None
+    """
+    if time_window is not None:
+        log = filter_log_by_time_window(log, time_window)
     log_lifecycle = to_low_level_log(log)
 
     alignments, log_lifecycle, mean_fitness = get_all_alignments(
@@ -388,6 +495,8 @@ def get_tree_performance_intervals(
         alignment_variant=alignment_variant,
         alignment_time_limit=alignment_time_limit,
         alignment_params=alignment_params,
+        pool=pool,
+        cache=alignment_cache,
     )
     performances = compute_performances_intervals(
         pt, log_lifecycle, alignments, selected_tree_nodes
@@ -396,6 +505,112 @@ def get_tree_performance_intervals(
     return performances, mean_fitness
 
 
+def get_tree_performance_sampled(
+    pt,
+    log,
+    sample_size: int,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    alignment_variant=net_alignment.Variants.VERSION_STATE_EQUATION_A_STAR,
+    alignment_time_limit=None,
+    alignment_params={},
+    selected_tree_nodes=None,
+    pool: Optional[Pool] = None,
+    alignment_cache: Optional[LifecycleAlignmentCache] = None,
+    time_window: Optional[TimeWindow] = None,
+    alignments_aggregator=avg,
+    instances_aggregator=avg,
+):
+    """
+    Estimates the statistics of apply_aggregation(get_tree_performance_intervals(...), stats, alignments_aggregator,
+    instances_aggregator) from a sample of at most sample_size traces (of the time window) that is stratified by
+    variant, see sample_log_by_variant. The statistics additionally contain confidence intervals for mean and median,
+    see stats_with_confidence_intervals.
+    :return: statistics per node for service, idle, waiting and cycle times, mean fitness of the sampled variants
+    """
+    if time_window is not None:
+        log = filter_log_by_time_window(log, time_window)
+    sample = sample_log_by_variant(log, sample_size, seed)
+
+    performances, mean_fitness = get_tree_performance_intervals(
+        pt,
+        sample,
+        alignment_variant=alignment_variant,
+        alignment_time_limit=alignment_time_limit,
+        alignment_params=alignment_params,
+        selected_tree_nodes=selected_tree_nodes,
+        pool=pool,
+        alignment_cache=alignment_cache,
+    )
+    performance_stats = tuple(
+        apply_aggregation(
+            values,
+            lambda v: stats_with_confidence_intervals(v, confidence),
+            alignments_aggregator,
+            instances_aggregator,
+        )
+        for values in performances
+    )
+    return performance_stats, mean_fitness
+
+
+def get_tree_performance_streaming(
+    pt,
+    log,
+    alignment_variant=net_alignment.Variants.VERSION_STATE_EQUATION_A_STAR,
+    alignment_time_limit=None,
+    alignment_params={},
+    selected_tree_nodes=None,
+    pool: Optional[Pool] = None,
+    alignment_cache: Optional[LifecycleAlignmentCache] = None,
+    alignments_aggregator=avg,
+    instances_aggregator=avg,
+    relative_accuracy: float = 0.01,
+):
+    """
+    Streaming variant of get_tree_performance_intervals followed by apply_aggregation with stats as cases aggregator,
+    see compute_performances_streaming.
+    :return: accumulators per node for service, idle, waiting and cycle times, mean fitness
+    """
+    log_lifecycle = to_low_level_log(log)
+
+    alignments, log_lifecycle, mean_fitness = get_all_alignments(
+        pt,
+        log_lifecycle,
+        alignment_variant=alignment_variant,
+        alignment_time_limit=alignment_time_limit,
+        alignment_params=alignment_params,
+        pool=pool,
+        cache=alignment_cache,
+    )
+    accumulators = compute_performances_streaming(
+        pt,
+        log_lifecycle,
+        alignments,
+        selected_tree_nodes,
+        alignments_aggregator=alignments_aggregator,
+        instances_aggregator=instances_aggregator,
+        relative_accuracy=relative_accuracy,
+    )
+    return accumulators, mean_fitness
+
+
+def merge_accumulators(
+    accumulators: Tuple[Dict[CortadoProcessTree, StatsAccumulator], ...],
+    other: Tuple[Dict[CortadoProcessTree, StatsAccumulator], ...],
+):
+    """
+    Merges the accumulators of another partition of the log (same tree nodes) into accumulators.
+    """
+    for node_accumulators, other_node_accumulators in zip(accumulators, other):
+        for t, accumulator in other_node_accumulators.items():
+            node_accumulators[t].merge(accumulator)
+
+
+def to_stats(accumulators: Dict[CortadoProcessTree, StatsAccumulator]):
+    return {t: accumulator.to_stats() for t, accumulator in accumulators.items()}
+
+
 def get_interval_length(
     interval: Tuple[Optional[datetime], Optional[datetime]], none_to_null=False
 ):
@@ -477,7 +692,7 @@ def apply_single_interval_aggregation(
 
 def to_low_level_log(log):
     log_lifecycle = to_lifecycle(log)
-    if (
+    if len(log_lifecycle) > 0 and (
         "_start" not in log_lifecycle[0][0][DEFAULT_NAME_KEY].lower()
         and "_complete" not in log_lifecycle[0][0][DEFAULT_NAME_KEY].lower()
     ):
@@ -495,39 +710,161 @@ def get_all_alignments(
     alignment_variant=net_alignment.Variants.VERSION_STATE_EQUATION_A_STAR,
     alignment_time_limit=None,
     alignment_params={},
+    pool: Optional[Pool] = None,
+    cache: Optional[LifecycleAlignmentCache] = None,
 ):
-    net, im, fm = to_petri_net_transition_bordered.apply(pt)
-    low_level_net, im, fm, _ = get_low_level_net(net)
+    """
+    Aligns each lifecycle variant on the low-level net of pt.
+    :param pool: if given, the variants are aligned in parallel. The low-level net is sent to the workers once per chunk
+    of variants
+    :param cache: if given, only variants that were not aligned on a tree with the same structure (and the same
+    alignment variant, parameters and time limit) before are aligned
+    """
     variants = variants_filter.get_variants(log_lifecycle)
+    alignment_params = get_lifecycle_alignment_params(
+        alignment_params, alignment_time_limit
+    )
+
+    if cache is not None:
+        key_prefix = get_cache_key_prefix(pt, alignment_variant.name, alignment_params)
+    nodes_by_path = get_nodes_by_path(pt)
     all_alignments = {}
     fitness = 0
-    for variant in tqdm(variants):
-        v_trace = variant_to_trace(variant)
-        if alignment_time_limit is not None:
-            alignment_params[net_alignment.Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = (
-                alignment_time_limit
-            )
-        alignment_params[
-            net_alignment.Parameters.PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE
-        ] = True
-        alignments = net_alignment.apply(
-            v_trace,
-            low_level_net,
-            im,
-            fm,
-            variant=alignment_variant,
-            parameters=alignment_params,
-        )
-        if "all_alignments" in alignments:
-            # reduced_alignments = reduce_alignments(alignments["all_alignments"])
-            all_alignments[variant] = alignments["all_alignments"]
+    missing_variants = []
+    for variant in variants:
+        cached = cache.get(key_prefix + (variant,)) if cache is not None else None
+        if cached is None:
+            missing_variants.append(variant)
+            continue
+        encoded_alignments, variant_fitness = cached
+        all_alignments[variant] = [
+            decode_alignment(a, nodes_by_path) for a in encoded_alignments
+        ]
+        fitness += variant_fitness
+
+    if missing_variants:
+        net, im, fm = to_petri_net_transition_bordered.apply(pt)
+        low_level_net, im, fm, _ = get_low_level_net(net)
+
+        if pool:
+            step_size = max(1, min(100, len(missing_variants) // MIN_CHUNKS))
+            chunks = [
+                missing_variants[i : i + step_size]
+                for i in range(0, len(missing_variants), step_size)
+            ]
+            chunk_results = [
+                pool.apply_async(
+                    calculate_lifecycle_variants_alignments,
+                    args=[
+                        chunk,
+                        low_level_net,
+                        im,
+                        fm,
+                        alignment_variant.name,
+                        alignment_params,
+                    ],
+                )
+                for chunk in chunks
+            ]
+            results = [result for r in tqdm(chunk_results) for result in r.get()]
         else:
-            all_alignments[variant] = [alignments["alignment"]]
-        fitness += alignments["fitness"]
-    mean_fitness = fitness / len(variants)
+            results = [
+                calculate_lifecycle_variant_alignments(
+                    variant,
+                    low_level_net,
+                    im,
+                    fm,
+                    alignment_variant.name,
+                    alignment_params,
+                )
+                for variant in tqdm(missing_variants)
+            ]
+
+        for variant, (encoded_alignments, variant_fitness) in zip(
+            missing_variants, results
+        ):
+            if cache is not None:
+                cache.set(
+                    key_prefix + (variant,),
+                    encoded_alignments,
+                    variant_fitness,
+                )
+            all_alignments[variant] = [
+                decode_alignment(a, nodes_by_path) for a in encoded_alignments
+            ]
+            fitness += variant_fitness
+
+    # no fitness for an empty log, e.g. if no trace lies in the time window
+    mean_fitness = fitness / len(variants) if len(variants) > 0 else None
     return all_alignments, log_lifecycle, mean_fitness
 
 
+def get_lifecycle_alignment_params(alignment_params, alignment_time_limit=None):
+    """
+    Returns a copy of alignment_params with the parameters needed to align lifecycle variants on the low-level net.
+    """
+    alignment_params = dict(alignment_params)
+    if alignment_time_limit is not None:
+        alignment_params[net_alignment.Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = (
+            alignment_time_limit
+        )
+    alignment_params[
+        net_alignment.Parameters.PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE
+    ] = True
+
+    return alignment_params
+
+
+def calculate_lifecycle_variants_alignments(
+    variants,
+    low_level_net: PetriNet,
+    im: Marking,
+    fm: Marking,
+    alignment_variant: str,
+    alignment_params,
+) -> List[Tuple[List[EncodedAlignment], float]]:
+    """
+    Worker function of get_all_alignments, aligns a chunk of lifecycle variants s.t. the low-level net is only
+    transferred once per chunk.
+    """
+    return [
+        calculate_lifecycle_variant_alignments(
+            variant, low_level_net, im, fm, alignment_variant, alignment_params
+        )
+        for variant in variants
+    ]
+
+
+def calculate_lifecycle_variant_alignments(
+    variant,
+    low_level_net: PetriNet,
+    im: Marking,
+    fm: Marking,
+    alignment_variant: str,
+    alignment_params,
+) -> Tuple[List[EncodedAlignment], float]:
+    """
+    Aligns a lifecycle variant on the low-level net. The alignment variant is passed by name, because the variants
+    are python modules that cannot be pickled for pool.apply_async(). The returned alignments refer to tree nodes by
+    their paths, because the tree nodes of the net are copies if this function is executed in a worker process.
+    """
+    alignments = net_alignment.apply(
+        variant_to_trace(variant),
+        low_level_net,
+        im,
+        fm,
+        variant=net_alignment.Variants[alignment_variant],
+        parameters=alignment_params,
+    )
+    if "all_alignments" in alignments:
+        # reduced_alignments = reduce_alignments(alignments["all_alignments"])
+        variant_alignments = alignments["all_alignments"]
+    else:
+        variant_alignments = [alignments["alignment"]]
+
+    return [encode_alignment(a) for a in variant_alignments], alignments["fitness"]
+
+
 def view_tree(pt):
     tree_vis.view(tree_vis.apply(pt, variant=tree_vis.Variants.SYMBOLIC))
 
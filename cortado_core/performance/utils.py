@@ -1,3 +1,6 @@
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
 from pm4py.objects.process_tree.obj import ProcessTree
 
 
@@ -17,6 +20,19 @@ def get_alignment_events(alignment, trace):
     return events
 
 
+def get_alignment_event_positions(alignment):
+    # position of the event of each alignment step in the trace, -1 for model moves
+    positions = []
+    i = 0
+    for (log_move_label, _), (_, _) in alignment:
+        if log_move_label != ">>":
+            positions.append(i)
+            i += 1
+        else:
+            positions.append(-1)
+    return positions
+
+
 def get_alignment_activities(alignment):
     return [a[1][0] if a[1][0] != ">>" else a[1][1] for a in alignment]
 
@@ -61,3 +77,76 @@ def get_tree_instances(alignment, nodes=None):
             start_idx = starts[t].pop()
             instances.append((start_idx, i))
     return instances
+
+
+class AlignmentIndex:
+    """
+    Inverted index of an alignment, built once per alignment s.t. the lookups of the performance computation do not scan
+    the alignment. Tree nodes are identified by their object id (see get_all_indices).
+    - steps: sorted alignment steps per tree node
+    - start_steps/complete_steps: sorted steps of start/complete moves per tree node
+    """
+
+    def __init__(self, alignment):
+        self.alignment = alignment
+        self.tree_nodes = get_alignment_tree_nodes(alignment)
+        self.activities = get_alignment_activities(alignment)
+        self.active_close = get_alignment_tree_lf(alignment)
+
+        self.nodes: Dict[int, ProcessTree] = {}
+        self.steps: Dict[int, List[int]] = {}
+        self.start_steps: Dict[int, List[int]] = {}
+        self.complete_steps: Dict[int, List[int]] = {}
+        for i, (node, activity) in enumerate(zip(self.tree_nodes, self.activities)):
+            if node is None:
+                continue
+            node_id = id(node)
+            self.nodes[node_id] = node
+            self.steps.setdefault(node_id, []).append(i)
+            if activity and "start" in activity:
+                self.start_steps.setdefault(node_id, []).append(i)
+            if activity and "complete" in activity:
+                self.complete_steps.setdefault(node_id, []).append(i)
+
+    def get_indices(self, node: Optional[ProcessTree]) -> List[int]:
+        """
+        Same as get_all_indices(alignment_tree_nodes, node).
+        """
+        if node is None:
+            return [-1]
+        return self.steps.get(id(node), [])
+
+    def get_contained_nodes(self, nodes: Set[ProcessTree]) -> List[int]:
+        """
+        Returns the ids of the tree nodes of the alignment that are contained in nodes.
+        """
+        return [node_id for node_id, node in self.nodes.items() if node in nodes]
+
+    def get_start_steps(self, node_ids: List[int]) -> List[int]:
+        return sorted(i for n in node_ids for i in self.start_steps.get(n, []))
+
+    def get_complete_steps(self, node_ids: List[int]) -> List[int]:
+        return sorted(i for n in node_ids for i in self.complete_steps.get(n, []))
+
+    def get_tree_instances(
+        self, node_ids: List[int], start: int, end: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Same as get_tree_instances(alignment[start:end], nodes) with node_ids = get_contained_nodes(nodes), but the
+        returned instances refer to steps of the whole alignment.
+        """
+        instances = []
+        for node_id in node_ids:
+            steps = self.steps[node_id]
+            starts = []
+            for i in steps[bisect_left(steps, start) : bisect_left(steps, end)]:
+                activity = self.activities[i]
+                if not activity:
+                    continue
+                if "_start" in activity:
+                    starts.append(i)
+                else:
+                    instances.append((starts.pop(), i))
+
+        # order of completion, like the scan of the alignment in get_tree_instances
+        return sorted(instances, key=lambda instance: instance[1])
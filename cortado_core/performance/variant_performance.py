@@ -1,27 +1,76 @@
 from collections import Counter
-from typing import List, Tuple, Dict, Any
+from dataclasses import dataclass
+from datetime import timedelta
+from multiprocessing.pool import Pool
+from typing import List, Tuple, Dict, Any, Iterator, Optional
 
-from cortado_core.performance.aggregators import stats
+import numpy as np
+
+from cortado_core.performance.aggregators import stats, stats_batch
 from cortado_core.utils.split_graph import (
     Group,
     LeafGroup,
+    LoopGroup,
     ParallelGroup,
     SequenceGroup,
 )
-from pm4py.objects.log.obj import EventLog, Trace
+from cortado_core.utils.parallel_utils import MIN_CHUNKS
+from pm4py.objects.log.obj import Event, EventLog, Trace
 from pm4py.objects.log.util.interval_lifecycle import to_interval
 from pm4py.objects.log.util.xes import (
     DEFAULT_START_TIMESTAMP_KEY,
     DEFAULT_TIMESTAMP_KEY,
 )
-from pm4py.util.xes_constants import DEFAULT_NAME_KEY
+from pm4py.util.xes_constants import (
+    DEFAULT_INSTANCE_KEY,
+    DEFAULT_NAME_KEY,
+    DEFAULT_TRANSITION_KEY,
+)
 
 DEFAULT_NAME_KEY_UNIQUE = DEFAULT_NAME_KEY + "_unique"
 
 
+ONE_MICROSECOND = timedelta(microseconds=1)
+# keys of an event that are kept in the encoding sent to worker processes
+ENCODED_EVENT_KEYS = (
+    DEFAULT_NAME_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TRANSITION_KEY,
+    DEFAULT_INSTANCE_KEY,
+)
+
+
+@dataclass
+class VariantEventIndex:
+    """
+    Start and complete timestamps of the events of the traces of a variant, one row per trace and one column per unique
+    activity name of the variant. Timestamps are given in microseconds relative to the first event, s.t. differences
+    are exact, and are NaN if a trace has no event for the unique activity name.
+    """
+
+    columns: Dict[str, int]
+    start: np.ndarray
+    complete: np.ndarray
+
+
 def assign_variants_performances(
     variants: Dict[int, Tuple[Group, List[Trace], List, Any]],
+    indexed: bool = False,
+    pool: Optional[Pool] = None,
 ):
+    """
+    Assigns service and wait times to the groups of all (not user defined) variants.
+    :param variants: variants with their traces
+    :param indexed: if True, the timestamps of a variant are collected once in a VariantEventIndex and the times of all
+    groups are computed from it, instead of collecting the events of each group from all traces
+    :param pool: if given, the performances of the variants are computed (indexed) in the worker processes of the
+    pool, from compact encodings of the variants and their traces. The statistics are then computed with stats_batch
+    """
+    if pool is not None:
+        assign_variants_performances_parallel(variants, pool)
+        return
+
     for variant, traces, _, info in variants.values():
         if info.is_user_defined:
             continue
@@ -30,8 +79,219 @@ def assign_variants_performances(
         v_unique = unique_names(variant)
 
         unique_activity_names(log)
-        assign_wait_time(variant, v_unique, log)
-        assign_variant_service_time(variant, v_unique, log)
+        if indexed:
+            event_index = build_variant_event_index(v_unique, log)
+            assign_performances_indexed(variant, v_unique, event_index)
+        else:
+            assign_wait_time(variant, v_unique, log)
+            assign_variant_service_time(variant, v_unique, log)
+
+
+def assign_variants_performances_parallel(
+    variants: Dict[int, Tuple[Group, List[Trace], List, Any]], pool: Pool
+):
+    variants_with_traces = [
+        (variant, traces)
+        for variant, traces, _, info in variants.values()
+        if not info.is_user_defined
+    ]
+    step_size = max(1, min(100, len(variants_with_traces) // MIN_CHUNKS))
+    chunks = [
+        variants_with_traces[i : i + step_size]
+        for i in range(0, len(variants_with_traces), step_size)
+    ]
+
+    res = pool.map(
+        calculate_encoded_variants_performances,
+        [
+            [
+                (encode_group(variant), encode_traces(traces))
+                for variant, traces in chunk
+            ]
+            for chunk in chunks
+        ],
+    )
+
+    # the performances are returned in preorder of the groups of each variant
+    for chunk, chunk_performances in zip(chunks, res):
+        for (variant, _), performances in zip(chunk, chunk_performances):
+            for group, performance in zip(get_groups_preorder(variant), performances):
+                group.performance.update(performance)
+
+
+def calculate_encoded_variants_performances(
+    encoded_variants: List[Tuple[tuple, List[List[tuple]]]],
+) -> List[List[dict]]:
+    """
+    Worker function of assign_variants_performances_parallel. Computes the performances of the groups of each variant
+    (in preorder) from the encodings of the variant and its traces. The statistics of all groups of a variant are
+    computed at once with stats_batch, i.e., they are python floats and may differ from stats by floating point
+    rounding.
+    """
+    results = []
+    for encoded_variant, encoded_traces in encoded_variants:
+        variant = decode_group(encoded_variant)
+        log = to_interval(decode_traces(encoded_traces))
+        v_unique = unique_names(variant)
+
+        unique_activity_names(log)
+        event_index = build_variant_event_index(v_unique, log)
+        group_durations = list(
+            get_group_durations_indexed(variant, v_unique, event_index)
+        )
+        group_stats = stats_batch(
+            [durations_to_seconds(durations) for _, _, durations in group_durations]
+        )
+        for (group, key, _), performance in zip(group_durations, group_stats):
+            group.performance[key] = performance
+        results.append([g.performance for g in get_groups_preorder(variant)])
+
+    return results
+
+
+def encode_group(group: Group) -> tuple:
+    """
+    Encodes a group as nested (group type, children, attributes) tuples, the attributes are passed as keyword arguments
+    to the constructor of the group type when decoding.
+    """
+    attributes = (("infix_type", group.infix_type), ("id", group.id))
+    if isinstance(group, LoopGroup):
+        attributes += (("min_count", group.min_count), ("max_count", group.max_count))
+
+    if isinstance(group, LeafGroup):
+        return type(group), tuple(group), attributes
+    return type(group), tuple(encode_group(g) for g in group), attributes
+
+
+def decode_group(encoded_group: tuple) -> Group:
+    group_type, children, attributes = encoded_group
+    if group_type == LeafGroup:
+        return LeafGroup(list(children), **dict(attributes))
+    return group_type([decode_group(g) for g in children], **dict(attributes))
+
+
+def get_groups_preorder(group: Group) -> List[Group]:
+    groups = [group]
+    for child in group:
+        if isinstance(child, Group):
+            groups += get_groups_preorder(child)
+
+    return groups
+
+
+def encode_traces(traces: List[Trace]) -> List[List[tuple]]:
+    return [
+        [tuple(e.get(key, None) for key in ENCODED_EVENT_KEYS) for e in t]
+        for t in traces
+    ]
+
+
+def decode_traces(encoded_traces: List[List[tuple]]) -> EventLog:
+    return EventLog(
+        [
+            Trace(
+                [
+                    Event(
+                        {
+                            key: value
+                            for key, value in zip(ENCODED_EVENT_KEYS, e)
+                            if value is not None
+                        }
+                    )
+                    for e in t
+                ]
+            )
+            for t in encoded_traces
+        ]
+    )
+
+
+def build_variant_event_index(
+    variant_unique: Group, traces: List[Trace]
+) -> VariantEventIndex:
+    columns = {a: i for i, a in enumerate(get_all_activities(variant_unique))}
+    start = np.full((len(traces), len(columns)), np.nan)
+    complete = np.full((len(traces), len(columns)), np.nan)
+
+    reference = None
+    for row, trace in enumerate(traces):
+        for e in trace:
+            column = columns.get(e[DEFAULT_NAME_KEY_UNIQUE], None)
+            if column is None:
+                continue
+            if reference is None:
+                reference = e[DEFAULT_TIMESTAMP_KEY]
+            start[row, column] = (
+                e.get(DEFAULT_START_TIMESTAMP_KEY, e[DEFAULT_TIMESTAMP_KEY]) - reference
+            ) // ONE_MICROSECOND
+            complete[row, column] = (
+                e[DEFAULT_TIMESTAMP_KEY] - reference
+            ) // ONE_MICROSECOND
+
+    return VariantEventIndex(columns, start, complete)
+
+
+def get_group_times_indexed(
+    variant_unique: Group, event_index: VariantEventIndex
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the start (earliest start) and end (latest completion) of the group per trace, NaN for traces without
+    events of the group.
+    """
+    columns = [
+        event_index.columns[a]
+        for a in get_all_activities(variant_unique)
+        if a in event_index.columns
+    ]
+    if len(columns) == 0:
+        empty = np.full(len(event_index.start), np.nan)
+        return empty, empty
+
+    # fmin/fmax ignore NaN
+    return (
+        np.fmin.reduce(event_index.start[:, columns], axis=1),
+        np.fmax.reduce(event_index.complete[:, columns], axis=1),
+    )
+
+
+def durations_to_seconds(durations: np.ndarray) -> List[float]:
+    # microseconds to seconds like timedelta.total_seconds, missing durations are skipped
+    return (durations[~np.isnan(durations)] / 10**6).tolist()
+
+
+def get_group_durations_indexed(
+    variant: Group, variant_unique: Group, event_index: VariantEventIndex
+) -> Iterator[Tuple[Group, str, np.ndarray]]:
+    """
+    Yields (group, performance key, durations) for the service and wait times of the groups of the variant, where
+    durations contains the duration per trace in microseconds (NaN for traces without the events of the group).
+    """
+    start, end = get_group_times_indexed(variant_unique, event_index)
+    yield variant, "service_time", end - start
+
+    if type(variant) == SequenceGroup:
+        times = [get_group_times_indexed(g, event_index) for g in variant_unique]
+        for i in range(variant_unique.list_length() - 1):
+            yield variant[i + 1], "wait_time", times[i + 1][0] - times[i][1]
+
+    if type(variant) == ParallelGroup:
+        for g, g_unique in zip(variant, variant_unique):
+            start_g, end_g = get_group_times_indexed(g_unique, event_index)
+            yield g, "wait_time_start", start_g - start
+            yield g, "wait_time_end", end - end_g
+
+    if type(variant) != LeafGroup:
+        for g, g_unique in zip(variant, variant_unique):
+            yield from get_group_durations_indexed(g, g_unique, event_index)
+
+
+def assign_performances_indexed(
+    variant: Group, variant_unique: Group, event_index: VariantEventIndex
+):
+    for group, key, durations in get_group_durations_indexed(
+        variant, variant_unique, event_index
+    ):
+        group.performance[key] = stats(durations_to_seconds(durations))
 
 
 def assign_variant_service_time(
@@ -174,6 +174,16 @@ def get_all_leaf_nodes(tree: ProcessTree, all_trees=None) -> List[ProcessTree]:
     return all_trees
 
 
+def set_preorder_ids_in_tree(pt: ProcessTree, current_index=0) -> int:
+    pt.id = current_index
+    current_index += 1
+
+    for child in pt.children:
+        current_index = set_preorder_ids_in_tree(child, current_index)
+
+    return current_index
+
+
 if __name__ == "__main__":
     pt_1 = pt_parse("-> (*(X(->('A','B'),->('C','D')),tau) ,->('E','F') )")
     pt_2 = pt_parse("-> (*(X(->('A','B'),->('C','D')),tau) ,->('E','F') )")
@@ -0,0 +1,311 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from cortado_core.subprocess_discovery.concurrency_trees.cTrees import (
+    ConcurrencyTree,
+    cTreeOperator,
+)
+from cortado_core.subprocess_discovery.subtree_mining.obj import (
+    FrequencyCountingStrategy,
+    FrequentActivitySets,
+)
+
+
+@dataclass
+class RelationOccurrences:
+    """
+    Occurrences of an activity relation as integer arrays, one entry per operator node of a tree that contains the
+    pair (pairs are counted once per node) or per leaf for the activities.
+    """
+
+    tree_indices: np.ndarray
+    codes: np.ndarray
+
+
+@dataclass
+class EncodedActivityRelations:
+    """
+    Activities, directly follows, eventually follows and concurrent pairs of a list of trees, encoded once. Activities
+    are encoded by their index in activities, pairs (a, b) by a * len(activities) + b.
+    """
+
+    activities: List[str]
+    activity_occurrences: RelationOccurrences
+    directly_follows_occurrences: RelationOccurrences
+    eventually_follows_occurrences: RelationOccurrences
+    concurrent_occurrences: RelationOccurrences
+
+
+@dataclass
+class _RelationOccurrenceLists:
+    tree_indices: List[int] = field(default_factory=list)
+    firsts: List[int] = field(default_factory=list)
+    seconds: List[int] = field(default_factory=list)
+
+    def add_pairs(self, tree_idx: int, pairs: Set[Tuple[int, int]]):
+        self.tree_indices += [tree_idx] * len(pairs)
+        for first, second in pairs:
+            self.firsts.append(first)
+            self.seconds.append(second)
+
+    def to_occurrences(self, n_activities: int) -> RelationOccurrences:
+        return RelationOccurrences(
+            np.array(self.tree_indices, dtype=np.int64),
+            np.array(self.firsts, dtype=np.int64) * n_activities
+            + np.array(self.seconds, dtype=np.int64),
+        )
+
+
+class ActivityRelationEncoder:
+    """
+    Encodes the activities, directly follows, eventually follows and concurrent pairs of trees that are added one
+    after another, e.g. for a growing set of variants. Activity codes are kept over all trees, the tree index of an
+    occurrence is the position in which its tree was added.
+    """
+
+    def __init__(self):
+        self.activity_codes: Dict[str, int] = dict()
+        self.n_trees = 0
+        self.activity_tree_indices: List[int] = []
+        self.activity_occurrences: List[int] = []
+        self.directly_follows = _RelationOccurrenceLists()
+        self.eventually_follows = _RelationOccurrenceLists()
+        self.concurrent = _RelationOccurrenceLists()
+
+    def add_tree(self, tree: ConcurrencyTree) -> int:
+        """
+        :return: index of the added tree
+        """
+        return self.encode_tree(tree)[0]
+
+    def encode_tree(self, tree: ConcurrencyTree) -> Tuple[int, Set[int], Set[int]]:
+        """
+        Like add_tree.
+        :return: index of the added tree, codes of its leftmost and rightmost activities
+        """
+        tree_idx = self.n_trees
+        _, left_activities, right_activities = self.__encode_node(tree_idx, tree)
+        self.n_trees += 1
+
+        return tree_idx, left_activities, right_activities
+
+    def get_encoded(self) -> EncodedActivityRelations:
+        n_activities = len(self.activity_codes)
+
+        return EncodedActivityRelations(
+            activities=list(self.activity_codes),
+            activity_occurrences=RelationOccurrences(
+                np.array(self.activity_tree_indices, dtype=np.int64),
+                np.array(self.activity_occurrences, dtype=np.int64),
+            ),
+            directly_follows_occurrences=self.directly_follows.to_occurrences(
+                n_activities
+            ),
+            eventually_follows_occurrences=self.eventually_follows.to_occurrences(
+                n_activities
+            ),
+            concurrent_occurrences=self.concurrent.to_occurrences(n_activities),
+        )
+
+    def __encode_node(self, tree_idx: int, tree: ConcurrencyTree):
+        """
+        :return: activities, leftmost and rightmost activities of the tree
+        """
+        activities = set()
+        left_activities = set()
+        right_activities = set()
+        directly_follows_pairs = set()
+        eventually_follows_pairs = set()
+        concurrent_pairs = set()
+        previous_right_activities = set()
+
+        for i, child in enumerate(tree.children):
+            if child.label:
+                code = self.activity_codes.setdefault(
+                    child.label, len(self.activity_codes)
+                )
+                self.activity_tree_indices.append(tree_idx)
+                self.activity_occurrences.append(code)
+                child_activities = child_left_activities = child_right_activities = {
+                    code
+                }
+            else:
+                (
+                    child_activities,
+                    child_left_activities,
+                    child_right_activities,
+                ) = self.__encode_node(tree_idx, child)
+
+            if tree.op == cTreeOperator.Sequential:
+                directly_follows_pairs.update(
+                    (a, b)
+                    for a in previous_right_activities
+                    for b in child_left_activities
+                )
+                eventually_follows_pairs.update(
+                    (a, b) for a in activities for b in child_activities
+                )
+
+                if i == 0:
+                    left_activities = child_left_activities
+
+                if i == len(tree.children) - 1:
+                    right_activities = child_right_activities
+
+            elif tree.op == cTreeOperator.Concurrent:
+                concurrent_pairs.update(
+                    pair
+                    for a in activities
+                    for b in child_activities
+                    for pair in ((a, b), (b, a))
+                )
+                left_activities = left_activities | child_left_activities
+                right_activities = right_activities | child_right_activities
+
+            activities = activities | child_activities
+            previous_right_activities = child_right_activities
+
+        self.directly_follows.add_pairs(tree_idx, directly_follows_pairs)
+        self.eventually_follows.add_pairs(tree_idx, eventually_follows_pairs)
+        self.concurrent.add_pairs(tree_idx, concurrent_pairs)
+
+        return activities, left_activities, right_activities
+
+
+def encode_activity_relations(
+    trees: Sequence[ConcurrencyTree],
+) -> EncodedActivityRelations:
+    encoder = ActivityRelationEncoder()
+    for tree in trees:
+        encoder.add_tree(tree)
+
+    return encoder.get_encoded()
+
+
+def count_activity_relations_in_tree(
+    tree: ConcurrencyTree,
+) -> Tuple[Counter, Counter, Counter, Counter, Set[str], Set[str]]:
+    """
+    Counts the relations of a single tree like ActivityRelationEncoder, i.e., pairs are counted once per operator node
+    that contains them and activities once per leaf.
+    :return: eventually follows, directly follows, activity and concurrent counters, rightmost and leftmost activities
+    """
+    encoder = ActivityRelationEncoder()
+    _, left_activities, right_activities = encoder.encode_tree(tree)
+    encoded = encoder.get_encoded()
+    activities = encoded.activities
+
+    def count_pairs(occurrences: RelationOccurrences) -> Counter:
+        firsts, seconds = np.divmod(occurrences.codes, len(activities))
+        return Counter(
+            (activities[first], activities[second])
+            for first, second in zip(firsts.tolist(), seconds.tolist())
+        )
+
+    return (
+        count_pairs(encoded.eventually_follows_occurrences),
+        count_pairs(encoded.directly_follows_occurrences),
+        Counter(
+            activities[code] for code in encoded.activity_occurrences.codes.tolist()
+        ),
+        count_pairs(encoded.concurrent_occurrences),
+        {activities[code] for code in right_activities},
+        {activities[code] for code in left_activities},
+    )
+
+
+def get_supports(
+    occurrences: RelationOccurrences,
+    n_traces: Sequence[int],
+    freq_strat: FrequencyCountingStrategy,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :param n_traces: number of traces per tree
+    :return: the codes that occur and their supports
+    """
+    n_traces = np.asarray(n_traces, dtype=np.int64)
+    tree_indices = occurrences.tree_indices
+    codes = occurrences.codes
+
+    if freq_strat in [
+        FrequencyCountingStrategy.TraceTransaction,
+        FrequencyCountingStrategy.VariantTransaction,
+    ]:
+        # each tree supports a code once
+        n_codes = int(codes.max()) + 1 if len(codes) > 0 else 1
+        tree_codes = np.unique(tree_indices * n_codes + codes)
+        tree_indices = tree_codes // n_codes
+        codes = tree_codes % n_codes
+
+    unique_codes, code_indices = np.unique(codes, return_inverse=True)
+
+    if freq_strat in [
+        FrequencyCountingStrategy.TraceTransaction,
+        FrequencyCountingStrategy.TraceOccurence,
+    ]:
+        supports = np.bincount(
+            code_indices, weights=n_traces[tree_indices], minlength=len(unique_codes)
+        )
+    else:
+        supports = np.bincount(code_indices, minlength=len(unique_codes))
+
+    return unique_codes, supports.astype(np.int64)
+
+
+def compute_frequent_activity_sets(
+    trees: Sequence[ConcurrencyTree],
+    n_traces: Sequence[int],
+    freq_strat: FrequencyCountingStrategy,
+    min_sup: int,
+) -> FrequentActivitySets:
+    """
+    Computes the activities and the directly follows, eventually follows and concurrent pairs with a support of at
+    least min_sup. Pairs are counted once per operator node that contains them, i.e., for the occurrence based
+    strategies, the support is the number of such nodes (weighted by the number of traces).
+    :param n_traces: number of traces per tree, only used by the trace based counting strategies
+    """
+    return get_frequent_activity_sets(
+        encode_activity_relations(trees), n_traces, freq_strat, min_sup
+    )
+
+
+def get_frequent_activity_sets(
+    encoded: EncodedActivityRelations,
+    n_traces: Sequence[int],
+    freq_strat: FrequencyCountingStrategy,
+    min_sup: int,
+) -> FrequentActivitySets:
+    """
+    Like compute_frequent_activity_sets for trees that are already encoded.
+    :param n_traces: number of traces per encoded tree, only used by the trace based counting strategies
+    """
+    n_traces = np.array(n_traces, dtype=np.int64)
+    activities = encoded.activities
+
+    def get_frequent_codes(occurrences: RelationOccurrences) -> np.ndarray:
+        codes, supports = get_supports(occurrences, n_traces, freq_strat)
+        return codes[supports >= min_sup]
+
+    def get_frequent_pairs(occurrences: RelationOccurrences, both_sides=False):
+        frequent_pairs = defaultdict(set)
+        firsts, seconds = np.divmod(get_frequent_codes(occurrences), len(activities))
+        for first, second in zip(firsts.tolist(), seconds.tolist()):
+            frequent_pairs[activities[first]].add(activities[second])
+
+            if both_sides:
+                frequent_pairs[activities[second]].add(activities[first])
+
+        return frequent_pairs
+
+    return FrequentActivitySets(
+        fA={
+            activities[code]
+            for code in get_frequent_codes(encoded.activity_occurrences).tolist()
+        },
+        dfR=get_frequent_pairs(encoded.directly_follows_occurrences),
+        efR=get_frequent_pairs(encoded.eventually_follows_occurrences),
+        ccR=get_frequent_pairs(encoded.concurrent_occurrences, both_sides=True),
+    )
@@ -0,0 +1,138 @@
+import unittest
+
+from cortado_core.eventually_follows_pattern_mining.frequency_counting.variant_occurrence_counting_strategy import (
+    VariantOccurrenceCountingStrategy,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.compact_occurrence_list import (
+    CompactFullOccurrenceList,
+    CompactRightmostOccurrenceList,
+    TreeNodeTable,
+    get_occurrence_lists_size_in_bytes,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.occurrence_statistic_tracker import (
+    MaxOccurrenceStatisticTracker,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.rightmost_occurence_store import (
+    RightmostOccurrenceStore,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.util import (
+    get_leaf_nodes_with_label,
+)
+from cortado_core.eventually_follows_pattern_mining.util.parse_pattern import (
+    parse_concurrency_tree,
+    parse_pattern,
+)
+from cortado_core.eventually_follows_pattern_mining.util.tree import (
+    get_first_ef_node_id_per_node_for_trees,
+)
+
+
+class TestCompactOccurrenceList(unittest.TestCase):
+    def assert_same_nodes(self, expected, actual):
+        self.assertEqual([id(n) for n in expected], [id(n) for n in actual])
+
+    def assert_same_rightmost_occurrences(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for (e_lmo, e_rmo, e_ro), (a_lmo, a_rmo, a_ro) in zip(expected, actual):
+            self.assertIs(e_lmo, a_lmo)
+            self.assertIs(e_rmo, a_rmo)
+            self.assert_same_nodes(e_ro, a_ro)
+
+    def test_rightmost_occurrence_list(self):
+        tree = parse_concurrency_tree("→('a',∧('a','b'),'b','a','b','c')")
+        a_nodes = get_leaf_nodes_with_label("a", tree)
+        b_nodes = get_leaf_nodes_with_label("b", tree)
+        c_node = get_leaf_nodes_with_label("c", tree)[0]
+        occurrences = [
+            (a, c_node, [a, b, c_node]) for a in a_nodes for b in b_nodes if a.id < b.id
+        ] + [(tree, tree, [tree])]
+
+        compact_occurrences = CompactRightmostOccurrenceList(
+            occurrences, TreeNodeTable(tree)
+        )
+
+        self.assert_same_rightmost_occurrences(occurrences, compact_occurrences)
+        self.assert_same_rightmost_occurrences(
+            occurrences[1:3], compact_occurrences[1:3]
+        )
+        self.assert_same_rightmost_occurrences(
+            [occurrences[-1]], [compact_occurrences[-1]]
+        )
+        with self.assertRaises(IndexError):
+            compact_occurrences[len(occurrences)]
+        # root occurrences with the same prefix share its entries
+        self.assertLess(
+            len(compact_occurrences.data),
+            3 * len(occurrences) + 2 * sum(len(ro) for _, _, ro in occurrences),
+        )
+
+    def test_full_occurrence_list(self):
+        tree = parse_concurrency_tree("→('a',∧('a','b'),'b')")
+        a_nodes = get_leaf_nodes_with_label("a", tree)
+        b_nodes = get_leaf_nodes_with_label("b", tree)
+        occurrences = [[a, b] for a in a_nodes for b in b_nodes] + [[tree]]
+
+        compact_occurrences = CompactFullOccurrenceList(
+            occurrences, TreeNodeTable(tree)
+        )
+
+        self.assertEqual(len(occurrences), len(compact_occurrences))
+        for expected, actual in zip(occurrences, compact_occurrences):
+            self.assert_same_nodes(expected, actual)
+        self.assert_same_nodes(occurrences[-1], compact_occurrences[-1])
+        self.assertEqual(2, len(compact_occurrences[1:3]))
+
+    def test_compact_store_matches_store(self):
+        tree = parse_concurrency_tree("→('a','a',∧('a',→('b','c')),'a','b')")
+        ef_dict = get_first_ef_node_id_per_node_for_trees([tree])
+
+        stores = []
+        trackers = []
+        for compact_occurrences in [False, True]:
+            pattern1 = parse_pattern("'a'")
+            pattern1.id = 0
+            pattern2 = parse_pattern("'b'")
+            pattern2.id = 1
+            pattern3 = parse_pattern("'a'...'b'")
+            pattern3.predecessor_pattern = pattern1
+            pattern3.id = 2
+            tracker = MaxOccurrenceStatisticTracker()
+            store = RightmostOccurrenceStore(
+                [tree],
+                VariantOccurrenceCountingStrategy(),
+                1,
+                ef_dict,
+                tracker,
+                compact_occurrences=compact_occurrences,
+            )
+            store.update_occurrence_lists([pattern1, pattern2])
+            store.set_frequent_1_patterns([pattern1, pattern2])
+            store.update_occurrence_lists([pattern3])
+            self.assertEqual(2, pattern3.support)
+            self.assertEqual(4, len(store.occurrence_lists[pattern3.id][0]))
+            stores.append(store)
+            trackers.append(tracker)
+
+        for pattern_id in [0, 1, 2]:
+            self.assert_same_rightmost_occurrences(
+                stores[0].occurrence_lists[pattern_id][0],
+                stores[1].occurrence_lists[pattern_id][0],
+            )
+        self.assertIsInstance(
+            stores[1].occurrence_lists[2][0], CompactRightmostOccurrenceList
+        )
+        self.assertLess(
+            get_occurrence_lists_size_in_bytes(stores[1].occurrence_lists),
+            get_occurrence_lists_size_in_bytes(stores[0].occurrence_lists),
+        )
+        self.assertEqual(
+            trackers[0].get_max_occurrence_size(), trackers[1].get_max_occurrence_size()
+        )
+        self.assertLess(
+            trackers[1].get_max_occurrence_size_in_bytes(),
+            trackers[0].get_max_occurrence_size_in_bytes(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.util import (
+    LabelOperatorIndex,
+    get_leaf_nodes_with_label,
+    get_nodes_with_operator,
+)
+from cortado_core.eventually_follows_pattern_mining.util.parse_pattern import (
+    parse_concurrency_tree,
+)
+from cortado_core.subprocess_discovery.concurrency_trees.cTrees import cTreeOperator
+
+
+class TestLabelOperatorIndex(unittest.TestCase):
+    def test_index_matches_tree_traversal(self):
+        trees = [
+            parse_concurrency_tree("→('a','a',∧('a','b'))"),
+            parse_concurrency_tree("∧('c',→('a',∧('b','a')))"),
+            parse_concurrency_tree("→('c','d')"),
+        ]
+        index = LabelOperatorIndex(trees)
+
+        for label in ["a", "b", "c", "d", "e"]:
+            expected = {
+                i: get_leaf_nodes_with_label(label, tree)
+                for i, tree in enumerate(trees)
+                if len(get_leaf_nodes_with_label(label, tree)) > 0
+            }
+            self.assertEqual(expected, index.get_nodes_with_label(label))
+        for operator in cTreeOperator:
+            expected = {
+                i: get_nodes_with_operator(operator, tree)
+                for i, tree in enumerate(trees)
+                if len(get_nodes_with_operator(operator, tree)) > 0
+            }
+            self.assertEqual(expected, index.get_nodes_with_operator(operator))
+
+        self.assertEqual([0, 1], list(index.get_nodes_with_label("a")))
+        self.assertEqual(3, len(index.get_nodes_with_label("a")[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
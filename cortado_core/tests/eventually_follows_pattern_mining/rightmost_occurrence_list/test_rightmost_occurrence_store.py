@@ -6,13 +6,22 @@ from cortado_core.eventually_follows_pattern_mining.frequency_counting.variant_t
 from cortado_core.eventually_follows_pattern_mining.occurrence_store.rightmost_occurence_store import (
     RightmostOccurrenceStore,
 )
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.util import (
+    join_eventually_follows_occurrences,
+    get_leaf_nodes_with_label,
+    get_nodes_with_operator,
+)
 from cortado_core.eventually_follows_pattern_mining.util.parse_pattern import (
     parse_concurrency_tree,
     parse_pattern,
 )
 from cortado_core.eventually_follows_pattern_mining.util.tree import (
     get_first_ef_node_id_per_node_for_trees,
+    get_left_check_node,
+    get_right_check_node,
+    is_eventually_follows_relation_with_ef_dict,
 )
+from cortado_core.subprocess_discovery.concurrency_trees.cTrees import cTreeOperator
 
 
 class TestRightmostOccurrenceStore(unittest.TestCase):
@@ -385,3 +394,48 @@ class TestRightmostOccurrenceStore(unittest.TestCase):
             store.occurrence_lists[pattern4.id][0][0][2][1],
         )
         self.assertEqual(1, len(store.occurrence_lists[pattern4.id][0]))
+
+    def test_eventually_follows_join_matches_pairwise_check(self):
+        tree = parse_concurrency_tree(
+            "→('a',∧('a','b'),'b','a',∧('b',→('a','b')),'a','b')"
+        )
+        ef_dict = get_first_ef_node_id_per_node_for_trees([tree])[0]
+        predecessor_nodes = get_nodes_with_operator(
+            cTreeOperator.Concurrent, tree
+        ) + get_leaf_nodes_with_label("a", tree)
+        predecessor_occurrences = [(n, n, [n]) for n in predecessor_nodes]
+        matching_occurrences = [
+            (n, n, [n]) for n in get_leaf_nodes_with_label("b", tree)
+        ]
+
+        for only_first_predecessor in [False, True]:
+            expected = []
+            for matching_occurrence in matching_occurrences:
+                for predecessor_occurrence in predecessor_occurrences:
+                    if is_eventually_follows_relation_with_ef_dict(
+                        get_left_check_node(predecessor_occurrence),
+                        get_right_check_node(matching_occurrence),
+                        ef_dict,
+                    ):
+                        expected.append(
+                            (
+                                predecessor_occurrence[0],
+                                matching_occurrence[1],
+                                predecessor_occurrence[2] + [matching_occurrence[1]],
+                            )
+                        )
+                        if only_first_predecessor:
+                            break
+
+            result = join_eventually_follows_occurrences(
+                predecessor_occurrences,
+                matching_occurrences,
+                ef_dict,
+                only_first_predecessor,
+            )
+            self.assertEqual(len(expected), len(result))
+            for (e_lmo, e_rmo, e_ro), (r_lmo, r_rmo, r_ro) in zip(expected, result):
+                self.assertIs(e_lmo, r_lmo)
+                self.assertIs(e_rmo, r_rmo)
+                self.assertEqual([id(n) for n in e_ro], [id(n) for n in r_ro])
+            self.assertGreater(len(result), 0)
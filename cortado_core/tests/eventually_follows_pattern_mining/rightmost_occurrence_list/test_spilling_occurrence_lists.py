@@ -0,0 +1,94 @@
+import unittest
+
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.compact_occurrence_list import (
+    CompactRightmostOccurrenceList,
+    TreeNodeTable,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.occurrence_statistic_tracker import (
+    MaxOccurrenceStatisticTracker,
+    OccurrenceStatisticTracker,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.spilling_occurrence_lists import (
+    SpillingOccurrenceLists,
+)
+from cortado_core.eventually_follows_pattern_mining.occurrence_store.util import (
+    get_leaf_nodes_with_label,
+)
+from cortado_core.eventually_follows_pattern_mining.util.parse_pattern import (
+    parse_concurrency_tree,
+)
+
+
+class TestSpillingOccurrenceLists(unittest.TestCase):
+    def test_trackers_without_spilling_statistics(self):
+        class SizeTracker(OccurrenceStatisticTracker):
+            def track_after_iteration(self, occurrence_list):
+                pass
+
+            def get_max_occurrence_size(self):
+                return 0
+
+        tracker = SizeTracker()
+        tracker.track_spill(10)
+        tracker.track_page_in(10)
+
+        self.assertEqual(-1, tracker.get_spilled_size_in_bytes())
+        self.assertEqual(-1, tracker.get_paged_in_size_in_bytes())
+        self.assertEqual(-1, tracker.get_max_occurrence_size_in_bytes())
+
+    def test_spill_and_page_in(self):
+        trees = [
+            parse_concurrency_tree("→('a',∧('a','b'),'b','c')"),
+            parse_concurrency_tree("→('b','a','c')"),
+        ]
+        tables = [TreeNodeTable(tree) for tree in trees]
+        tracker = MaxOccurrenceStatisticTracker()
+        occurrence_lists = SpillingOccurrenceLists(0, lambda i: tables[i], tracker)
+
+        expected = dict()
+        for pattern_id, label in enumerate(["a", "b", "c"]):
+            expected[pattern_id] = {
+                tree_idx: [
+                    (node, node, [node])
+                    for node in get_leaf_nodes_with_label(label, tree)
+                ]
+                for tree_idx, tree in enumerate(trees)
+            }
+            occurrence_lists[pattern_id] = {
+                tree_idx: CompactRightmostOccurrenceList(occs, tables[tree_idx])
+                for tree_idx, occs in expected[pattern_id].items()
+            }
+            occurrence_lists.seal(pattern_id)
+        occurrence_lists.pin(2)
+
+        # only the most recently used pattern is kept in memory
+        self.assertEqual([2], list(occurrence_lists.in_memory))
+        self.assertEqual({0, 1, 2}, set(occurrence_lists))
+        self.assertGreater(tracker.get_spilled_size_in_bytes(), 0)
+        self.assertEqual(0, tracker.get_paged_in_size_in_bytes())
+
+        for pattern_id in [0, 1, 0]:
+            for tree_idx, occs in expected[pattern_id].items():
+                self.assertEqual(
+                    [(lmo.id, rmo.id, [n.id for n in ro]) for lmo, rmo, ro in occs],
+                    [
+                        (lmo.id, rmo.id, [n.id for n in ro])
+                        for lmo, rmo, ro in occurrence_lists[pattern_id][tree_idx]
+                    ],
+                )
+        self.assertGreater(tracker.get_paged_in_size_in_bytes(), 0)
+        # pinned patterns are not spilled, paged in patterns are not written again
+        self.assertIn(2, occurrence_lists.in_memory)
+        self.assertEqual(
+            sum(n_bytes for _, n_bytes in occurrence_lists.on_disk.values()),
+            tracker.get_spilled_size_in_bytes(),
+        )
+
+        del occurrence_lists[1]
+        self.assertNotIn(1, occurrence_lists)
+        self.assertEqual(2, len(occurrence_lists))
+        occurrence_lists.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
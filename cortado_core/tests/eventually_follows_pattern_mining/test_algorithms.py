@@ -7,6 +7,9 @@ from cortado_core.eventually_follows_pattern_mining.algorithm import (
     generate_eventually_follows_patterns_from_groups,
     Algorithm,
 )
+from cortado_core.eventually_follows_pattern_mining.algorithm_incremental import (
+    IncrementalEventuallyFollowsPatternMiner,
+)
 from cortado_core.eventually_follows_pattern_mining.obj import EventuallyFollowsPattern
 from cortado_core.eventually_follows_pattern_mining.util.parse_pattern import (
     parse_concurrency_tree,
@@ -235,6 +238,138 @@ class TestAlgorithms(unittest.TestCase):
 
         self.__evaluate_for_algorithms(variants, expected_patterns)
 
+    def test_top_k(self):
+        variants = self.__get_variants_for_top_k_and_time_budget()
+        strategy = FrequencyCountingStrategy.VariantOccurence
+        all_patterns = generate_eventually_follows_patterns_from_groups(
+            variants, 1, strategy, Algorithm.RightmostExpansion
+        )
+        supports = sorted(
+            [p.support for pts in all_patterns.values() for p in pts], reverse=True
+        )
+
+        for k in [1, 3, 10, len(supports) + 1]:
+            kth_support = supports[min(k, len(supports)) - 1]
+            expected_pts = set(
+                p
+                for pts in all_patterns.values()
+                for p in pts
+                if p.support >= kth_support
+            )
+            for n_processes in [1, 2]:
+                found_patterns = generate_eventually_follows_patterns_from_groups(
+                    variants,
+                    1,
+                    strategy,
+                    Algorithm.RightmostExpansion,
+                    n_processes=n_processes,
+                    top_k=k,
+                )
+                self.__eval_patterns(expected_pts, found_patterns)
+
+    def test_time_budget(self):
+        variants = self.__get_variants_for_top_k_and_time_budget()
+        strategy = FrequencyCountingStrategy.TraceTransaction
+        all_patterns = generate_eventually_follows_patterns_from_groups(
+            variants, 1, strategy, Algorithm.RightmostExpansion
+        )
+
+        found_patterns = generate_eventually_follows_patterns_from_groups(
+            variants, 1, strategy, Algorithm.RightmostExpansion, time_budget=600
+        )
+        self.assertEqual(all_patterns.keys(), found_patterns.keys())
+        for k, pts in found_patterns.items():
+            self.__eval_patterns(all_patterns[k], {k: pts})
+
+        # only completed levels are returned
+        found_patterns = generate_eventually_follows_patterns_from_groups(
+            variants, 1, strategy, Algorithm.RightmostExpansion, time_budget=0
+        )
+        for k, pts in found_patterns.items():
+            self.__eval_patterns(all_patterns[k], {k: pts})
+
+    def __get_variants_for_top_k_and_time_budget(self):
+        v = parse_concurrency_tree(
+            "→(∧('a','b'),'c',∧('d',→('e','f')),'a','c')"
+        ).to_concurrency_group()
+        v2 = parse_concurrency_tree("→('a','c',∧('d','e'),'f')").to_concurrency_group()
+        v3 = parse_concurrency_tree("→('b','c','a','e')").to_concurrency_group()
+
+        return {
+            v: [Trace() for _ in range(4)],
+            v2: [Trace() for _ in range(2)],
+            v3: [Trace()],
+        }
+
+    def test_incremental_mining(self):
+        v, v2, v3 = self.__get_variants_for_top_k_and_time_budget().keys()
+        batches = [
+            {v: [Trace() for _ in range(2)]},
+            {v2: [Trace() for _ in range(2)], v: [Trace()]},
+            {v3: [Trace() for _ in range(3)], v: [Trace()]},
+        ]
+
+        for strategy in FrequencyCountingStrategy:
+            for min_support_counts in [[1, 1, 1], [2, 3, 4], [4, 2, 3]]:
+                miner = IncrementalEventuallyFollowsPatternMiner(
+                    min_support_counts[0], strategy
+                )
+                variants = dict()
+                for batch, min_support_count in zip(batches, min_support_counts):
+                    for group, traces in batch.items():
+                        variants[group] = variants.get(group, []) + traces
+
+                    found_patterns = miner.add_variants(batch, min_support_count)
+                    expected_patterns = (
+                        generate_eventually_follows_patterns_from_groups(
+                            variants,
+                            min_support_count,
+                            strategy,
+                            Algorithm.RightmostExpansion,
+                        )
+                    )
+                    self.__eval_patterns(
+                        set(p for pts in expected_patterns.values() for p in pts),
+                        found_patterns,
+                    )
+
+    def test_incremental_mining_prunes_untested_candidates(self):
+        variants = self.__get_variants_for_top_k_and_time_budget()
+        strategy = FrequencyCountingStrategy.TraceTransaction
+        miner = IncrementalEventuallyFollowsPatternMiner(1, strategy)
+        miner.add_variants(variants)
+        store = miner.occurrence_store
+        self.assertTrue(any(len(key) > 1 for key in store.tree_supports))
+
+        # no 1-pattern is frequent, i.e., only the 1-patterns are tested
+        miner.add_variants(dict(), 100)
+        # a 1-pattern is encoded as a single (label code, number of children) pair
+        self.assertTrue(
+            all(len(key) == 1 and len(key[0]) == 3 for key in store.tree_supports)
+        )
+        self.assertEqual(store.tree_supports.keys(), store.n_counted_trees.keys())
+
+        # pruned candidates are counted on all trees again
+        expected_patterns = generate_eventually_follows_patterns_from_groups(
+            variants, 1, strategy, Algorithm.RightmostExpansion
+        )
+        self.__eval_patterns(
+            set(p for pts in expected_patterns.values() for p in pts),
+            miner.add_variants(dict(), 1),
+        )
+
+    def test_multiple_processes_only_for_rightmost_expansion(self):
+        v = parse_concurrency_tree("→('a','b')").to_concurrency_group()
+
+        with self.assertRaises(ValueError):
+            generate_eventually_follows_patterns_from_groups(
+                {v: [Trace()]},
+                1,
+                FrequencyCountingStrategy.VariantTransaction,
+                Algorithm.InfixPatternCombinationEnumerationGraph,
+                n_processes=2,
+            )
+
     def __evaluate_for_algorithms(
         self,
         variants,
@@ -261,6 +396,30 @@ class TestAlgorithms(unittest.TestCase):
                 variants, min_support_count, strategy, Algorithm.RightmostExpansion
             )
             self.__eval_patterns(expected_pts, found_patterns)
+            found_patterns = generate_eventually_follows_patterns_from_groups(
+                variants,
+                min_support_count,
+                strategy,
+                Algorithm.RightmostExpansion,
+                compact_occurrences=True,
+            )
+            self.__eval_patterns(expected_pts, found_patterns)
+            found_patterns = generate_eventually_follows_patterns_from_groups(
+                variants,
+                min_support_count,
+                strategy,
+                Algorithm.RightmostExpansion,
+                n_processes=2,
+            )
+            self.__eval_patterns(expected_pts, found_patterns)
+            found_patterns = generate_eventually_follows_patterns_from_groups(
+                variants,
+                min_support_count,
+                strategy,
+                Algorithm.RightmostExpansion,
+                memory_budget=0,
+            )
+            self.__eval_patterns(expected_pts, found_patterns)
 
     def __eval_patterns(
         self,
@@ -0,0 +1,112 @@
+import pickle
+import unittest
+
+from cortado_core.eventually_follows_pattern_mining.candidate_enumeration.pruning_strategy.infix_sub_patterns_pruning_strategy import (
+    InfixSubPatternsPruningStrategy,
+)
+from cortado_core.eventually_follows_pattern_mining.obj import (
+    LEAF_CODE,
+    OPERATOR_CODES,
+    SubPattern,
+    get_encoded_labels,
+)
+from cortado_core.eventually_follows_pattern_mining.util.is_superpattern import (
+    enumerate_pattern,
+)
+from cortado_core.eventually_follows_pattern_mining.util.parse_pattern import (
+    parse_pattern,
+)
+from cortado_core.subprocess_discovery.concurrency_trees.cTrees import cTreeOperator
+
+PATTERNS = [
+    "'a'",
+    "'b'",
+    "'a'...'b'",
+    "'b'...'a'",
+    "→('a','b')",
+    "→('a')...'b'",
+    "∧('a','b')",
+    "∧('a',→('b','c'))",
+    "∧(→('a','b'),'c')",
+    "→('a',∧('b','c'))...'d'",
+    "→('a',∧('b','c'),'d')",
+    "→('a',∧('b'))...'c'...'d'",
+]
+
+
+class TestPatternEncoding(unittest.TestCase):
+    def test_equality_and_hash_match_string_representation(self):
+        patterns = [parse_pattern(p) for p in PATTERNS]
+        copies = [parse_pattern(p) for p in PATTERNS]
+
+        for pattern, pattern_copy in zip(patterns, copies):
+            self.assertEqual(pattern, pattern_copy)
+            self.assertEqual(hash(pattern), hash(pattern_copy))
+        self.assertEqual(len(PATTERNS), len(set(patterns)))
+        self.assertEqual(len(PATTERNS), len(set(p.get_encoding() for p in patterns)))
+        self.assertEqual(
+            [str(p) for p in sorted(patterns)], [str(p) for p in sorted(copies)]
+        )
+
+    def test_encoding_contains_labels(self):
+        pattern = parse_pattern("→('a','b')...'c'")
+
+        self.assertEqual(
+            (
+                (OPERATOR_CODES[cTreeOperator.Sequential], "", 2)
+                + (LEAF_CODE, "a", 0, LEAF_CODE, "b", 0),
+                (LEAF_CODE, "c", 0),
+            ),
+            pattern.get_encoding(),
+        )
+        self.assertEqual(["a", "b"], get_encoded_labels(pattern.get_encoding()[0]))
+
+    def test_encoding_is_pickled_without_hash(self):
+        pattern = parse_pattern("→('a',∧('b','c'))...'d'")
+        pattern.get_encoding()
+
+        unpickled_pattern = pickle.loads(pickle.dumps(pattern))
+
+        self.assertEqual(pattern.encoding, unpickled_pattern.encoding)
+        self.assertIsNone(unpickled_pattern.hash_value)
+        self.assertEqual(pattern, unpickled_pattern)
+        self.assertEqual(hash(pattern), hash(unpickled_pattern))
+
+    def test_encoding_reuses_predecessor(self):
+        predecessor = parse_pattern("→('a',∧('b','c'))...'d'")
+        predecessor.get_encoding()
+        pattern = predecessor.copy()
+        pattern.sub_patterns.append(SubPattern(label="e"))
+        pattern.predecessor_pattern = predecessor
+
+        self.assertEqual(
+            parse_pattern("→('a',∧('b','c'))...'d'...'e'").get_encoding(),
+            pattern.get_encoding(),
+        )
+
+    def test_encoding_of_removed_sub_pattern(self):
+        pattern = parse_pattern("→('a',∧('b','c'))...'d'...∧('e','f')")
+
+        for position, expected in enumerate(
+            ["'d'...∧('e','f')", "→('a',∧('b','c'))...∧('e','f')"]
+        ):
+            new_pattern, _ = InfixSubPatternsPruningStrategy.remove_sub_pattern(
+                pattern, position
+            )
+            self.assertEqual(
+                parse_pattern(expected).get_encoding(), new_pattern.encoding
+            )
+            new_pattern.invalidate_encoding()
+            self.assertEqual(parse_pattern(expected), new_pattern)
+
+    def test_enumerated_patterns_are_encoded_separately(self):
+        pattern = parse_pattern("→('a','b')...'c'")
+
+        encodings = [p.get_encoding() for p in enumerate_pattern(pattern, 0)]
+
+        self.assertEqual(len(encodings), len(set(encodings)))
+        self.assertEqual(pattern.get_encoding(), encodings[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
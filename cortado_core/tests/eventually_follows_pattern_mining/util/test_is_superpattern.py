@@ -5,6 +5,9 @@ from cortado_core.eventually_follows_pattern_mining.util.is_superpattern import
     enumerate_infix_pattern,
     enumerate_pattern,
     is_superpattern,
+    get_closed_and_maximal_patterns,
+    get_enumerated_pattern,
+    SuperpatternIndex,
 )
 from cortado_core.eventually_follows_pattern_mining.util.parse_pattern import (
     parse_pattern,
@@ -80,3 +83,72 @@ class TestIsSuperpattern(unittest.TestCase):
         ef_dict = get_first_ef_node_id_per_node_for_trees([super_pattern_tree])
 
         self.assertFalse(is_superpattern(super_pattern_tree, pattern, ef_dict))
+
+    def test_is_superpattern_with_enumerated_pattern(self):
+        pattern = parse_pattern("'a'...'b'...'a'")
+        enumerated_pattern = get_enumerated_pattern(pattern)
+
+        for super_pattern, expected in [
+            ("→('a','b')...'a'", False),
+            ("'a'...'b'...→('c','a')", True),
+            ("→('a','c','b')...'a'", True),
+        ]:
+            super_pattern_tree = get_ef_preserving_concurrency_tree(
+                parse_pattern(super_pattern)
+            )
+            ef_dict = get_first_ef_node_id_per_node_for_trees([super_pattern_tree])
+            self.assertEqual(
+                expected,
+                is_superpattern(
+                    super_pattern_tree, pattern, ef_dict, enumerated_pattern
+                ),
+            )
+
+    def test_superpattern_index_candidates(self):
+        patterns = [
+            parse_pattern(p)
+            for p in [
+                "'a'...'b'",
+                "→('a','b')",
+                "'b'...'a'",
+                "∧('a','b')",
+                "→('a','c','b')",
+                "'a'...'a'...'b'",
+                "'c'",
+            ]
+        ]
+        index = SuperpatternIndex(patterns)
+
+        self.assertEqual(
+            {patterns[0], patterns[1], patterns[4], patterns[5]},
+            set(index.get_patterns(index.get_superpattern_candidates(0))),
+        )
+        self.assertEqual(
+            {patterns[0], patterns[1], patterns[4], patterns[6]},
+            set(index.get_patterns(index.get_subpattern_candidates(4))),
+        )
+
+    def test_get_closed_and_maximal_patterns(self):
+        patterns = {
+            1: {self.__parse_pattern("'a'", 3), self.__parse_pattern("'b'", 2)},
+            2: {
+                self.__parse_pattern("'a'...'b'", 2),
+                self.__parse_pattern("→('a','c')", 3),
+            },
+            3: {self.__parse_pattern("→('a','c')...'b'", 1)},
+        }
+
+        closed, maximal = get_closed_and_maximal_patterns(patterns)
+
+        self.assertEqual(
+            {parse_pattern(p) for p in ["'a'...'b'", "→('a','c')", "→('a','c')...'b'"]},
+            closed,
+        )
+        self.assertEqual({parse_pattern("→('a','c')...'b'")}, maximal)
+
+    @staticmethod
+    def __parse_pattern(pattern: str, support: int):
+        pattern = parse_pattern(pattern)
+        pattern.support = support
+
+        return pattern
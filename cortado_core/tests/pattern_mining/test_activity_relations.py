@@ -0,0 +1,119 @@
+import unittest
+
+from cortado_core.eventually_follows_pattern_mining.util.parse_pattern import (
+    parse_concurrency_tree,
+)
+from cortado_core.subprocess_discovery.subtree_mining.activity_relations import (
+    ActivityRelationEncoder,
+    compute_frequent_activity_sets,
+    count_activity_relations_in_tree,
+    encode_activity_relations,
+    get_supports,
+)
+from cortado_core.subprocess_discovery.subtree_mining.obj import (
+    FrequencyCountingStrategy,
+)
+
+TREES = [
+    parse_concurrency_tree("→('a',∧('b','c'),'a','b')"),
+    parse_concurrency_tree("→('a','b')"),
+]
+N_TRACES = [3, 1]
+
+
+class TestActivityRelations(unittest.TestCase):
+    def test_encode_activity_relations(self):
+        encoded = encode_activity_relations(TREES)
+
+        self.assertEqual(["a", "b", "c"], encoded.activities)
+        self.assertEqual(
+            [0, 0, 0, 0, 0, 1, 1], encoded.activity_occurrences.tree_indices.tolist()
+        )
+        self.assertEqual(
+            {(0, 1), (0, 2), (1, 0), (2, 0)},
+            self.__decode_pairs(encoded, encoded.directly_follows_occurrences, 0),
+        )
+        self.assertEqual(
+            {(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (2, 0), (2, 1)},
+            self.__decode_pairs(encoded, encoded.eventually_follows_occurrences, 0),
+        )
+        self.assertEqual(
+            {(1, 2), (2, 1)},
+            self.__decode_pairs(encoded, encoded.concurrent_occurrences, 0),
+        )
+
+    def test_activity_relation_encoder_keeps_codes_of_added_trees(self):
+        encoder = ActivityRelationEncoder()
+        self.assertEqual(0, encoder.add_tree(TREES[1]))
+        self.assertEqual(1, encoder.add_tree(TREES[0]))
+        encoded = encoder.get_encoded()
+
+        self.assertEqual(["a", "b", "c"], encoded.activities)
+        self.assertEqual(
+            {(0, 1)},
+            self.__decode_pairs(encoded, encoded.directly_follows_occurrences, 0),
+        )
+        self.assertEqual(
+            {(1, 2), (2, 1)},
+            self.__decode_pairs(encoded, encoded.concurrent_occurrences, 1),
+        )
+
+    def test_count_activity_relations_in_tree(self):
+        ef, df, act, con, right, left = count_activity_relations_in_tree(TREES[0])
+
+        self.assertEqual({"a": 2, "b": 2, "c": 1}, act)
+        self.assertEqual(
+            {("a", "b"): 1, ("a", "c"): 1, ("b", "a"): 1, ("c", "a"): 1}, df
+        )
+        self.assertEqual(1, ef[("a", "a")])
+        self.assertEqual({("b", "c"): 1, ("c", "b"): 1}, con)
+        self.assertEqual({"b"}, right)
+        self.assertEqual({"a"}, left)
+
+    def test_get_supports(self):
+        encoded = encode_activity_relations(TREES)
+        expected_activity_supports = {
+            FrequencyCountingStrategy.TraceTransaction: [4, 4, 3],
+            FrequencyCountingStrategy.TraceOccurence: [7, 7, 3],
+            FrequencyCountingStrategy.VariantTransaction: [2, 2, 1],
+            FrequencyCountingStrategy.VariantOccurence: [3, 3, 1],
+        }
+
+        for strategy, expected_supports in expected_activity_supports.items():
+            codes, supports = get_supports(
+                encoded.activity_occurrences, N_TRACES, strategy
+            )
+            self.assertEqual([0, 1, 2], codes.tolist())
+            self.assertEqual(expected_supports, supports.tolist())
+
+    def test_compute_frequent_activity_sets(self):
+        frequent_activity_sets = compute_frequent_activity_sets(
+            TREES, N_TRACES, FrequencyCountingStrategy.TraceTransaction, 4
+        )
+
+        self.assertEqual({"a", "b"}, frequent_activity_sets.fA)
+        self.assertEqual({"a": {"b"}}, frequent_activity_sets.dfR)
+        self.assertEqual({"a": {"b"}}, frequent_activity_sets.efR)
+        self.assertEqual({}, frequent_activity_sets.ccR)
+
+        frequent_activity_sets = compute_frequent_activity_sets(
+            TREES, N_TRACES, FrequencyCountingStrategy.TraceTransaction, 3
+        )
+
+        self.assertEqual({"b": {"c"}, "c": {"b"}}, frequent_activity_sets.ccR)
+
+    @staticmethod
+    def __decode_pairs(encoded, occurrences, tree_idx):
+        n_activities = len(encoded.activities)
+
+        return {
+            divmod(code, n_activities)
+            for code, idx in zip(
+                occurrences.codes.tolist(), occurrences.tree_indices.tolist()
+            )
+            if idx == tree_idx
+        }
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import random
+import unittest
+
+
+from cortado_core.performance.accumulators import QuantileSketch, StatsAccumulator
+from cortado_core.performance.aggregators import stats
+
+
+class TestAccumulators(unittest.TestCase):
+    def test_quantile_sketch_relative_accuracy(self):
+        rng = random.Random(0)
+        values = [rng.expovariate(1 / 3600) for _ in range(5000)] + [0, 0, -5, -20]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+
+        values = sorted(values)
+        for q in [0, 0.01, 0.25, 0.5, 0.95, 0.99, 1]:
+            exact = values[int(q * (len(values) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(q) - exact), 0.01 * abs(exact))
+
+    def test_merged_sketch_equals_sketch_of_all_values(self):
+        rng = random.Random(1)
+        values = [rng.uniform(0, 1000) for _ in range(1000)]
+        sketch, first, second = (QuantileSketch() for _ in range(3))
+        for i, v in enumerate(values):
+            sketch.add(v)
+            (first if i % 3 else second).add(v)
+        first.merge(second)
+
+        self.assertEqual(sketch.positive, first.positive)
+        self.assertEqual(sketch.count, first.count)
+        self.assertEqual(sketch.quantile(0.5), first.quantile(0.5))
+
+    def test_stats_accumulator(self):
+        rng = random.Random(2)
+        values = [rng.uniform(0, 100) for _ in range(501)] + [None, None]
+        expected = stats(values)
+
+        accumulator = StatsAccumulator()
+        partition = StatsAccumulator()
+        for i, v in enumerate(values):
+            (accumulator if i < 200 else partition).add(v)
+        accumulator.merge(partition)
+        result = accumulator.to_stats()
+
+        for key in ["n", "n_not_none", "min", "max"]:
+            self.assertEqual(expected[key], result[key])
+        for key in ["mean", "stdev", "percentage_variance"]:
+            self.assertAlmostEqual(expected[key], result[key])
+        for key in ["median", "50th"]:
+            self.assertLessEqual(
+                abs(expected[key] - result[key]), 0.01 * abs(expected[key])
+            )
+
+    def test_stats_accumulator_without_values(self):
+        accumulator = StatsAccumulator()
+        accumulator.add(None)
+
+        self.assertIsNone(accumulator.to_stats())
+        self.assertEqual(stats([None]), accumulator.to_stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from cortado_core.performance.aggregators import (
+    stat_stats,
+    stats,
+    stats_batch,
+    stats_vectorized,
+)
+
+
+class TestAggregators(unittest.TestCase):
+    def assertStatsAlmostEqual(self, expected, actual):
+        if expected is None:
+            self.assertIsNone(actual)
+            return
+
+        self.assertEqual(expected.keys(), actual.keys())
+        for key, value in expected.items():
+            self.assertAlmostEqual(value, actual[key], places=6, msg=key)
+
+    def test_stats_vectorized(self):
+        for values in [
+            [3],
+            [4, None, 1, 7, 2],
+            [1.5, 2.5, None, None],
+            [-2, 2],
+            [5, 5, 5, 5, 9, 12.25, 0, 3],
+            [None],
+            [],
+            None,
+        ]:
+            self.assertStatsAlmostEqual(stats(values), stats_vectorized(values))
+
+    def test_stats_batch(self):
+        value_groups = [[1, 2, 3, 4], None, [None, None], [10], [0.5, None, 8, 2]]
+        results = stats_batch(value_groups)
+
+        self.assertEqual(len(value_groups), len(results))
+        for values, result in zip(value_groups, results):
+            self.assertStatsAlmostEqual(stats(values), result)
+
+    def test_stats_batch_groups_of_different_sizes(self):
+        value_groups = [
+            list(range(1000)),
+            [2],
+            [],
+            [None, 3, 1],
+            list(range(50, 0, -1)),
+        ]
+        results = stats_batch(value_groups)
+
+        for values, result in zip(value_groups, results):
+            self.assertStatsAlmostEqual(stats(values), result)
+        self.assertIsInstance(results[1]["min"], float)
+
+    def test_stat_stats(self):
+        stats_list = [stats([1, 2, 3]), stats([4]), stats([2, 8, None])]
+        result = stat_stats(stats_list)
+
+        self.assertEqual(stats_list[0].keys(), result.keys())
+        for key in result:
+            values = [s[key] for s in stats_list if key in s]
+            self.assertEqual(stats(values), result[key])
+        # the types of stats are kept, e.g., ints for the counts and minimum
+        self.assertIsInstance(result["n"]["min"], int)
+
+
+if __name__ == "__main__":
+    unittest.main()
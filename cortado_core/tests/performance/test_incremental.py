@@ -0,0 +1,181 @@
+import unittest
+from datetime import datetime, timedelta
+
+from pm4py.objects.log.obj import EventLog, Trace
+from pm4py.util.xes_constants import (
+    DEFAULT_NAME_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+    DEFAULT_TRANSITION_KEY,
+)
+
+from cortado_core.performance import tree_performance
+from cortado_core.performance.aggregators import avg, stats
+from cortado_core.performance.incremental import (
+    SubvariantPerformanceAccumulator,
+    TreePerformanceAccumulator,
+    VariantPerformanceAccumulator,
+)
+from cortado_core.performance.subvariant_performance import (
+    calculate_subvariant_performance,
+)
+from cortado_core.performance.tree_performance import apply_aggregation
+from cortado_core.performance.variant_performance import (
+    assign_variants_performances,
+    get_groups_preorder,
+)
+from cortado_core.utils.cvariants import get_detailed_variants
+from cortado_core.utils.process_tree import index_leaf_labels
+from cortado_core.utils.timestamp_utils import TimeUnit
+from .test_utils import create_test_tree, set_parent, timestamp
+from .test_variant_performance import create_log, get_variants
+
+
+def create_lifecycle_trace(i: int) -> Trace:
+    events = [
+        ("C", 0, "start"),
+        ("D", 1 + i % 4, "start"),
+        ("C", 2 + i % 5, "complete"),
+        ("D", 8, "complete"),
+        ("A", 9 + i % 3, "start"),
+        ("A", 12 + i, "complete"),
+        ("E", 40, "start"),
+        ("E", 41 + i % 7, "complete"),
+    ]
+    if i % 3 == 0:
+        # second variant, E is executed before A
+        events = events[:4] + events[6:] + events[4:6]
+        events = [(n, t if n != "A" else t + 40, tr) for n, t, tr in events]
+
+    return Trace(
+        [
+            {
+                DEFAULT_NAME_KEY: name,
+                DEFAULT_TIMESTAMP_KEY: timestamp(t),
+                DEFAULT_TRANSITION_KEY: transition,
+            }
+            for name, t, transition in events
+        ]
+    )
+
+
+class TestIncremental(unittest.TestCase):
+    def assertStatsClose(self, expected, actual):
+        if expected is None:
+            self.assertIsNone(actual)
+            return
+
+        for key in ["n", "n_not_none", "min", "max"]:
+            self.assertEqual(expected[key], actual[key], key)
+        for key in ["mean", "stdev"]:
+            self.assertAlmostEqual(expected[key], actual[key], msg=key)
+        self.assertLessEqual(
+            abs(expected["median"] - actual["median"]), 0.01 * abs(expected["median"])
+        )
+
+    def test_variant_accumulator(self):
+        variants = get_variants(create_log())
+        assign_variants_performances(variants)
+
+        for variant, traces, _, _ in get_variants(create_log()).values():
+            accumulator = VariantPerformanceAccumulator(variant)
+            accumulator.add_traces(traces[: len(traces) // 2])
+            partition = VariantPerformanceAccumulator(variant)
+            partition.add_traces(traces[len(traces) // 2 :])
+            accumulator.merge(partition)
+            accumulator.assign()
+
+            expected_variant = next(
+                v for v, _, _, _ in variants.values() if v == variant
+            )
+            for expected_group, group in zip(
+                get_groups_preorder(expected_variant), get_groups_preorder(variant)
+            ):
+                self.assertEqual(
+                    expected_group.performance.keys(), group.performance.keys()
+                )
+                for key, expected in expected_group.performance.items():
+                    self.assertStatsClose(expected, group.performance[key])
+
+    def test_subvariant_accumulator(self):
+        traces = []
+        for i in range(10):
+            events = []
+            for j, activity in enumerate(["a", "b", "a"]):
+                start = datetime(2020, 1, 1) + timedelta(hours=2 * j, seconds=i * j)
+                event_start = {
+                    DEFAULT_NAME_KEY: activity,
+                    DEFAULT_TIMESTAMP_KEY: start,
+                    DEFAULT_TRANSITION_KEY: "start",
+                }
+                event_complete = {
+                    DEFAULT_NAME_KEY: activity,
+                    DEFAULT_TIMESTAMP_KEY: start + timedelta(hours=1, seconds=i),
+                    DEFAULT_TRANSITION_KEY: "complete",
+                }
+                events += [event_start, event_complete]
+            traces.append(Trace(events))
+
+        ((subvariant, sub_traces),) = get_detailed_variants(traces).items()
+        expected = calculate_subvariant_performance(
+            subvariant, sub_traces, TimeUnit.SEC
+        )
+        expected_service_times = [
+            [n.performance_stats for n in nodes] for nodes in expected.subvariant
+        ]
+
+        ((subvariant, sub_traces),) = get_detailed_variants(traces).items()
+        accumulator = SubvariantPerformanceAccumulator(subvariant, TimeUnit.SEC)
+        partition = SubvariantPerformanceAccumulator(subvariant, TimeUnit.SEC)
+        accumulator.add_traces(sub_traces[:3])
+        partition.add_traces(sub_traces[3:])
+        accumulator.merge(partition)
+        result = accumulator.to_subvariant_performance()
+
+        for expected_nodes, nodes in zip(expected_service_times, result.subvariant):
+            for expected_stats, node in zip(expected_nodes, nodes):
+                self.assertStatsClose(expected_stats, node.performance_stats)
+        self.assertEqual(expected.waiting_time_events, result.waiting_time_events)
+        for expected_event, event in zip(
+            expected.waiting_time_events, result.waiting_time_events
+        ):
+            self.assertStatsClose(
+                expected_event.performance_stats, event.performance_stats
+            )
+        # durations of the traces themselves
+        self.assertEqual(10, result.global_performance_stats["n"])
+        self.assertEqual(5 * 3600, result.global_performance_stats["min"])
+
+    def test_tree_accumulator(self):
+        tree = index_leaf_labels(create_test_tree()[0])
+        set_parent(tree)
+        traces = [create_lifecycle_trace(i) for i in range(21)]
+
+        performances, expected_fitness = (
+            tree_performance.get_tree_performance_intervals(tree, EventLog(traces))
+        )
+
+        accumulator = TreePerformanceAccumulator(tree)
+        # traces 0, 3, 6, ... belong to the second variant
+        accumulator.add_traces(EventLog(traces[1:3]))
+        self.assertEqual(1, len(accumulator.alignment_cache))
+        accumulator.add_traces(EventLog(traces[3:10]))
+        self.assertEqual(2, len(accumulator.alignment_cache))
+
+        # partition computed on a copy of the tree
+        tree_copy = index_leaf_labels(create_test_tree()[0])
+        set_parent(tree_copy)
+        partition = TreePerformanceAccumulator(tree_copy)
+        partition.add_traces(EventLog(traces[:1] + traces[10:]))
+        accumulator.merge(partition)
+
+        result, fitness = accumulator.to_stats()
+        self.assertAlmostEqual(expected_fitness, fitness)
+        for values, node_stats in zip(performances, result):
+            expected = apply_aggregation(values, stats, avg, avg)
+            self.assertEqual(expected.keys(), node_stats.keys())
+            for t in expected:
+                self.assertStatsClose(expected[t], node_stats[t])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,23 @@
 import unittest
+from multiprocessing import Pool
 
+from cortado_core.performance import tree_performance
+from cortado_core.performance.aggregators import avg, stats
+from cortado_core.performance.alignment_cache import (
+    LifecycleAlignmentCache,
+    get_tree_fingerprint,
+)
+from cortado_core.performance.tree_performance import apply_aggregation
+from cortado_core.performance.utils import (
+    AlignmentIndex,
+    get_alignment_tree_nodes,
+    get_all_indices,
+    get_all_nodes,
+    get_tree_instances,
+)
 from cortado_core.utils.process_tree import index_leaf_labels
 from pm4py.objects.log.obj import EventLog, Trace
+from pm4py.objects.process_tree.obj import Operator
 from pm4py.util.xes_constants import (
     DEFAULT_NAME_KEY,
     DEFAULT_TIMESTAMP_KEY,
@@ -9,6 +25,11 @@ from pm4py.util.xes_constants import (
 )
 from .test_utils import set_parent, timestamp, create_test_tree, PerformanceHelpers
 
+
+def get_preorder_nodes(tree):
+    return [tree] + [n for c in tree.children for n in get_preorder_nodes(c)]
+
+
 T0, T11, T12, T21, T22, T23, T24, T31, T32, T41, T42, T43, T44 = create_test_tree()
 T0 = index_leaf_labels(T0)
 set_parent(T0)
@@ -313,6 +334,210 @@ class TestPerformance(unittest.TestCase):
 
         assert all_waiting_times[T0][0][0] == [[0, 0]]
 
+    def test_traces_of_same_variant(self):
+        def create_trace(a, b1, e, b2):
+            events = [
+                ("A", a[0], "start"),
+                ("A", a[1], "complete"),
+                ("B", b1[0], "start"),
+                ("B", b1[1], "complete"),
+                ("E", e[0], "start"),
+                ("E", e[1], "complete"),
+                ("B", b2[0], "start"),
+                ("B", b2[1], "complete"),
+            ]
+            return Trace(
+                sorted(
+                    [
+                        {
+                            DEFAULT_NAME_KEY: name,
+                            DEFAULT_TIMESTAMP_KEY: timestamp(t),
+                            DEFAULT_TRANSITION_KEY: transition,
+                        }
+                        for name, t, transition in events
+                    ],
+                    key=lambda x: x[DEFAULT_TIMESTAMP_KEY],
+                )
+            )
+
+        # same event order, i.e., same variant and alignment, but different timestamps
+        event_log = EventLog(
+            [
+                create_trace((0, 2), (3, 5), (6, 8), (7, 10)),
+                create_trace((0, 1), (2, 4), (5, 9), (6, 12)),
+            ]
+        )
+        (
+            all_service_times,
+            all_idle_times,
+            all_waiting_times,
+            all_cycle_times,
+        ) = PerformanceHelpers.test_performance(event_log, T0)
+
+        assert all_service_times[T12] == [[[[[6, 10]]]], [[[[5, 12]]]]]
+        assert all_idle_times[T12] == [[[[]]], [[[]]]]
+        assert all_cycle_times[T12] == [[[[5, 10]]], [[[4, 12]]]]
+        assert all_waiting_times[T12] == [[[[5, 6]]], [[[4, 5]]]]
+
+        assert all_service_times[T41] == [[[[[0, 2]]]], [[[[0, 1]]]]]
+        assert all_waiting_times[T42] == [[[[2, 3]]], [[[1, 2]]]]
+
+    def test_alignment_index(self):
+        trace = Trace(
+            [
+                {
+                    DEFAULT_NAME_KEY: name,
+                    DEFAULT_TIMESTAMP_KEY: timestamp(i),
+                    DEFAULT_TRANSITION_KEY: transition,
+                }
+                for i, (name, transition) in enumerate(
+                    [
+                        ("C", "start"),
+                        ("D", "start"),
+                        ("C", "complete"),
+                        ("D", "complete"),
+                        ("A", "start"),
+                        ("A", "complete"),
+                        ("E", "start"),
+                        ("E", "complete"),
+                    ]
+                )
+            ]
+        )
+        log = tree_performance.to_low_level_log(EventLog([trace]))
+        alignments, _, _ = tree_performance.get_all_alignments(T0, log)
+        alignment = list(alignments.values())[0][0]
+
+        index = AlignmentIndex(alignment)
+        alignment_tree_nodes = get_alignment_tree_nodes(alignment)
+        for node in [None, *get_all_nodes(T0)]:
+            self.assertEqual(
+                get_all_indices(alignment_tree_nodes, node), index.get_indices(node)
+            )
+
+        child_nodes = get_all_nodes(T11) - {T11}
+        start, end = index.get_indices(T11)
+        self.assertEqual(
+            [
+                (start + i, start + j)
+                for i, j in get_tree_instances(alignment[start:end], nodes=child_nodes)
+            ],
+            index.get_tree_instances(
+                index.get_contained_nodes(child_nodes), start, end
+            ),
+        )
+
+    def test_alignments_in_pool_and_cache(self):
+        trace = Trace(
+            [
+                {
+                    DEFAULT_NAME_KEY: name,
+                    DEFAULT_TIMESTAMP_KEY: timestamp(i),
+                    DEFAULT_TRANSITION_KEY: transition,
+                }
+                for i, (name, transition) in enumerate(
+                    [
+                        ("A", "start"),
+                        ("A", "complete"),
+                        ("B", "start"),
+                        ("B", "complete"),
+                        ("E", "start"),
+                        ("B", "start"),
+                        ("E", "complete"),
+                        ("B", "complete"),
+                    ]
+                )
+            ]
+        )
+        event_log = EventLog([trace, trace])
+        expected, _ = tree_performance.get_tree_performance_intervals(T0, event_log)
+
+        cache = LifecycleAlignmentCache()
+        with Pool(2) as pool:
+            performances, _ = tree_performance.get_tree_performance_intervals(
+                T0, event_log, pool=pool, alignment_cache=cache
+            )
+        self.assertEqual(expected, performances)
+        self.assertEqual(1, len(cache))
+
+        # a structurally equal tree reuses the cached alignments
+        tree = index_leaf_labels(create_test_tree()[0])
+        set_parent(tree)
+        performances, _ = tree_performance.get_tree_performance_intervals(
+            tree, event_log, alignment_cache=cache
+        )
+        self.assertEqual(1, len(cache))
+        for node, expected_node in zip(
+            get_preorder_nodes(tree), get_preorder_nodes(T0)
+        ):
+            for values, expected_values in zip(performances, expected):
+                self.assertEqual(expected_values[expected_node], values[node])
+
+        # other alignment parameters are not served from the cache
+        tree_performance.get_tree_performance_intervals(
+            tree, event_log, alignment_time_limit=10, alignment_cache=cache
+        )
+        self.assertEqual(2, len(cache))
+
+        # the alignments of the previous tree are dropped once another tree is aligned
+        other_tree = index_leaf_labels(create_test_tree()[0])
+        other_tree.children[1].operator = Operator.SEQUENCE
+        set_parent(other_tree)
+        tree_performance.get_tree_performance_intervals(
+            other_tree, event_log, alignment_cache=cache
+        )
+        self.assertEqual(1, len(cache))
+        self.assertEqual(
+            [get_tree_fingerprint(other_tree)], list(cache.alignments.keys())
+        )
+
+    def test_streaming_aggregation(self):
+        traces = []
+        for i in range(21):
+            events = [
+                ("C", 0, "start"),
+                ("D", 1 + i % 4, "start"),
+                ("C", 2 + i % 5, "complete"),
+                ("D", 8, "complete"),
+                ("A", 9 + i % 3, "start"),
+                ("A", 12 + i, "complete"),
+                ("E", 40, "start"),
+                ("E", 41 + i % 7, "complete"),
+            ]
+            traces.append(
+                Trace(
+                    [
+                        {
+                            DEFAULT_NAME_KEY: name,
+                            DEFAULT_TIMESTAMP_KEY: timestamp(t),
+                            DEFAULT_TRANSITION_KEY: transition,
+                        }
+                        for name, t, transition in events
+                    ]
+                )
+            )
+        event_log = EventLog(traces)
+
+        performances, _ = tree_performance.get_tree_performance_intervals(T0, event_log)
+        accumulators, _ = tree_performance.get_tree_performance_streaming(T0, event_log)
+
+        for values, node_accumulators in zip(performances, accumulators):
+            expected = apply_aggregation(values, stats, avg, avg)
+            result = tree_performance.to_stats(node_accumulators)
+            self.assertEqual(expected.keys(), result.keys())
+            for t in expected:
+                if expected[t] is None:
+                    self.assertIsNone(result[t])
+                    continue
+                for key in ["n", "n_not_none", "min", "max"]:
+                    self.assertEqual(expected[t][key], result[t][key])
+                for key in ["mean", "stdev"]:
+                    self.assertAlmostEqual(expected[t][key], result[t][key])
+                self.assertLessEqual(
+                    abs(expected[t]["median"] - result[t]["median"]),
+                    0.01 * abs(expected[t]["median"]),
+                )
+
     @unittest.skip("a start full search not merged yet")
     def test_with_deviation_2(self):
         log = [
@@ -0,0 +1,121 @@
+import statistics
+import unittest
+from collections import Counter
+
+from pm4py.objects.log.obj import EventLog, Trace
+from pm4py.util.xes_constants import DEFAULT_NAME_KEY, DEFAULT_TIMESTAMP_KEY
+
+from cortado_core.performance import tree_performance
+from cortado_core.performance.aggregators import (
+    avg,
+    stats,
+    stats_with_confidence_intervals,
+)
+from cortado_core.performance.sampling import (
+    filter_log_by_time_window,
+    get_lifecycle_variant,
+    sample_log_by_variant,
+)
+from cortado_core.performance.tree_performance import apply_aggregation
+from cortado_core.utils.process_tree import index_leaf_labels
+from .test_incremental import create_lifecycle_trace
+from .test_utils import create_test_tree, set_parent, timestamp
+
+
+def create_trace(activities, start: int = 0) -> Trace:
+    return Trace(
+        [
+            {DEFAULT_NAME_KEY: a, DEFAULT_TIMESTAMP_KEY: timestamp(start + i)}
+            for i, a in enumerate(activities)
+        ]
+    )
+
+
+class TestSampling(unittest.TestCase):
+    def test_sample_is_stratified_by_variant(self):
+        log = EventLog(
+            [create_trace("ab") for _ in range(60)]
+            + [create_trace("ba") for _ in range(30)]
+            + [create_trace("abc") for _ in range(10)]
+        )
+
+        sample = sample_log_by_variant(log, 10, seed=1)
+        counts = Counter(get_lifecycle_variant(t) for t in sample)
+
+        self.assertEqual(10, len(sample))
+        self.assertEqual(
+            [6, 3, 1], [counts[get_lifecycle_variant(log[i])] for i in [0, 60, 90]]
+        )
+        self.assertIs(log, sample_log_by_variant(log, 100))
+
+    def test_filter_log_by_time_window(self):
+        log = EventLog([create_trace("abc", start) for start in [0, 10, 20]])
+
+        self.assertEqual(
+            [log[1]],
+            list(filter_log_by_time_window(log, (timestamp(5), timestamp(15)))),
+        )
+        self.assertEqual(
+            [log[1], log[2]], list(filter_log_by_time_window(log, (timestamp(5), None)))
+        )
+
+    def test_stats_with_confidence_intervals(self):
+        values = [float(v) for v in range(1, 101)] + [None]
+        result = stats_with_confidence_intervals(values, 0.95)
+
+        self.assertEqual(stats(values), {k: result[k] for k in stats(values)})
+        error = 1.959963984540054 * statistics.stdev(range(1, 101)) / 10
+        self.assertAlmostEqual(50.5 - error, result["mean_ci"][0])
+        self.assertAlmostEqual(50.5 + error, result["mean_ci"][1])
+        # ranks 40 and 61
+        self.assertEqual((40.0, 61.0), result["median_ci"])
+        self.assertIsNone(stats_with_confidence_intervals([None]))
+
+    def test_tree_performance_sampled(self):
+        tree = index_leaf_labels(create_test_tree()[0])
+        set_parent(tree)
+        log = EventLog([create_lifecycle_trace(i) for i in range(21)])
+
+        performances, _ = tree_performance.get_tree_performance_intervals(tree, log)
+        result, _ = tree_performance.get_tree_performance_sampled(tree, log, 21)
+        for values, node_stats in zip(performances, result):
+            expected = apply_aggregation(values, stats, avg, avg)
+            for t in expected:
+                if expected[t] is None:
+                    self.assertIsNone(node_stats[t])
+                    continue
+                self.assertEqual(
+                    expected[t], {k: node_stats[t][k] for k in expected[t]}
+                )
+                self.assertIn("mean_ci", node_stats[t])
+
+        result, _ = tree_performance.get_tree_performance_sampled(tree, log, 6, seed=0)
+        service_times = result[0][tree]
+        self.assertEqual(6, service_times["n"])
+        self.assertLessEqual(service_times["mean_ci"][0], service_times["mean"])
+        self.assertLessEqual(service_times["median_ci"][0], service_times["median"])
+        self.assertGreaterEqual(service_times["median_ci"][1], service_times["median"])
+
+    def test_tree_performance_of_empty_time_window(self):
+        tree = index_leaf_labels(create_test_tree()[0])
+        set_parent(tree)
+        log = EventLog([create_lifecycle_trace(0)])
+        time_window = (timestamp(100), None)
+
+        performances, fitness = tree_performance.get_tree_performance_intervals(
+            tree, log, time_window=time_window
+        )
+        self.assertIsNone(fitness)
+        for values in performances:
+            self.assertTrue(all(v == [] for v in values.values()))
+
+        result, fitness = tree_performance.get_tree_performance_sampled(
+            tree, log, 10, time_window=time_window
+        )
+        self.assertIsNone(fitness)
+        for node_stats in result:
+            self.assertTrue(all(v is None for v in node_stats.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
+import random
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from cortado_core.utils.timestamp_utils import TimeUnit
 from pm4py.objects.log.obj import Trace, Event
@@ -258,6 +259,67 @@ class TestSubvariantPerformance(unittest.TestCase):
         for waiting_time_node in subvariant_with_performance.waiting_time_events:
             self.assertEqual(waiting_time_node.performance_stats["mean"], 3600)
 
+    def test_columnar(self):
+        rng = random.Random(0)
+        traces = []
+        for i in range(20):
+            events = []
+            time = datetime(2020, 1, 1, tzinfo=timezone(timedelta(hours=i % 3)))
+            for activity in ["a", "b", "a", "c"]:
+                # most traces execute the activities one after another, some with random overlaps
+                if i % 4 == 0:
+                    start = time + timedelta(seconds=rng.randint(0, 100000))
+                    duration = timedelta(seconds=rng.randint(0, 100000))
+                else:
+                    start = time + timedelta(seconds=rng.randint(1, 1000))
+                    duration = timedelta(hours=1, seconds=rng.randint(0, 1000))
+                complete = start + duration + timedelta(microseconds=i)
+                events += self.__create_event(
+                    activity, start, complete, use_lifecycle=i % 2 == 0
+                )
+                time = start if i % 4 == 0 else complete
+            traces.append(Trace(events))
+
+        for time_granularity in TimeUnit:
+            subvariants = get_detailed_variants(traces)
+            subvariants_columnar = get_detailed_variants(traces)
+
+            for (subvariant, sub_traces), (
+                subvariant_columnar,
+                sub_traces_columnar,
+            ) in zip(subvariants.items(), subvariants_columnar.items()):
+                expected = subvariant_performance.calculate_subvariant_performance(
+                    subvariant, sub_traces, time_granularity
+                )
+                actual = subvariant_performance.calculate_subvariant_performance(
+                    subvariant_columnar,
+                    sub_traces_columnar,
+                    time_granularity,
+                    columnar=True,
+                )
+
+                self.assertEqual(
+                    expected.global_performance_stats,
+                    actual.global_performance_stats,
+                )
+                self.assertEqual(
+                    [
+                        [n.performance_stats for n in nodes]
+                        for nodes in expected.subvariant
+                    ],
+                    [
+                        [n.performance_stats for n in nodes]
+                        for nodes in actual.subvariant
+                    ],
+                )
+                self.assertEqual(
+                    expected.waiting_time_events, actual.waiting_time_events
+                )
+                self.assertEqual(
+                    [e.performance_stats for e in expected.waiting_time_events],
+                    [e.performance_stats for e in actual.waiting_time_events],
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
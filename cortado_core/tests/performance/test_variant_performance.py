@@ -0,0 +1,135 @@
+import random
+import unittest
+from multiprocessing import Pool
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from pm4py.objects.log.obj import EventLog, Event, Trace
+from pm4py.objects.log.util.xes import (
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+)
+
+from cortado_core.models.infix_type import InfixType
+from cortado_core.performance.variant_performance import (
+    assign_variants_performances,
+    decode_group,
+    encode_group,
+    get_groups_preorder,
+)
+from cortado_core.utils.cvariants import get_concurrency_variants
+from cortado_core.utils.split_graph import (
+    Group,
+    LeafGroup,
+    LoopGroup,
+    ParallelGroup,
+    SequenceGroup,
+)
+
+
+def create_log(seed: int = 0, n_traces: int = 30) -> EventLog:
+    rng = random.Random(seed)
+    traces = []
+    for _ in range(n_traces):
+        time = datetime(2020, 1, 1) + timedelta(minutes=rng.randint(0, 1000))
+        events = []
+        # activities of the same step are executed concurrently
+        for step in [["a"], ["b", "c"], ["d"], ["b", "e"], ["f"]]:
+            step_start = time
+            for activity in step:
+                event = Event()
+                event["concept:name"] = activity
+                event[DEFAULT_START_TIMESTAMP_KEY] = step_start + timedelta(
+                    seconds=rng.randint(0, 600)
+                )
+                event[DEFAULT_TIMESTAMP_KEY] = event[
+                    DEFAULT_START_TIMESTAMP_KEY
+                ] + timedelta(
+                    seconds=rng.randint(1, 3600), microseconds=rng.randint(0, 999999)
+                )
+                time = max(time, event[DEFAULT_TIMESTAMP_KEY])
+                events.append(event)
+            time += timedelta(seconds=rng.randint(0, 600))
+        traces.append(Trace(events))
+
+    return EventLog(traces)
+
+
+def get_variants(log: EventLog):
+    return {
+        i: (variant, traces, [], SimpleNamespace(is_user_defined=False))
+        for i, (variant, traces) in enumerate(get_concurrency_variants(log).items())
+    }
+
+
+class TestVariantPerformance(unittest.TestCase):
+    def test_indexed_performance(self):
+        variants = get_variants(create_log())
+        variants_indexed = get_variants(create_log())
+        self.assertGreater(len(variants), 1)
+
+        assign_variants_performances(variants)
+        assign_variants_performances(variants_indexed, indexed=True)
+
+        for i, (variant, _, _, _) in variants.items():
+            self.assertEqual(variant.serialize(), variants_indexed[i][0].serialize())
+
+    def assertPerformancesAlmostEqual(self, expected: Group, actual: Group):
+        for expected_group, group in zip(
+            get_groups_preorder(expected), get_groups_preorder(actual)
+        ):
+            self.assertEqual(
+                expected_group.performance.keys(), group.performance.keys()
+            )
+            for key, expected_stats in expected_group.performance.items():
+                if expected_stats is None:
+                    self.assertIsNone(group.performance[key])
+                    continue
+                self.assertEqual(expected_stats.keys(), group.performance[key].keys())
+                for stat, value in expected_stats.items():
+                    self.assertAlmostEqual(
+                        value, group.performance[key][stat], places=6
+                    )
+
+    def test_parallel_performance(self):
+        variants = get_variants(create_log())
+        variants_parallel = get_variants(create_log())
+
+        assign_variants_performances(variants)
+        with Pool(2) as pool:
+            assign_variants_performances(variants_parallel, pool=pool)
+
+        for i, (variant, _, _, _) in variants.items():
+            self.assertPerformancesAlmostEqual(variant, variants_parallel[i][0])
+
+    def test_encode_group_round_trip(self):
+        variant = SequenceGroup(
+            [
+                LeafGroup(["a"], id=1),
+                LoopGroup(
+                    [LeafGroup(["b"], id=3)],
+                    infix_type=InfixType.PROPER_INFIX,
+                    id=2,
+                    min_count=2,
+                    max_count=5,
+                ),
+                ParallelGroup([LeafGroup(["c"], id=5), LeafGroup(["d"], id=6)], id=4),
+            ],
+            infix_type=InfixType.PROPER_INFIX,
+            id=0,
+        )
+        decoded = decode_group(encode_group(variant))
+
+        self.assertEqual(variant.serialize(), decoded.serialize())
+        for group, decoded_group in zip(
+            get_groups_preorder(variant), get_groups_preorder(decoded)
+        ):
+            self.assertIs(type(group), type(decoded_group))
+            self.assertEqual(group.id, decoded_group.id)
+            self.assertEqual(group.infix_type, decoded_group.infix_type)
+        self.assertEqual(2, decoded[1].min_count)
+        self.assertEqual(5, decoded[1].max_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
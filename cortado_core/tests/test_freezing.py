@@ -1,9 +1,19 @@
 import unittest
+from collections import OrderedDict
 
 from pm4py.objects.log.obj import EventLog, Trace, Event
 from pm4py.objects.process_tree.utils.generic import parse
 
 from cortado_core.freezing.apply import add_trace_to_pt_language_with_freezing
+from cortado_core.freezing.freezing_cache import (
+    FreezingCache,
+    get_frozen_subtrees_fingerprint,
+)
+from cortado_core.models.infix_type import InfixType
+from cortado_core.process_tree_utils.miscellaneous import get_root, pt_dict_key
+from cortado_core.process_tree_utils.persistent_tree import to_persistent_tree
+from cortado_core.tests.test_infix_alignments import generate_test_trace
+from cortado_core.utils.alignment_utils import trace_fits_process_tree
 
 
 class TestFreezing(unittest.TestCase):
@@ -32,6 +42,27 @@ class TestFreezing(unittest.TestCase):
         self.assertEqual(parse("+(->('a', 'd'), X(tau,X('b', 'c')))"), resulting_pt)
         self.assertEqual(frozen_subtree, frozen_subtrees[0])
 
+    def test_copies_of_frozen_subtrees_do_not_need_node_attributes(self):
+        # frozen subtrees are copied with copy_process_tree, which drops _properties
+        trace = generate_test_trace(["a", "d"])
+        results = []
+        for properties in [{}, {"key": "value"}]:
+            pt = parse("->('a', X('b', 'c'), 'd')")
+            pt.children[1]._properties = dict(properties)
+
+            results.append(
+                add_trace_to_pt_language_with_freezing(
+                    pt,
+                    [pt.children[1]],
+                    EventLog(),
+                    trace,
+                    try_pulling_lca_down=True,
+                    add_missing_frozen_subtrees_at_root_level=True,
+                )
+            )
+
+        self.assertEqual(results[0], results[1])
+
     def test_frozen_subtree_removal_when_corresponding_flag_is_false(self):
         pt = parse("->('a', X('b', 'c'), 'd')")
         frozen_subtree = pt.children[1]
@@ -114,6 +145,60 @@ class TestFreezing(unittest.TestCase):
         self.assertEqual(parse("->('a', 'd')"), resulting_pt)
         self.assertEqual(frozen_subtrees, res_frozen_subtrees)
 
+    def test_add_traces_one_after_another_with_cache(self):
+        pt = parse("->('a', X('b', 'c'), 'd')")
+        frozen_subtrees = [pt.children[1]]
+        cache = FreezingCache()
+        added = []
+
+        for variant in ["abd", "abed", "acd", "abxd", "acd"]:
+            trace = generate_test_trace(variant)
+            pt, frozen_subtrees = add_trace_to_pt_language_with_freezing(
+                pt,
+                frozen_subtrees,
+                EventLog(added),
+                trace,
+                try_pulling_lca_down=True,
+                cache=cache,
+            )
+            added.append(trace)
+
+            for t in added:
+                self.assertTrue(trace_fits_process_tree(t, pt))
+
+        self.assertEqual(parse("X('b', 'c')"), frozen_subtrees[0])
+        self.assertIs(pt, get_root(frozen_subtrees[0]))
+        # every already added variant was projected at most once
+        self.assertLessEqual(len(cache.projected_traces), 3)
+
+    def test_cache_is_cleared_if_frozen_subtrees_or_tree_change(self):
+        pt = parse("->('a', X('b', 'c'), 'd')")
+        cache = FreezingCache()
+        fingerprint = get_frozen_subtrees_fingerprint(
+            OrderedDict([(pt_dict_key(pt.children[1]), "1")])
+        )
+        cache.set_frozen_subtrees_fingerprint(fingerprint)
+        cache.set_resulting_tree(pt)
+        cache.execution_numbers[(to_persistent_tree(pt), "1+ACTIVATED")] = {1}
+        cache.projected_traces[(("a", "d"), InfixType.NOT_AN_INFIX)] = ()
+
+        cache.set_frozen_subtrees_fingerprint(fingerprint)
+        cache.invalidate_if_tree_changed(pt)
+        self.assertEqual(1, len(cache.execution_numbers))
+        self.assertEqual(1, len(cache.projected_traces))
+
+        cache.set_frozen_subtrees_fingerprint(
+            get_frozen_subtrees_fingerprint(
+                OrderedDict([(pt_dict_key(pt.children[0]), "2")])
+            )
+        )
+        self.assertEqual({}, cache.execution_numbers)
+        self.assertEqual({}, cache.projected_traces)
+
+        cache.execution_numbers[(to_persistent_tree(pt), "2+ACTIVATED")] = {1}
+        cache.invalidate_if_tree_changed(parse("->('a', 'd')"))
+        self.assertEqual({}, cache.execution_numbers)
+
 
 if __name__ == "__main__":
     unittest.main()
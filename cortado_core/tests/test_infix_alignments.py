@@ -297,6 +297,51 @@ class TestInfixAlignments(unittest.TestCase):
 
             self.assertEqual(alignment["cost"], 0)
 
+    def test_copy_tree_does_not_change_tree(self):
+        tree = "->('a', +('b', 'c', ->('e', tau)), X('b', 'f'))"
+        trace = generate_test_trace(["c", "e"])
+
+        for reduce_tree in [False, True]:
+            process_tree = parse(tree)
+            process_tree._properties["key"] = "value"
+            children = list(process_tree.children)
+            alignment = calculate_optimal_infix_alignment(
+                trace,
+                process_tree,
+                naive=False,
+                reduce_tree=reduce_tree,
+                variant=VARIANT_TREE_BASED_PREPROCESSING,
+            )
+
+            self.assertEqual(parse(tree), process_tree)
+            self.assertEqual(children, process_tree.children)
+            self.assertTrue(all(c.parent is process_tree for c in children))
+            self.assertEqual({"key": "value"}, process_tree._properties)
+            self.assertEqual(
+                calculate_optimal_infix_alignment(
+                    trace,
+                    parse(tree),
+                    naive=False,
+                    reduce_tree=reduce_tree,
+                    copy_tree=False,
+                    variant=VARIANT_TREE_BASED_PREPROCESSING,
+                )["cost"],
+                alignment["cost"],
+            )
+
+    def test_reduce_process_tree_with_copy(self):
+        tree = parse("->('a', ->('b','c', +('e', 'd'), 'f', X('g', 'h')))")
+        matching_leaf_nodes = get_matching_leaf_nodes(
+            {"c", "f"}, search_leaf_nodes_in_tree(tree)
+        )
+        reduced_tree = reduce_process_tree(matching_leaf_nodes, copy_tree=True)
+
+        self.assertEqual(parse("->('c', +('e', 'd'), 'f')"), reduced_tree)
+        self.assertIsNone(reduced_tree.parent)
+        self.assertEqual(
+            parse("->('a', ->('b','c', +('e', 'd'), 'f', X('g', 'h')))"), tree
+        )
+
     def test_reduce_process_tree(self):
         test_data = [
             {
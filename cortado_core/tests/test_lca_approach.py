@@ -160,6 +160,49 @@ class LCA_Approach_Tests(unittest.TestCase):
 
         self.assertEqual(tree_sort(expected_tree), tree_sort(new_tree))
 
+    def test_lca_approach_with_concurrent_lca_rewrites(self):
+        tree = pt_parse("->('a', *(->('b', X('c', tau), 'd', X('e', tau)), tau), 'f')")
+
+        trace_to_add = generate_test_trace("abcdebcf")
+        previously_added_traces = EventLog([generate_test_trace("abdf")])
+        with Pool() as pool:
+            new_tree = add_trace_to_pt_language(
+                tree,
+                previously_added_traces,
+                trace_to_add,
+                try_pulling_lca_down=True,
+                add_artificial_start_end=False,
+                pool=pool,
+                concurrent_lca_rewrites=True,
+            )
+        expected_tree = pt_parse(
+            "->('a', *(->('b', X(tau, 'c'), X(tau, ->('d', X(tau, 'e')))), tau), 'f')"
+        )
+
+        self.assertEqual(tree_sort(expected_tree), tree_sort(new_tree))
+
+    def test_lca_approach_add_postfix_with_concurrent_lca_rewrites(self):
+        tree = pt_parse("->('a', 'b', +('c', 'd'))")
+        trace_to_add = TypedTrace(generate_test_trace("becd"), InfixType.POSTFIX)
+        previously_added = [
+            TypedTrace(generate_test_trace("abcd"), InfixType.NOT_AN_INFIX),
+            TypedTrace(generate_test_trace("abdc"), InfixType.NOT_AN_INFIX),
+        ]
+
+        expected_tree = pt_parse("->('a', 'b', X(tau, 'e'), +('c', 'd'))")
+        with Pool() as pool:
+            new_tree = add_trace_to_pt_language(
+                tree,
+                previously_added,
+                trace_to_add,
+                try_pulling_lca_down=True,
+                add_artificial_start_end=False,
+                pool=pool,
+                concurrent_lca_rewrites=True,
+            )
+
+        self.assertEqual(tree_sort(expected_tree), tree_sort(new_tree))
+
     def test_lca_approach_add_infix(self):
         tree = pt_parse("->('a', 'b', +('c', 'd'))")
         trace_to_add = TypedTrace(generate_test_trace("be"), InfixType.PROPER_INFIX)
@@ -1,9 +1,20 @@
 import unittest
+from copy import deepcopy
+
 from cortado_core.model_repair.algorithm import (
     Sublog,
     Subtrace,
     align_subtraces,
+    get_global_cost_function,
+    get_split_candidates,
     group_into_sublogs,
+    group_log_by_variant,
+    repair_for_loops,
+    repair_petri_net_with_log,
+)
+from cortado_core.utils.alignment_utils import alignment_contains_deviation
+from pm4py.algo.conformance.alignments.petri_net.algorithm import (
+    apply as calculate_alignment,
 )
 from pm4py.objects.log.obj import EventLog, Event, Trace
 from pm4py.objects.petri_net.obj import PetriNet, Marking
@@ -81,6 +92,19 @@ class ModelRepairTests(unittest.TestCase):
 
         assert decomposed_subtraces == {sub1, sub2, sub3}
 
+    def test_split_candidates(self):
+        self.assertEqual(
+            [
+                ((), tuple("abc"), ()),
+                (tuple("a"), tuple("bc"), ()),
+                ((), tuple("ab"), tuple("c")),
+                ((), tuple("a"), tuple("bc")),
+                (tuple("ab"), tuple("c"), ()),
+                (tuple("a"), tuple("b"), tuple("c")),
+            ],
+            get_split_candidates(tuple("abc")),
+        )
+
     def test_grouping_subtraces(self):
         sub1 = Subtrace(tuple("abc"), frozenset({p1, p2}))
         sub2 = Subtrace(tuple("abd"), frozenset({p2, p3}))
@@ -98,3 +122,64 @@ class ModelRepairTests(unittest.TestCase):
         sublog2 = Sublog(frozenset({sub4}), frozenset({p1, p4}))
 
         assert sublogs == {sublog1, sublog2}
+
+    def test_group_log_by_variant(self):
+        variant_log, multiplicities = group_log_by_variant(
+            EventLog([t1, t2, Trace([a, c, f, c, e, d]), t1])
+        )
+
+        self.assertEqual([t1, t2], list(variant_log))
+        self.assertEqual([3, 1], multiplicities)
+
+    def test_repair_log_with_duplicate_variants(self):
+        petri_net = deepcopy(net)
+        initial_marking = Marking(
+            {p: n for p in petri_net.places for q, n in im.items() if p.name == q.name}
+        )
+        final_marking = Marking(
+            {p: n for p in petri_net.places for q, n in fm.items() if p.name == q.name}
+        )
+        duplicated_log = EventLog([t1, t2, t1, t2, t1])
+
+        repair_petri_net_with_log(
+            petri_net, initial_marking, final_marking, duplicated_log
+        )
+
+        for alignment in calculate_alignment(
+            duplicated_log, petri_net, initial_marking, final_marking
+        ):
+            self.assertFalse(alignment_contains_deviation(alignment))
+
+    def test_global_cost_function_with_previous_alignments(self):
+        petri_net = deepcopy(net)
+        places = {p.name: p for p in petri_net.places}
+        initial_marking = Marking({places["p1"]: 1})
+        final_marking = Marking({places["p6"]: 1})
+        # fitting traces that skip b contain model moves on the silent transition
+        skip = PetriNet.Transition("skip_1", None)
+        petri_net.transitions.add(skip)
+        petri_utils.add_arc_from_to(places["p3"], skip, petri_net)
+        petri_utils.add_arc_from_to(skip, places["p5"], petri_net)
+        fitting_trace = Trace([a, c, d])
+        repair_log = EventLog(
+            [t1, t2, fitting_trace, fitting_trace, fitting_trace, Trace([a, b, c, d])]
+        )
+
+        previous_alignments = repair_for_loops(
+            petri_net, initial_marking, final_marking, repair_log
+        )
+        expected = get_global_cost_function(
+            petri_net, initial_marking, final_marking, repair_log
+        )
+        actual = get_global_cost_function(
+            petri_net,
+            initial_marking,
+            final_marking,
+            repair_log,
+            previous_alignments=previous_alignments,
+        )
+
+        for transition in petri_net.transitions:
+            self.assertEqual(expected(transition), actual(transition))
+        for event in [a, b, c, d, e, f]:
+            self.assertEqual(expected(event), actual(event))
@@ -0,0 +1,91 @@
+import unittest
+
+from pm4py.objects.process_tree.utils.generic import parse as pt_parse
+
+from cortado_core.lca_approach import set_preorder_ids_in_tree
+from cortado_core.process_tree_utils.persistent_tree import (
+    copy_process_tree,
+    get_path_from_root,
+    get_subtree,
+    replace_children,
+    replace_subtree,
+    to_persistent_tree,
+    to_process_tree,
+)
+
+
+class PersistentTreeTests(unittest.TestCase):
+    def test_round_trip(self):
+        pt = pt_parse("->('A', X(*('B', tau), +('C', 'D')), 'E')")
+        self.assertEqual(pt, to_process_tree(to_persistent_tree(pt)))
+
+    def test_copy_is_independent_and_keeps_ids(self):
+        pt = pt_parse("->('A', X('B', 'C'))")
+        set_preorder_ids_in_tree(pt)
+        copied = copy_process_tree(pt)
+
+        self.assertIsNot(pt, copied)
+        self.assertEqual(
+            pt.children[1].children[0].id, copied.children[1].children[0].id
+        )
+        self.assertIs(copied.children[1].parent, copied)
+
+        copied.children[1].children[0].label = "Z"
+        self.assertEqual("B", pt.children[1].children[0].label)
+
+    def test_copy_of_subtree_has_no_parent(self):
+        pt = pt_parse("->('A', X('B', 'C'))")
+        copied = copy_process_tree(pt.children[1])
+
+        self.assertIsNone(copied.parent)
+        self.assertEqual(pt.children[1], copied)
+
+    def test_copy_keeps_only_structure_labels_and_ids(self):
+        pt = pt_parse("->('A', X('B', 'C'))")
+        pt.children[1]._properties["key"] = "value"
+        pt.children[1].other_attribute = 1
+        copied = copy_process_tree(pt)
+
+        self.assertEqual({}, copied.children[1]._properties)
+        self.assertFalse(hasattr(copied.children[1], "other_attribute"))
+
+    def test_replace_subtree_shares_unchanged_subtrees(self):
+        pt = pt_parse("->(X('A', 'B'), +('C', 'D'))")
+        snapshot = to_persistent_tree(pt)
+        path = get_path_from_root(pt.children[1].children[0])
+        new_version = replace_subtree(
+            snapshot, path, to_persistent_tree(pt_parse("'E'"))
+        )
+
+        self.assertIs(snapshot.children[0], new_version.children[0])
+        self.assertIs(
+            snapshot.children[1].children[1], new_version.children[1].children[1]
+        )
+        self.assertEqual("C", get_subtree(snapshot, path).label)
+        self.assertEqual("E", get_subtree(new_version, path).label)
+        self.assertEqual(
+            pt_parse("->(X('A', 'B'), +('E', 'D'))"), to_process_tree(new_version)
+        )
+
+    def test_replace_children(self):
+        pt = pt_parse("->('A', 'B', 'C')")
+        snapshot = to_persistent_tree(pt)
+        new_version = replace_children(
+            snapshot,
+            (),
+            (
+                snapshot.children[0],
+                to_persistent_tree(pt_parse("->('B', 'C')")),
+            ),
+        )
+
+        self.assertEqual(
+            pt_parse("->('A', ->('B', 'C'))"), to_process_tree(new_version)
+        )
+        self.assertEqual(pt, to_process_tree(snapshot))
+
+    def test_path_from_root(self):
+        pt = pt_parse("->(X('A', 'B'), +('C', 'D'))")
+
+        self.assertEqual((1, 0), get_path_from_root(pt.children[1].children[0]))
+        self.assertEqual((), get_path_from_root(pt))
@@ -85,6 +85,20 @@ class TestSuffixAlignments(unittest.TestCase):
             # single log move
             self.assertEqual(alignment["cost"], 10000)
 
+    def test_copy_tree_does_not_change_tree(self):
+        tree = "->('a', X('b', tau), 'b', 'c')"
+        process_tree = parse(tree)
+        process_tree._properties["key"] = "value"
+        children = list(process_tree.children)
+
+        for variant in self.__get_variants():
+            alignment = variant(generate_test_trace("bc"), process_tree)
+
+            self.assertLess(alignment["cost"], align_utils.STD_MODEL_LOG_MOVE_COST)
+            self.assertEqual(parse(tree), process_tree)
+            self.assertEqual(children, process_tree.children)
+            self.assertEqual({"key": "value"}, process_tree._properties)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,3 @@
-import copy
 from multiprocessing import Pool
 from typing import List
 
@@ -6,6 +5,7 @@ from pm4py.objects.log.obj import EventLog, Trace
 from pm4py.objects.process_tree.obj import ProcessTree
 
 
+from cortado_core.process_tree_utils.persistent_tree import copy_process_tree
 from cortado_core.trace_ordering.scoring.trace_scorer import TraceScorer
 from cortado_core.lca_approach import add_trace_to_pt_language
 from cortado_core.trace_ordering.utils.f_mesaure import calculate_f_measure
@@ -23,7 +23,7 @@ class BruteForceTraceScorer(TraceScorer):
         process_tree: ProcessTree,
         trace_candidate: Trace,
     ) -> float:
-        tree = copy.deepcopy(process_tree)
+        tree = copy_process_tree(process_tree)
         with Pool() as multiprocessing_pool:
             pt = add_trace_to_pt_language(
                 tree,
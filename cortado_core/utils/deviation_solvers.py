@@ -1,27 +1,43 @@
 import dataclasses
+import logging
 from abc import ABC, abstractmethod
 from enum import Enum
 from multiprocessing import Pool
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
 from pm4py import ProcessTree
 from pm4py.algo.discovery.inductive import algorithm as inductive_miner
 from pm4py.objects.log.obj import Trace, Event, EventLog
+from pm4py.objects.petri_net.utils.align_utils import SKIP
 from pm4py.objects.process_tree.obj import Operator
 from pm4py.util.typing import AlignmentResult
 
 from cortado_core.models.infix_type import InfixType
 from cortado_core.naive_approach import repair_first_deviation
-from cortado_core.process_tree_utils.miscellaneous import is_subtree, get_root
-from cortado_core.utils.alignment_utils import is_log_move, is_sync_move, is_model_move
+from cortado_core.process_tree_utils.miscellaneous import (
+    is_subtree,
+    get_root,
+    is_leaf_node,
+    set_preorder_ids_in_tree,
+)
+from cortado_core.utils.alignment_utils import (
+    is_log_move,
+    is_sync_move,
+    is_model_move,
+    alignment_step_represents_no_deviation,
+    calculate_alignment_typed_trace,
+    get_first_deviation,
+)
 from cortado_core.utils.lca_utils import (
     find_lowest_common_ancestor,
     rediscover_subtree_and_modify_pt,
 )
 from cortado_core.utils.sublog_utils import (
     calculate_sublog_for_lca,
+    calculate_sub_log_for_each_node_regular_traces_async,
     generate_full_alignment_based_on_infix_alignment,
 )
+from cortado_core.utils.trace import TypedTrace
 
 
 class DeviationType(Enum):
@@ -154,6 +170,54 @@ class DeviationSolver(ABC):
 
         return alignment_step_index_lca_closed
 
+    @staticmethod
+    def get_aligned_trace(alignment) -> Trace:
+        """
+        Returns the trace/fragment that was aligned, i.e., the log part of all log-moves and sync-moves.
+        """
+        trace = Trace()
+        for align_step in alignment["alignment"]:
+            if align_step[1][0] != SKIP:
+                e = Event()
+                e["concept:name"] = align_step[1][0]
+                trace.append(e)
+
+        return trace
+
+    def solve_on_rewritten_tree(
+        self, deviation: Deviation, pt: ProcessTree, log, infix_type: InfixType
+    ):
+        """
+        Continues the repair after the LCA was pulled down instead of returning the rewritten tree to the caller. Pulling
+        down the LCA does not change the language of pt, but the alignment of the trace/fragment has to be calculated on
+        the rewritten tree. If the re-aligned deviation is enclosed, the LCA is chosen as before. If it is pulled down
+        again, the repair continues on the next rewritten tree. The alignments of the already added traces are only
+        calculated once the final tree is known (see get_regular_trace_sublogs_async).
+        """
+        set_preorder_ids_in_tree(pt)
+        trace = DeviationSolver.get_aligned_trace(deviation.alignment)
+        alignment = calculate_alignment_typed_trace(pt, TypedTrace(trace, infix_type))
+        rewritten_deviation = get_deviation(alignment)
+
+        if rewritten_deviation.type != DeviationType.ENCLOSED:
+            # the calling function re-aligns the trace/fragment and chooses a suitable solver
+            return pt
+
+        return self.solve(rewritten_deviation, pt, log)
+
+    @staticmethod
+    def get_regular_trace_sublogs_async(
+        pt: ProcessTree, log, pool: Optional[Pool]
+    ) -> Optional[Callable[[], dict]]:
+        """
+        Starts the alignments of the already added full traces on the final tree in the pool, such that they are
+        calculated while the main process prepares the sublog of the LCA and aligns the infixes/postfixes/prefixes.
+        """
+        if pool is None:
+            return None
+
+        return calculate_sub_log_for_each_node_regular_traces_async(pt, log, pool)
+
 
 class NoDeviationSolver(DeviationSolver):
     """
@@ -169,9 +233,15 @@ class EnclosedDeviationSolverTrace(DeviationSolver):
     Solves deviations for full-traces, i.e. NOT infixes/postfixes/prefixes, by applying the LCA-algorithm.
     """
 
-    def __init__(self, try_pulldown: bool, pool: Optional[Pool]):
+    def __init__(
+        self,
+        try_pulldown: bool,
+        pool: Optional[Pool],
+        concurrent_lca_rewrites: bool = False,
+    ):
         self.try_pulldown = try_pulldown
         self.pool = pool
+        self.concurrent_lca_rewrites = concurrent_lca_rewrites
 
     def solve(self, deviation: Deviation, pt: ProcessTree, log):
         lca, process_tree_modified = find_lowest_common_ancestor(
@@ -186,8 +256,18 @@ class EnclosedDeviationSolverTrace(DeviationSolver):
 
         if process_tree_modified:
             # process tree was modified, recalculation of the alignment is needed
+            if self.concurrent_lca_rewrites and self.pool is not None:
+                return self.solve_on_rewritten_tree(
+                    deviation, get_root(lca), log, InfixType.NOT_AN_INFIX
+                )
             return get_root(lca)
 
+        get_regular_trace_sublogs = None
+        if self.concurrent_lca_rewrites:
+            get_regular_trace_sublogs = DeviationSolver.get_regular_trace_sublogs_async(
+                pt, log, self.pool
+            )
+
         alignment_step_index_lca_activated = (
             DeviationSolver.get_alignment_step_index_of_lca_activation(
                 deviation.deviation_index, deviation.alignment, lca
@@ -215,6 +295,7 @@ class EnclosedDeviationSolverTrace(DeviationSolver):
             trace_to_add,
             InfixType.NOT_AN_INFIX,
             self.pool,
+            get_regular_trace_sublogs=get_regular_trace_sublogs,
         )
 
         pt = rediscover_subtree_and_modify_pt(lca, sublog)
@@ -233,10 +314,13 @@ class EnclosedDeviationSolverInfix(DeviationSolver):
     to the right, for infixes/prefixes/postfixes.
     """
 
-    def __init__(self, pool, infix_type, try_pulling_down_lca):
+    def __init__(
+        self, pool, infix_type, try_pulling_down_lca, concurrent_lca_rewrites=False
+    ):
         self.pool = pool
         self.infix_type = infix_type
         self.try_pulling_down_lca = try_pulling_down_lca
+        self.concurrent_lca_rewrites = concurrent_lca_rewrites
 
     def solve(self, deviation: Deviation, pt: ProcessTree, log):
         left_node, left_dev_idx = deviation.left_node
@@ -250,8 +334,18 @@ class EnclosedDeviationSolverInfix(DeviationSolver):
 
         if process_tree_modified:
             # process tree was modified, recalculation of the alignment is needed
+            if self.concurrent_lca_rewrites and self.pool is not None:
+                return self.solve_on_rewritten_tree(
+                    deviation, get_root(lca), log, self.infix_type
+                )
             return get_root(lca)
 
+        get_regular_trace_sublogs = None
+        if self.concurrent_lca_rewrites:
+            get_regular_trace_sublogs = DeviationSolver.get_regular_trace_sublogs_async(
+                pt, log, self.pool
+            )
+
         full_alignment = generate_full_alignment_based_on_infix_alignment(
             self.infix_type, deviation.alignment
         )
@@ -284,6 +378,7 @@ class EnclosedDeviationSolverInfix(DeviationSolver):
             trace_to_add,
             self.infix_type,
             self.pool,
+            get_regular_trace_sublogs=get_regular_trace_sublogs,
         )
 
         return rediscover_subtree_and_modify_pt(lca, sublog)
@@ -351,11 +446,94 @@ class FallbackDeviationSolverInfix(DeviationSolver):
         return new_root
 
 
+def get_deviation(alignment) -> Deviation:
+    step, i = get_first_deviation(alignment)
+    if step is None:
+        logging.debug("found no deviation")
+        return Deviation(
+            DeviationType.NO_DEVIATION, (None, -1), (None, -1), alignment, i
+        )
+
+    logging.debug("deviation at ", i)
+    exec_pt_leave_before_deviation = __get_leaf_before_deviation(alignment, i)
+    exec_pt_leave_after_deviation = __get_leaf_after_deviation(alignment, i)
+
+    if (
+        exec_pt_leave_before_deviation[0] is None
+        and exec_pt_leave_after_deviation[0] is None
+    ):
+        return Deviation(
+            DeviationType.NOT_ENCLOSED, (None, -1), (None, -1), alignment, i
+        )
+
+    if (
+        exec_pt_leave_before_deviation[0] is not None
+        and exec_pt_leave_after_deviation[0] is not None
+    ):
+        return Deviation(
+            DeviationType.ENCLOSED,
+            exec_pt_leave_before_deviation,
+            exec_pt_leave_after_deviation,
+            alignment,
+            i,
+        )
+
+    if exec_pt_leave_before_deviation[0] is not None:
+        return Deviation(
+            DeviationType.LEFT_ENCLOSED,
+            exec_pt_leave_before_deviation,
+            (None, -1),
+            alignment,
+            i,
+        )
+
+    return Deviation(
+        DeviationType.RIGHT_ENCLOSED,
+        (None, -1),
+        exec_pt_leave_after_deviation,
+        alignment,
+        i,
+    )
+
+
+def __get_leaf_before_deviation(
+    alignment: AlignmentResult, deviation_i: int
+) -> tuple[ProcessTree, int]:
+    exec_pt_leave_before_deviation = None
+    h = deviation_i - 1
+    while h >= 0 and not exec_pt_leave_before_deviation:
+        step_before: Tuple = alignment["alignment"][h]
+        if alignment_step_represents_no_deviation(step_before) and is_leaf_node(
+            step_before[0][1][0]
+        ):
+            exec_pt_leave_before_deviation = step_before[0][1][0]
+        h -= 1
+
+    return exec_pt_leave_before_deviation, h + 1
+
+
+def __get_leaf_after_deviation(
+    alignment: AlignmentResult, deviation_i: int
+) -> tuple[ProcessTree, int]:
+    exec_pt_leave_after_deviation = None
+    j = deviation_i + 1
+    while j < len(alignment["alignment"]) and not exec_pt_leave_after_deviation:
+        step_after: Tuple = alignment["alignment"][j]
+        if alignment_step_represents_no_deviation(step_after) and is_leaf_node(
+            step_after[0][1][0]
+        ):
+            exec_pt_leave_after_deviation = step_after[0][1][0]
+        j += 1
+
+    return exec_pt_leave_after_deviation, j - 1
+
+
 def get_deviation_solver(
     deviation: Deviation,
     infix_type: InfixType,
     try_pulling_lca_down: bool,
     pool: Optional[Pool],
+    concurrent_lca_rewrites: bool = False,
 ):
     """
     Factory-method that returns the correct DeviationSolver for the present deviation.
@@ -365,6 +543,8 @@ def get_deviation_solver(
     infix_type
     try_pulling_lca_down
     pool
+    concurrent_lca_rewrites: if the LCA is pulled down, continue the repair on the rewritten tree and calculate the
+    needed alignments concurrently in the pool
 
     Returns
     -------
@@ -374,13 +554,17 @@ def get_deviation_solver(
         case DeviationType.NONE, _:
             return NoDeviationSolver()
         case DeviationType.ENCLOSED, InfixType.NOT_AN_INFIX:
-            return EnclosedDeviationSolverTrace(try_pulling_lca_down, pool)
+            return EnclosedDeviationSolverTrace(
+                try_pulling_lca_down, pool, concurrent_lca_rewrites
+            )
         case _, InfixType.NOT_AN_INFIX:
             return FallbackDeviationSolverTrace()
         case DeviationType.NOT_ENCLOSED, _:
             return FallbackDeviationSolverInfix()
         case DeviationType.ENCLOSED, _:
-            return EnclosedDeviationSolverInfix(pool, infix_type, try_pulling_lca_down)
+            return EnclosedDeviationSolverInfix(
+                pool, infix_type, try_pulling_lca_down, concurrent_lca_rewrites
+            )
         case DeviationType.LEFT_ENCLOSED, _:
             return LeftEnclosedDeviationSolver()
         case DeviationType.RIGHT_ENCLOSED, _:
@@ -1,3 +1,4 @@
+from multiprocessing.pool import AsyncResult
 from typing import List
 
 from pm4py.objects.log.obj import EventLog, Trace
@@ -14,6 +15,18 @@ from pm4py.algo.conformance.alignments.petri_net.algorithm import (
 def calculate_alignments_parallel(
     log: EventLog, net: PetriNet, im: Marking, fm: Marking, parameters, pool
 ) -> List[AlignmentResult]:
+    results = calculate_alignments_parallel_async(log, net, im, fm, parameters, pool)
+
+    return [r.get() for r in results]
+
+
+def calculate_alignments_parallel_async(
+    log: EventLog, net: PetriNet, im: Marking, fm: Marking, parameters, pool
+) -> List[AsyncResult]:
+    """
+    Submits the alignment calculations to the pool without waiting for the results. This allows the caller to do other
+    work, e.g., aligning a single trace on another net, while the pool is busy.
+    """
     results = []
     for trace in log:
         result = pool.apply_async(
@@ -23,7 +36,7 @@ def calculate_alignments_parallel(
         )
         results.append(result)
 
-    return [r.get() for r in results]
+    return results
 
 
 def calculate_alignment_a_star(
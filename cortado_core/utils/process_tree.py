@@ -39,6 +39,10 @@ class LabelWithIndex(UserString):
     def __hash__(self):
         return hash(self.data)
 
+    def __reduce__(self):
+        # UserString pickles a slice of data, which fails for tau labels (data is None)
+        return self.__class__, (self.data, self.index)
+
     @property
     def full(self):
         return f'{self.data if self.data is not None else "tau"}_{self.index}'
@@ -1,5 +1,5 @@
 import multiprocessing
-from typing import Optional
+from typing import Callable, Optional
 
 from pm4py import ProcessTree, Marking
 from pm4py.algo.conformance.alignments.petri_net.algorithm import (
@@ -23,7 +23,10 @@ from cortado_core.utils.alignment_utils import (
     calculate_infix_postfix_prefix_alignment,
     is_log_move,
 )
-from cortado_core.utils.parallel_alignments import calculate_alignments_parallel
+from cortado_core.utils.parallel_alignments import (
+    calculate_alignments_parallel,
+    calculate_alignments_parallel_async,
+)
 from cortado_core.utils.trace import TypedTrace, combine_event_logs
 
 
@@ -36,6 +39,7 @@ def calculate_sublog_for_lca(
     trace_to_add,
     infix_type: InfixType,
     pool,
+    get_regular_trace_sublogs: Optional[Callable[[], dict[int, EventLog]]] = None,
 ) -> EventLog:
     """
     Calculates the sublog given a process tree with its lca.
@@ -49,15 +53,24 @@ def calculate_sublog_for_lca(
     trace_to_add: trace/fragment that is added
     infix_type: type of the trace/fragment that is added
     pool
+    get_regular_trace_sublogs: returns the sublogs of the full traces in log if their calculation for pt was already
+    started, e.g., by calculate_sub_log_for_each_node_regular_traces_async(). It is called after the sublog of the
+    infixes/postfixes/prefixes was calculated, i.e., the pool aligns the full traces in the meantime.
 
     Returns
     -------
 
     """
     not_infix_log, infix_traces = __split_log_by_infix_type(log)
-    sublogs = __calculate_sub_log_for_each_node_regular_traces(
-        pt, not_infix_log, pool=pool
+    infix_sublog = calculate_sublog_for_infix_prefix_postfix_traces(
+        infix_traces, pt, lca
     )
+    if get_regular_trace_sublogs is not None:
+        sublogs = get_regular_trace_sublogs()
+    else:
+        sublogs = __calculate_sub_log_for_each_node_regular_traces(
+            pt, not_infix_log, pool=pool
+        )
     # adding the fitting prefix is important to ensure that we do not add deviations in the alignment that are on
     # the left-hand side of the current deviation
     sublogs = __add_fitting_alignment_prefix_to_sublogs(
@@ -67,9 +80,7 @@ def calculate_sublog_for_lca(
     sublog = sublogs[lca.id] if lca.id in sublogs else EventLog()
     sublog.append(trace_to_add)
 
-    return combine_event_logs(
-        sublog, calculate_sublog_for_infix_prefix_postfix_traces(infix_traces, pt, lca)
-    )
+    return combine_event_logs(sublog, infix_sublog)
 
 
 def calculate_sublog_for_infix_prefix_postfix_traces(
@@ -321,6 +332,43 @@ def __calculate_sub_log_for_each_node_regular_traces(
     return sublogs
 
 
+def calculate_sub_log_for_each_node_regular_traces_async(
+    pt: ProcessTree, log: list[TypedTrace], pool: multiprocessing.pool.Pool
+) -> Callable[[], dict[int, EventLog]]:
+    """
+    Starts the calculation of the sublogs of the full, already added traces in the pool and returns a getter that
+    blocks until the sublogs are available. The preorder ids of pt must not change until the getter was called.
+    Parameters
+    ----------
+    pt
+    log: already added traces, infixes/postfixes/prefixes are ignored
+    pool
+
+    Returns
+    -------
+
+    """
+    not_infix_log, _ = __split_log_by_infix_type(log)
+    net, im, fm = pt_to_petri_net(pt)
+    results = calculate_alignments_parallel_async(
+        not_infix_log,
+        net,
+        im,
+        fm,
+        parameters={"ret_tuple_as_trans_desc": True},
+        pool=pool,
+    )
+
+    def get_sublogs():
+        sublogs: dict[int, EventLog] = {}
+        for result in results:
+            sublogs = add_alignment_to_sublogs(result.get(), sublogs)
+
+        return sublogs
+
+    return get_sublogs
+
+
 def __add_fitting_alignment_prefix_to_sublogs(
     alignment: AlignmentResult,
     deviation_i: int,